@@ -0,0 +1,358 @@
+# autoswitch/batch.py
+"""
+Headless batch generator.
+
+Reads an inventory of devices and writes one configuration file per device,
+using the same TEMPLATE_FUNCTIONS as the GUI. Example:
+
+    python -m autoswitch.batch inventory.yaml -o configs -j 16
+
+Inventory format (YAML or JSON):
+
+    devices:
+      - name: sw-access-01
+        model: Cisco Catalyst 9200
+        steps:
+          - method: set_access_vlan
+            params: {VLAN ID: 10, Description: Biuro}
+            ports: [Gi1/0/1, Gi1/0/2]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from config import Cisco_Router, Cisco_Switch
+from autoswitch.build_cache import (DEFAULT_CACHE_DIR, FILE_MODE, BuildCache, device_key, discard_manifest, load_manifest,
+                                   save_manifest)
+from autoswitch.document import ConfigDocument
+from autoswitch.ipv4_batch import inventory_address_errors
+from autoswitch.memo import DEFAULT_MAX_ENTRIES, RenderCache
+from autoswitch.prefix_index import PrefixIndex
+from autoswitch.template_logic import TemplateError, render_template
+from autoswitch.vlans import VlanRegistry
+
+# Pamięć podręczna szablonów - jedna na proces, także w procesach puli
+_render_cache = None
+
+# Przyrostek poprzedniej konfiguracji urządzenia, którego nie udało się wygenerować
+STALE_SUFFIX = ".stale"
+
+class InventoryError(Exception):
+    """Raised when the inventory file cannot be read or has a wrong structure."""
+    pass
+
+
+def load_inventory(path):
+    """Load the list of devices from a YAML or JSON inventory file."""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise InventoryError("Do wczytania inwentarza YAML wymagany jest pakiet PyYAML.")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+
+    devices = data.get("devices") if isinstance(data, dict) else data
+    if not isinstance(devices, list):
+        raise InventoryError("Inwentarz musi zawierać listę 'devices'.")
+    return devices
+
+
+def find_model(model_name):
+    """Return (device_type, device_data) for a model from config.py."""
+    if model_name in Cisco_Router:
+        return 'router', Cisco_Router[model_name]
+    if model_name in Cisco_Switch:
+        return 'switch', Cisco_Switch[model_name]
+    raise TemplateError(f"Model '{model_name}' nie istnieje w katalogu urządzeń.")
+
+
+def get_render_cache(max_entries=DEFAULT_MAX_ENTRIES):
+    """Return this process's RenderCache, creating it on first use."""
+    global _render_cache
+    if _render_cache is None or _render_cache.max_entries != max_entries:
+        _render_cache = RenderCache(max_entries)
+    return _render_cache
+
+
+def build_document(device, render=render_template, prefix_index=None):
+    """
+    Build the session ConfigDocument for one inventory entry, as ConfigPage would.
+
+    IP conflicts are checked in prefix_index (a new one for this device by default;
+    pass a shared one to check a whole fleet).
+    """
+    _, device_data = find_model(device.get("model", ""))
+    methods = device_data.get('method_list', ())
+    interfaces = device_data.get('interfaces', [])
+
+    if prefix_index is None:
+        prefix_index = PrefixIndex()
+    name = device.get("name", "")
+    used_vlans = VlanRegistry()
+    document = ConfigDocument()
+    for step in device.get("steps", []):
+        method_name = step.get("method", "")
+        if method_name not in methods:
+            raise TemplateError(f"Metoda '{method_name}' nie jest dostępna dla modelu {device['model']}.")
+        ports = list(step.get("ports", []))
+        unknown = [p for p in ports if p not in interfaces]
+        if unknown:
+            raise TemplateError(f"Nieznane interfejsy: {', '.join(unknown)}")
+
+        params = dict(step.get("params", {}))
+        config_text = render(method_name, params, ports, used_vlans, prefix_index, name)
+        if config_text.strip():
+            document.append(method_name, params, ports, config_text)
+    return document, interfaces
+
+
+def generate_device_config(device, compact=True):
+    """Generate the full session config text for one inventory entry."""
+    document, interfaces = build_document(device)
+    return document.render(compact, interfaces)
+
+
+def output_filename(device_name):
+    """Turn a device name into a safe file name."""
+    return re.sub(r"[^\w.-]", "_", device_name) + ".txt"
+
+
+def validate_names(devices):
+    """
+    Split inventory entries into (devices, failures) by their names.
+
+    A numeric name (YAML 'name: 1001') is converted to text in a copy of the entry. Entries
+    without a text name, and later entries whose name gives an output file already taken
+    by an earlier one, are reported as (label, error) failures instead of stopping the run.
+    """
+    valid = []
+    failures = []
+    owners = {}  # plik wyjściowy -> nazwa urządzenia
+    for device in devices:
+        name = device.get("name") if isinstance(device, dict) else None
+        if isinstance(name, int) and not isinstance(name, bool):
+            name = str(name)
+            device = dict(device, name=name)
+        if not name:
+            failures.append((str(device)[:60], "Brak nazwy urządzenia ('name')."))
+            continue
+        if not isinstance(name, str):
+            failures.append((str(name)[:60], f"Nazwa urządzenia musi być tekstem, a nie {type(name).__name__}."))
+            continue
+        filename = output_filename(name)
+        if filename in owners:
+            failures.append((name, f"Nazwa powtarza się w inwentarzu (plik {filename} należy już do '{owners[filename]}')."))
+            continue
+        owners[filename] = name
+        valid.append(device)
+    return valid, failures
+
+
+def cache_key(device, compact):
+    """Build cache key of an inventory entry, or None when it cannot be computed (the build reports why)."""
+    if not isinstance(device, dict) or not device.get("name"):
+        return None
+    try:
+        _, device_data = find_model(device.get("model", ""))
+        return device_key(device, device_data, compact)
+    except (TemplateError, TypeError, ValueError):
+        return None
+
+
+def write_config(document, dest, compact, interfaces):
+    """Write a document to dest through a temporary file in the same directory and os.replace."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(dest)), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            document.write_to(f, compact, interfaces)
+        os.chmod(tmp_path, FILE_MODE)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _mark_stale(dest):
+    """Rename the previous config of a device that failed to <name>.txt.stale, so it is not taken as current."""
+    try:
+        os.replace(dest, dest + STALE_SUFFIX)
+    except FileNotFoundError:
+        pass
+
+
+def _remove_stale(dest):
+    try:
+        os.remove(dest + STALE_SUFFIX)
+    except FileNotFoundError:
+        pass
+
+
+def build_device(task):
+    """
+    Worker entry point: generate and write one device config.
+
+    The file is replaced atomically; when generation fails, the previous file is renamed with
+    STALE_SUFFIX and a successful build removes such a leftover.
+
+    Returns (name, error, template cache hits, template cache misses, restored from the build cache).
+    """
+    device, out_dir, compact, cache_size, cache_dir, key = task
+    name = device.get("name") if isinstance(device, dict) else None
+    if not name:
+        return str(device)[:60], "Brak nazwy urządzenia ('name').", 0, 0, False
+    dest = os.path.join(out_dir, output_filename(name))
+    build_cache = BuildCache(cache_dir) if cache_dir and key else None
+    if build_cache is not None and build_cache.restore(key, dest):
+        _remove_stale(dest)
+        return name, None, 0, 0, True
+
+    cache = get_render_cache(cache_size) if cache_size > 0 else None
+    hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    written = False
+    try:
+        document, interfaces = build_document(device, cache.render if cache is not None else render_template)
+        write_config(document, dest, compact, interfaces)
+        written = True
+        _remove_stale(dest)
+        if build_cache is not None:
+            build_cache.store(key, dest)
+        error = None
+    except TemplateError as e:
+        error = str(e)
+    except Exception as e:
+        error = f"Nieoczekiwany błąd: {e!r}"
+    if error is not None and not written:
+        try:
+            _mark_stale(dest)
+        except OSError:
+            pass
+    if cache is not None:
+        hits, misses = cache.hits - hits, cache.misses - misses
+    return name, error, hits, misses, False
+
+
+def run_batch(devices, out_dir, jobs=None, compact=True, cache_size=DEFAULT_MAX_ENTRIES, stats=None, cache_dir=None):
+    """
+    Build every device, in a process pool when jobs > 1. Returns the list of (name, error) failures.
+
+    Each process memoizes template calls in a RenderCache of cache_size entries (0 disables it).
+    With cache_dir, a device whose output file was written from the same inputs (per the output
+    directory's manifest) is skipped, and one whose inputs are in the build cache is copied from it.
+    When stats is a dict, the summed cache hits and misses, the skipped and the restored devices
+    are stored in it.
+
+    Names are checked first (validate_names), then the address and mask parameters of all
+    devices in one batch; devices with bad values are reported with every bad value and not
+    generated.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir) if cache_dir else discard_manifest(out_dir)
+    new_manifest = dict(manifest)  # wpisy urządzeń spoza tego uruchomienia zostają
+    devices, invalid = validate_names(devices)
+    address_errors = inventory_address_errors(devices)
+    tasks = []
+    unchanged = 0
+    for device in devices:
+        name = device["name"]
+        if name in address_errors:
+            filename = output_filename(name)
+            invalid.append((name, "; ".join(address_errors[name])))
+            new_manifest.pop(filename, None)
+            _mark_stale(os.path.join(out_dir, filename))
+            continue
+        key = cache_key(device, compact) if cache_dir else None
+        if key is not None:
+            filename = output_filename(name)
+            if manifest.get(filename) == key and os.path.exists(os.path.join(out_dir, filename)):
+                unchanged += 1
+                continue
+        tasks.append((device, out_dir, compact, cache_size, cache_dir, key))
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1 or len(tasks) < 2:
+        results = list(map(build_device, tasks))
+    else:
+        chunksize = max(1, len(tasks) // (jobs * 8))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(build_device, tasks, chunksize=chunksize))
+
+    if cache_dir:
+        for task, (name, error, *_) in zip(tasks, results):
+            if task[-1] is not None and not error:
+                new_manifest[output_filename(name)] = task[-1]
+            else:
+                new_manifest.pop(output_filename(name), None)
+        save_manifest(out_dir, new_manifest)
+    failures = invalid + _collect(results, stats)
+    if stats is not None:
+        stats["unchanged"] = unchanged
+    return failures
+
+
+def _collect(results, stats):
+    failures = []
+    hits = misses = restored = 0
+    for name, error, device_hits, device_misses, cached in results:
+        hits += device_hits
+        misses += device_misses
+        restored += cached
+        if error:
+            failures.append((name, error))
+    if stats is not None:
+        stats.update(hits=hits, misses=misses, hit_rate=hits / (hits + misses) if hits + misses else 0.0,
+                     restored=restored)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m autoswitch.batch",
+                                     description="Generuje konfiguracje dla wszystkich urządzeń z inwentarza.")
+    parser.add_argument("inventory", help="plik inwentarza (YAML lub JSON)")
+    parser.add_argument("-o", "--output", default="configs", help="katalog wyjściowy (domyślnie: configs)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="liczba procesów (domyślnie: liczba rdzeni)")
+    parser.add_argument("--no-compact", dest="compact", action="store_false",
+                        help="nie łącz identycznych bloków portów w 'interface range'")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_ENTRIES,
+                        help=f"liczba zapamiętanych wywołań szablonów na proces, 0 wyłącza (domyślnie: {DEFAULT_MAX_ENTRIES})")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"katalog cache wygenerowanych konfiguracji (domyślnie: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="generuj wszystkie urządzenia od nowa, bez cache")
+    args = parser.parse_args(argv)
+
+    try:
+        devices = load_inventory(args.inventory)
+    except (OSError, ValueError, InventoryError) as e:
+        print(f"Błąd inwentarza: {e}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    stats = {}
+    cache_dir = None if args.no_cache else args.cache_dir
+    failures = run_batch(devices, args.output, args.jobs, args.compact, args.cache_size, stats, cache_dir)
+    elapsed = time.perf_counter() - start
+
+    for name, error in failures:
+        print(f"[BŁĄD] {name}: {error}", file=sys.stderr)
+    print(f"Wygenerowano {len(devices) - len(failures)}/{len(devices)} konfiguracji "
+          f"w {elapsed:.2f} s -> {args.output}")
+    if cache_dir:
+        print(f"Bez zmian: {stats['unchanged']}, skopiowane z {cache_dir}: {stats['restored']}")
+    if args.cache_size > 0:
+        print(f"Pamięć podręczna szablonów: {stats['hits']} trafień, {stats['misses']} chybień "
+              f"({stats['hit_rate']:.0%})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+# autoswitch/build_cache.py
+"""
+Persistent content-addressed cache of generated device configs.
+
+A device's key is a SHA-256 of its model entry from config.py, its steps
+(methods, params, ports), the compaction flag and the version of the
+generator code (a hash of the modules that produce the text). The device
+name is not part of the key, so identical devices share one object.
+Objects live under <cache dir>/objects/<2 hex>/<key>.txt and are written
+to a temporary file in the same directory and moved into place with
+os.replace, so concurrent batch workers never see a partial object.
+
+The batch generator also keeps a manifest (file name -> key) in the output
+directory, so an output file whose key did not change is not touched at
+all. A hit refreshes the object's mtime; prune() removes objects older than a
+given age and then the least recently used ones above a size limit:
+
+    python -m autoswitch.build_cache prune --max-age-days 30 --max-size-mb 500
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from functools import lru_cache
+
+DEFAULT_CACHE_DIR = ".autoswitch-cache"
+
+# Moduły, od których zależy wygenerowany tekst - ich zmiana unieważnia cache
+GENERATOR_MODULES = ("template_logic.py", "validation.py", "vlans.py", "compaction.py", "document.py", "batch.py",
+                     "prefix_index.py", "bulk_routes.py", "netmasks.py", "catalog.py")
+
+OBJECT_SUFFIX = ".txt"
+
+MANIFEST_NAME = ".autoswitch-manifest.json"
+
+
+def _umask():
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+# mkstemp tworzy pliki z prawami 0600 - nadajemy takie, jakie dałby open() przy bieżącej umask
+FILE_MODE = 0o666 & ~_umask()
+
+
+@lru_cache(maxsize=None)
+def generator_version():
+    """Hash of the generator source; changes whenever any template code changes."""
+    digest = hashlib.sha256()
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in GENERATOR_MODULES:
+        with open(os.path.join(package_dir, name), "rb") as f:
+            digest.update(name.encode())
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _canonical(value):
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+# Skróty wpisów modeli z config.py, liczone raz na proces
+_model_digests = {}
+
+
+def device_key(device, device_data, compact=True):
+    """Content key of one inventory entry: model entry, steps, compaction flag and generator version."""
+    model_name = device.get("model", "")
+    model = _model_digests.get(model_name)
+    if model is None:
+        model = _model_digests[model_name] = hashlib.sha256(_canonical(device_data).encode("utf-8")).hexdigest()
+    digest = hashlib.sha256()
+    digest.update(generator_version().encode())
+    digest.update(model.encode())
+    digest.update(b"compact" if compact else b"full")
+    digest.update(_canonical(device.get("steps", [])).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def reset_model_digests():
+    """Forget the model digests, e.g. after the catalog was reloaded."""
+    _model_digests.clear()
+
+
+class BuildCache:
+    """Directory of generated configs addressed by device_key."""
+
+    def __init__(self, root=DEFAULT_CACHE_DIR):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+
+    def path(self, key):
+        return os.path.join(self.objects_dir, key[:2], key + OBJECT_SUFFIX)
+
+    def restore(self, key, dest):
+        """Copy the object for key to dest (atomically). Returns False on a miss."""
+        path = self.path(key)
+        try:
+            _atomic_copy(path, dest)
+        except FileNotFoundError:
+            return False
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return True
+
+    def store(self, key, source):
+        """Store the file at source as the object for key; an existing object is replaced atomically."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _atomic_copy(source, path)
+
+    def iter_objects(self):
+        """Yield (path, size, mtime) of every cached object."""
+        if not os.path.isdir(self.objects_dir):
+            return
+        for prefix in os.scandir(self.objects_dir):
+            if not prefix.is_dir():
+                continue
+            for entry in os.scandir(prefix.path):
+                if entry.name.endswith(OBJECT_SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue  # usunięty w międzyczasie przez inny proces
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def stats(self):
+        objects = list(self.iter_objects())
+        return {'objects': len(objects), 'bytes': sum(size for _, size, _ in objects)}
+
+    def prune(self, max_age=None, max_bytes=None, now=None):
+        """Remove objects older than max_age seconds, then the oldest ones until under max_bytes. Returns (removed, freed bytes)."""
+        now = time.time() if now is None else now
+        objects = sorted(self.iter_objects(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in objects)
+        removed = freed = 0
+        for path, size, mtime in objects:
+            expired = max_age is not None and now - mtime > max_age
+            oversized = max_bytes is not None and total > max_bytes
+            if not expired and not oversized:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+            freed += size
+        return removed, freed
+
+    def clear(self):
+        shutil.rmtree(self.objects_dir, ignore_errors=True)
+
+
+def _atomic_copy(source, dest):
+    """Copy source to dest through a temporary file in dest's directory and os.replace."""
+    with open(source, "rb") as src:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(dest)), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                shutil.copyfileobj(src, tmp)
+            os.chmod(tmp_path, FILE_MODE)
+            os.replace(tmp_path, dest)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+def load_manifest(out_dir):
+    """File name -> key of the configs last written to out_dir; {} when missing or unreadable."""
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def discard_manifest(out_dir):
+    """Remove the manifest before out_dir is written without the cache, so it cannot vouch for stale files. Returns {}."""
+    try:
+        os.remove(os.path.join(out_dir, MANIFEST_NAME))
+    except FileNotFoundError:
+        pass
+    return {}
+
+
+def save_manifest(out_dir, manifest):
+    """Write the manifest atomically."""
+    fd, tmp_path = tempfile.mkstemp(dir=out_dir, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, separators=(",", ":"))
+        os.chmod(tmp_path, FILE_MODE)
+        os.replace(tmp_path, os.path.join(out_dir, MANIFEST_NAME))
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m autoswitch.build_cache",
+                                     description="Zarządzanie pamięcią podręczną wygenerowanych konfiguracji.")
+    parser.add_argument("--dir", default=DEFAULT_CACHE_DIR, help=f"katalog cache (domyślnie: {DEFAULT_CACHE_DIR})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="liczba i rozmiar obiektów")
+    prune_parser = commands.add_parser("prune", help="usuń stare obiekty")
+    prune_parser.add_argument("--max-age-days", type=float, default=None)
+    prune_parser.add_argument("--max-size-mb", type=float, default=None)
+    commands.add_parser("clear", help="usuń wszystkie obiekty")
+    args = parser.parse_args(argv)
+
+    cache = BuildCache(args.dir)
+    if args.command == "stats":
+        stats = cache.stats()
+        print(f"{stats['objects']} obiektów, {stats['bytes'] / 1024 / 1024:.1f} MB w {args.dir}")
+    elif args.command == "prune":
+        max_age = args.max_age_days * 86400 if args.max_age_days is not None else None
+        max_bytes = int(args.max_size_mb * 1024 * 1024) if args.max_size_mb is not None else None
+        removed, freed = cache.prune(max_age, max_bytes)
+        print(f"Usunięto {removed} obiektów ({freed / 1024 / 1024:.1f} MB)")
+    else:
+        cache.clear()
+        print(f"Wyczyszczono {args.dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
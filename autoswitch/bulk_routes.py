@@ -0,0 +1,218 @@
+# autoswitch/bulk_routes.py
+"""
+Bulk static routes from CSV with CIDR aggregation.
+
+Each line holds one route, either "network,mask,next hop" or
+"network/length,next hop" (';' works as a separator too). An optional
+header line, empty lines and '#' comments are skipped. Lines are parsed
+one at a time into integers (inet_pton and the netmask tables, no
+ipaddress objects), and every bad line is reported together with its number.
+
+Routes are grouped by next hop and each group is reduced to the minimal
+covering set: duplicates and prefixes inside a broader prefix of the same
+next hop are dropped and sibling prefixes are merged into their parent.
+A step is skipped when it would change forwarding, i.e. when a route to
+another next hop lies between the two prefixes or equals the merged one.
+
+    python -m autoswitch.bulk_routes routes.csv -o routes.txt
+"""
+import argparse
+import socket
+import sys
+from functools import lru_cache
+
+from autoswitch.netmasks import MASK_INTS, MASKS, PREFIX_LENGTHS
+from autoswitch.prefix_index import format_prefix
+from autoswitch.validation import TemplateError
+
+# Tyle błędnych linii pokazujemy w komunikacie, resztę tylko liczymy
+MAX_REPORTED_ERRORS = 10
+
+def _address(text):
+    return int.from_bytes(socket.inet_pton(socket.AF_INET, text), "big")
+
+
+def _dotted(value):
+    return socket.inet_ntoa(value.to_bytes(4, "big"))
+
+
+class _RouteParser:
+    """Parses split CSV lines; next hops repeat, so their values are cached."""
+
+    def __init__(self):
+        self.lengths = {str(length): length for length in range(33)}
+        self.hops = {}
+
+    def mask_length(self, mask):
+        length = PREFIX_LENGTHS.get(mask)
+        if length is None:
+            try:
+                _address(mask)
+            except OSError:
+                raise ValueError(f"niepoprawna maska '{mask}'")
+            raise ValueError(f"maska '{mask}' nie jest ciągła")
+        return length
+
+    def next_hop(self, next_hop):
+        hop = self.hops.get(next_hop)
+        if hop is None:
+            try:
+                hop = self.hops[next_hop] = _address(next_hop)
+            except OSError:
+                raise ValueError(f"niepoprawny next hop '{next_hop}'")
+        return hop
+
+    def parse(self, cells):
+        """(network, length, next hop) ints of one split line; raises ValueError with the reason."""
+        if len(cells) == 2 and "/" in cells[0]:
+            network, _, length_text = cells[0].partition("/")
+            length = self.lengths.get(length_text)
+            if length is None:
+                raise ValueError(f"niepoprawna długość prefiksu '{length_text}'")
+            hop = self.next_hop(cells[1])
+        elif len(cells) == 3:
+            network = cells[0]
+            length = self.mask_length(cells[1])
+            hop = self.next_hop(cells[2])
+        else:
+            raise ValueError("oczekiwano 'sieć,maska,next hop' lub 'sieć/długość,next hop'")
+        try:
+            key = _address(network)
+        except OSError:
+            raise ValueError(f"niepoprawny adres sieci '{network}'")
+        # Bity hosta zerujemy, jak ipaddress z strict=False w apply_static_routing
+        return key & MASK_INTS[length], length, hop
+
+
+def parse_routes(lines):
+    """
+    Parse CSV route lines into a list of (network, length, next hop) ints.
+
+    Raises TemplateError listing the bad lines (with their numbers) after the whole input was read.
+    """
+    parser = _RouteParser()
+    routes = []
+    errors = []
+    error_count = 0
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        cells = [cell.strip() for cell in line.replace(";", ",").split(",")]
+        try:
+            routes.append(parser.parse(cells))
+        except ValueError as e:
+            if not routes and not error_count and not cells[0][:1].isdigit():
+                continue  # nagłówek
+            error_count += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(f"linia {number}: {e}")
+    if error_count:
+        more = f"\n... i {error_count - len(errors)} kolejnych" if error_count > len(errors) else ""
+        raise TemplateError(f"Błędne trasy ({error_count}):\n" + "\n".join(errors) + more)
+    return routes
+
+
+def _contains(outer_key, outer_length, key, length):
+    return outer_length <= length and (key & MASK_INTS[outer_length]) == outer_key
+
+
+def aggregate_routes(routes):
+    """Minimal set of (network, length, next hop) with the same forwarding as routes, sorted by next hop and network."""
+    # Next hop każdego prefiksu; prefiksy z kilkoma next hopami (ECMP) osobno
+    hop_of = {}
+    shared = set()
+    groups = {}
+    for key, length, hop in set(routes):
+        prefix = (key, length)
+        if hop_of.setdefault(prefix, hop) != hop:
+            shared.add(prefix)
+        groups.setdefault(hop, []).append(prefix)
+
+    def other_hop_at(prefix, hop):
+        """Whether a route to another next hop has exactly this prefix."""
+        return prefix in shared or hop_of.get(prefix, hop) != hop
+
+    def other_hop_between(key, length, outer_length, hop):
+        """A route to another next hop containing (key, length) and longer than outer_length."""
+        return any(other_hop_at((key & MASK_INTS[between], between), hop) for between in range(outer_length + 1, length + 1))
+
+    aggregated = []
+    for hop in sorted(groups):
+        stack = []   # rozłączne prefiksy, rosnąco
+        pinned = []  # prefiksy, których nie można usunąć ani scalić
+        for prefix in sorted(groups[hop]):
+            key, length = prefix
+            if prefix in shared:
+                pinned.append(prefix)  # ECMP - zostawiamy bez zmian
+                continue
+            if stack:
+                outer_key, outer_length = stack[-1]
+                if outer_length <= length and (key & MASK_INTS[outer_length]) == outer_key:
+                    if other_hop_between(key, length, outer_length, hop):
+                        pinned.append(prefix)
+                    continue
+            stack.append(prefix)
+            while len(stack) > 1:
+                (left_key, left_length), (right_key, right_length) = stack[-2], stack[-1]
+                if not (left_length == right_length and left_length
+                        and left_key ^ right_key == 1 << (32 - left_length)):
+                    break
+                parent = (left_key, left_length - 1)
+                if other_hop_at(parent, hop):
+                    break
+                stack[-2:] = [parent]
+        aggregated.extend((key, length, hop) for key, length in sorted(stack + pinned))
+    return aggregated
+
+
+@lru_cache(maxsize=16)
+def route_table(routes_csv):
+    """Aggregated routes of a whole CSV text; cached, since the template and the prefix index both need them."""
+    return tuple(aggregate_routes(parse_routes(routes_csv.splitlines())))
+
+
+def route_commands(routes):
+    """'ip route' lines for (network, length, next hop) routes."""
+    return [f"ip route {_dotted(key)} {MASKS[length]} {_dotted(hop)}" for key, length, hop in routes]
+
+
+def route_prefixes(routes):
+    """PrefixIndex entries (routes and their next hops) for the given routes."""
+    entries = [('route', format_prefix(key, length), f"ip route -> {_dotted(hop)}") for key, length, hop in routes]
+    for hop in sorted({hop for _, _, hop in routes}):
+        entries.append(('next-hop', format_prefix(hop, 32), "ip route"))
+    return entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m autoswitch.bulk_routes",
+                                     description="Zamienia plik CSV z trasami statycznymi na polecenia 'ip route', "
+                                                 "łącząc sąsiednie i nakładające się prefiksy.")
+    parser.add_argument("routes", help="plik CSV: sieć,maska,next hop lub sieć/długość,next hop ('-' = stdin)")
+    parser.add_argument("-o", "--output", default=None, help="plik wynikowy (domyślnie: stdout)")
+    parser.add_argument("--no-aggregate", dest="aggregate", action="store_false", help="nie łącz prefiksów")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.routes == "-":
+            routes = parse_routes(sys.stdin)
+        else:
+            with open(args.routes, encoding="utf-8") as f:
+                routes = parse_routes(f)
+    except (OSError, TemplateError) as e:
+        print(f"Błąd: {e}", file=sys.stderr)
+        return 2
+    result = aggregate_routes(routes) if args.aggregate else routes
+    text = "\n".join(route_commands(result)) + "\n"
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    print(f"{len(routes)} tras -> {len(result)} poleceń 'ip route'", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
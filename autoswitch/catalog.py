@@ -0,0 +1,230 @@
+# autoswitch/catalog.py
+"""
+Device catalog loaded from JSON or YAML files (catalogs/*.json).
+
+A catalog file lists models by device type. Interfaces are written as
+range specs: "Gi1/0/1-48" stands for Gi1/0/1 ... Gi1/0/48, and a range
+may appear in any number, so "Gi1-9/1/1-4" covers stack members 1-9.
+Button colors are named palettes shared by all models that use them:
+
+    {
+      "palettes": {"default": {"normal": "#5F5F5F", "hover": "#6F6F6F", "checked": "#505358"}},
+      "switches": {
+        "Cisco Catalyst 9200": {"interfaces": ["Gi1/0/1-48"], "description": "...",
+                                "method_list": ["set_access_vlan"], "palette": "default"}
+      }
+    }
+
+A parsed file is compiled to plain tuples and stored with marshal in
+__pycache__ next to it; the cache is used while the file's mtime and size
+match. The specs are expanded into interned name tuples only when a
+model's interfaces are first used, and models with the same specs share
+one tuple, so loading hundreds of models costs little time and memory.
+"""
+import itertools
+import json
+import marshal
+import os
+import re
+import sys
+import tempfile
+from collections.abc import Sequence
+from functools import lru_cache
+
+# Sekcje pliku katalogu -> nazwy słowników eksportowanych przez config.py
+SECTIONS = {"routers": "Cisco_Router", "switches": "Cisco_Switch"}
+
+DEFAULT_PALETTE = "default"
+
+CATALOG_SUFFIXES = (".json", ".yaml", ".yml")
+
+# Zmiana formatu skompilowanego katalogu unieważnia stare pliki cache
+_CACHE_VERSION = 1
+_CACHE_DIR = "__pycache__"
+
+_SPEC = re.compile(r"^(\D+)(\d+(?:-\d+)?(?:/\d+(?:-\d+)?)*)$")
+
+
+class CatalogError(Exception):
+    """Raised when a catalog file cannot be read or has a wrong structure."""
+    pass
+
+
+def _spec_segments(spec):
+    """(type, ((first, last), ...)) of a range spec like 'Gi1/0/1-48'; raises CatalogError."""
+    match = _SPEC.match(spec) if isinstance(spec, str) else None
+    if not match:
+        raise CatalogError(f"Niepoprawny zapis interfejsów '{spec}' (oczekiwano np. Gi1/0/1-48).")
+    segments = []
+    for part in match.group(2).split("/"):
+        first, _, last = part.partition("-")
+        first, last = int(first), int(last or first)
+        if first > last:
+            raise CatalogError(f"Niepoprawny zakres '{part}' w '{spec}'.")
+        segments.append((first, last))
+    return match.group(1), tuple(segments)
+
+
+@lru_cache(maxsize=None)
+def expand_specs(specs):
+    """Interned interface names of a tuple of range specs, in order."""
+    names = []
+    for spec in specs:
+        kind, segments = _spec_segments(spec)
+        for numbers in itertools.product(*(range(first, last + 1) for first, last in segments)):
+            names.append(sys.intern(kind + "/".join(map(str, numbers))))
+    return tuple(names)
+
+
+class InterfaceList(Sequence):
+    """Interfaces of a model, kept as range specs until first used."""
+
+    __slots__ = ("specs", "_names")
+
+    def __init__(self, specs):
+        self.specs = tuple(specs)
+        self._names = None
+
+    def names(self):
+        if self._names is None:
+            self._names = expand_specs(self.specs)
+        return self._names
+
+    def __len__(self):
+        return len(self.names())
+
+    def __getitem__(self, index):
+        return self.names()[index]
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def __contains__(self, name):
+        return name in self.names()
+
+    def __eq__(self, other):
+        if isinstance(other, InterfaceList):
+            return self.specs == other.specs or self.names() == other.names()
+        if isinstance(other, (list, tuple)):
+            return list(self.names()) == list(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.specs)
+
+    def __str__(self):
+        # Klucze cache (json z default=str) zależą od zapisu, bez rozwijania listy
+        return ",".join(self.specs)
+
+    def __repr__(self):
+        return f"InterfaceList({list(self.specs)!r})"
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise CatalogError("Do wczytania katalogu YAML wymagany jest pakiet PyYAML.")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def compile_catalog(data, path=""):
+    """Validate parsed catalog data into plain tuples: (palettes, ((section, model, specs, description, methods, palette), ...))."""
+    if not isinstance(data, dict):
+        raise CatalogError(f"{path}: katalog musi być obiektem z sekcjami {', '.join(SECTIONS)}.")
+    palettes = data.get("palettes") or {}
+    if not isinstance(palettes, dict) or not all(isinstance(p, dict) for p in palettes.values()):
+        raise CatalogError(f"{path}: 'palettes' musi mapować nazwy na kolory.")
+    models = []
+    for section in SECTIONS:
+        entries = data.get(section) or {}
+        if not isinstance(entries, dict):
+            raise CatalogError(f"{path}: sekcja '{section}' musi mapować nazwy modeli na opisy.")
+        for model, entry in entries.items():
+            if not isinstance(entry, dict) or not isinstance(entry.get("interfaces"), list):
+                raise CatalogError(f"{path}: model '{model}' musi mieć listę 'interfaces'.")
+            specs = tuple(entry["interfaces"])
+            for spec in specs:
+                _spec_segments(spec)
+            palette = entry.get("palette", DEFAULT_PALETTE)
+            if palettes and palette not in palettes:
+                raise CatalogError(f"{path}: model '{model}' używa nieznanej palety '{palette}'.")
+            models.append((section, model, specs, str(entry.get("description", "")),
+                           tuple(entry.get("method_list", ())), palette))
+    palettes = tuple((name, tuple(sorted(colors.items()))) for name, colors in palettes.items())
+    return palettes, tuple(models)
+
+
+def _cache_path(path):
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, _CACHE_DIR, name + ".marshal")
+
+
+def load_catalog(path):
+    """Compiled catalog of one file, from the marshal cache while the file's mtime and size match."""
+    stat = os.stat(path)
+    signature = (_CACHE_VERSION, sys.version_info[:2], stat.st_mtime_ns, stat.st_size)
+    cache_path = _cache_path(path)
+    try:
+        with open(cache_path, "rb") as f:
+            cached_signature, compiled = marshal.loads(f.read())
+        if tuple(cached_signature) == signature:
+            return compiled
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    try:
+        compiled = compile_catalog(_read(path), path)
+    except ValueError as e:
+        raise CatalogError(f"{path}: {e}")
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), prefix=".tmp-")
+    except OSError:
+        return compiled  # katalog tylko do odczytu - działa bez cache
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(marshal.dumps((signature, compiled)))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return compiled
+
+
+def catalog_files(directory):
+    """Catalog files of a directory, sorted by name."""
+    try:
+        names = sorted(os.listdir(directory))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(directory, name) for name in names if name.endswith(CATALOG_SUFFIXES)]
+
+
+def load_catalogs(paths):
+    """
+    Merge catalog files into {'Cisco_Router': {...}, 'Cisco_Switch': {...}, 'description_color': {...}}.
+
+    Model entries are dicts with 'interfaces' (an InterfaceList), 'description' and 'method_list',
+    as config.py always had them; a later file overrides models of an earlier one.
+    """
+    namespace = {name: {} for name in SECTIONS.values()}
+    description_color = namespace["description_color"] = {}
+    for path in paths:
+        palettes, models = load_catalog(path)
+        palettes = {name: dict(colors) for name, colors in palettes}
+        for section, model, specs, description, methods, palette in models:
+            namespace[SECTIONS[section]][model] = {
+                'interfaces': InterfaceList(specs),
+                'description': description,
+                'method_list': methods,
+            }
+            if palette in palettes:
+                # Modele z tą samą paletą dzielą jeden słownik kolorów
+                description_color[description] = palettes[palette]
+    return namespace
@@ -0,0 +1,135 @@
+# autoswitch/compaction.py
+"""
+Output optimizer merging identical per-port blocks into `interface range` stanzas.
+
+    interface Gi1/0/1            interface range Gi1/0/1 - 3
+     switchport mode access  ->   switchport mode access
+    exit                         exit
+    interface Gi1/0/2 ...
+
+Only blocks that follow each other directly (no global command in between)
+are merged, so the order of global commands relative to interfaces is kept.
+"""
+import re
+
+# IOS przyjmuje maksymalnie 5 zakresów w jednym poleceniu interface range
+MAX_RANGES_PER_COMMAND = 5
+
+_PORT_NUMBER = re.compile(r"^(.*?)(\d+)$")
+
+
+def _is_interface_header(line):
+    if not line.startswith("interface "):
+        return False
+    name = line[len("interface "):].strip().lower()
+    return not name.startswith(("range", "vlan"))
+
+
+def _port_ranges(ports, interfaces):
+    """Group ports into range items like 'Gi1/0/1 - 24', following the catalog order."""
+    order = {name: i for i, name in enumerate(interfaces or ())}
+    parsed = []
+    for port in ports:
+        match = _PORT_NUMBER.match(port)
+        prefix, number = (match.group(1), int(match.group(2))) if match else (port, None)
+        parsed.append((order.get(port, len(order)), prefix, number, port))
+    parsed.sort(key=lambda p: (p[0], p[1], p[2] if p[2] is not None else -1))
+
+    items = []
+    start = prev = None
+    for position, prefix, number, port in parsed:
+        adjacent = prev is not None and (position == prev[0] + 1 or position == prev[0] == len(order))
+        if adjacent and number is not None and prefix == prev[1] and number == prev[2] + 1:
+            prev = (position, prefix, number, port)
+            continue
+        if start is not None:
+            items.append(_range_item(start, prev))
+        start = prev = (position, prefix, number, port) if number is not None else None
+        if start is None:
+            items.append(port)
+    if start is not None:
+        items.append(_range_item(start, prev))
+    return items
+
+
+def _range_item(start, end):
+    if start[2] == end[2]:
+        return start[3]
+    return f"{start[3]} - {end[2]}"
+
+
+def _flush_run(run, interfaces):
+    """Emit the lines for a run of consecutive per-port units."""
+    groups = {}
+    for kind, port, body in run:
+        groups.setdefault((kind, body), []).append(port)
+
+    lines = []
+    for (kind, body), ports in groups.items():
+        if len(ports) == 1:
+            targets = [ports[0]]
+            keyword = "interface" if kind == "interface" else "default interface"
+        else:
+            items = _port_ranges(ports, interfaces)
+            targets = [", ".join(items[i:i + MAX_RANGES_PER_COMMAND])
+                       for i in range(0, len(items), MAX_RANGES_PER_COMMAND)]
+            keyword = "interface range" if kind == "interface" else "default interface range"
+        for target in targets:
+            lines.append(f"{keyword} {target}")
+            lines.extend(body)
+            lines.append("exit")
+    return lines
+
+
+def compact_interface_lines(lines, interfaces=None):
+    """
+    Merge identical per-port blocks in a sequence of config lines.
+
+    Parameters:
+        lines (iterable): Lines of generated CLI, without trailing newlines.
+        interfaces (list, optional): Interface order of the device model from config.py,
+            used to decide which ports form a contiguous range.
+    Returns:
+        list: Compacted lines.
+    """
+    out = []
+    run = []
+    pending = []  # linie bieżącego, jeszcze niezamkniętego bloku
+
+    def close_run():
+        if run:
+            out.extend(_flush_run(run, interfaces))
+            run.clear()
+
+    for line in lines:
+        if pending:
+            if line == "exit":
+                header = pending[0]
+                if header.startswith("default interface "):
+                    run.append(("default", header[len("default interface "):].strip(), ()))
+                else:
+                    run.append(("interface", header[len("interface "):].strip(), tuple(pending[1:])))
+                pending = []
+                continue
+            if line.startswith(" ") and not pending[0].startswith("default interface "):
+                pending.append(line)
+                continue
+            # Blok bez 'exit' - zostawiamy go bez zmian
+            close_run()
+            out.extend(pending)
+            pending = []
+
+        if _is_interface_header(line) or line.startswith("default interface "):
+            pending = [line]
+        else:
+            close_run()
+            out.append(line)
+
+    close_run()
+    out.extend(pending)
+    return out
+
+
+def compact_config(config_text, interfaces=None):
+    """Return config_text with identical per-port blocks merged into interface ranges."""
+    return "\n".join(compact_interface_lines(config_text.split("\n"), interfaces))
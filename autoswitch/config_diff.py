@@ -0,0 +1,444 @@
+# autoswitch/config_diff.py
+"""
+Minimal delta between a device's current configuration and the desired one.
+
+Both configs are parsed into top-level items: plain global lines and
+sections - every non-indented line with indented children (`interface`,
+`vlan`, `ip access-list`, `policy-map`, ...) together with its body.
+Deeper-indented lines form sub-blocks of the child above them (e.g. a
+`class` in a `policy-map`). Items and section bodies are kept in
+insertion-ordered dicts, so matching two configs costs one hash lookup per
+line and a diff of two 50k-line configs stays in the milliseconds.
+
+Access lists are re-created as a whole when they change, since the order
+of their entries matters, and a banner is replaced as one block.
+
+The delta removes first (`no ...`, `default interface ...`) and adds
+afterwards, keeping the order of the desired config:
+
+    python -m autoswitch.config_diff current.txt desired.txt -o delta.txt
+    python -m autoswitch.config_diff running.txt session.txt --overlay
+"""
+import argparse
+import sys
+
+from autoswitch.compaction import compact_interface_lines
+from autoswitch.interfaces import expand_interface_range, is_virtual_interface, normalize_interface_name
+from autoswitch.validation import TemplateError
+from autoswitch.vlans import MAX_VLAN, MIN_VLAN, VlanRangeSet, apply_allowed_vlans
+
+SECTION_PREFIXES = ("interface ", "vlan ", "router ", "ip dhcp pool ", "line ")
+
+# Sekcje, w których liczy się kolejność linii - przy zmianie wysyłane od nowa w całości
+ORDERED_SECTION_PREFIXES = ("ip access-list ", "ipv6 access-list ")
+
+# Linie sterujące trybem CLI - nie są częścią konfiguracji
+MODE_COMMANDS = frozenset(("enable", "configure terminal", "conf t", "end", "exit"))
+
+# Nagłówek wyniku show running-config i polecenia trybu EXEC - pomijane przy porównaniu
+IGNORED_PREFIXES = ("building configuration", "current configuration", "last configuration change",
+                    "nvram config last updated", "version ",
+                    "write", "erase ", "reload", "copy ", "yes", "do ", "show ", "delete ")
+_IGNORED_KEYWORDS = frozenset(prefix.split()[0] for prefix in IGNORED_PREFIXES)
+
+# Po tych poleceniach urządzenie startuje z pustą konfiguracją
+RESET_COMMANDS = ("write erase", "erase startup-config")
+
+# Szablon routingu dynamicznego nie robi wcięć w poleceniach "network"
+ROUTER_SUBCOMMANDS = ("network ", "passive-interface ", "router-id ", "redistribute ",
+                      "default-information ", "auto-summary", "no auto-summary")
+
+# Skróty używane przez szablony -> postać z show running-config
+_ABBREVIATIONS = (("ip add ", "ip address "),)
+_ABBREVIATION_PREFIXES = tuple(short for short, _ in _ABBREVIATIONS)
+
+# Polecenia z jedną wartością: nowa linia zastępuje poprzednią zamiast się dopisywać
+GLOBAL_SINGLE_VALUE = ("hostname ",)
+SECTION_SINGLE_VALUE = ("name ", "description ", "switchport mode ", "switchport access vlan ",
+                        "switchport trunk native vlan ", "switchport trunk allowed vlan ",
+                        "switchport trunk encapsulation ", "ip address ", "default-router ", "lease ")
+
+# Lista VLAN-ów trunka - linie "add"/"remove"/"except" są łączone w jedną pełną listę
+ALLOWED_VLANS = "switchport trunk allowed vlan "
+_ALL_VLANS = VlanRangeSet([(MIN_VLAN, MAX_VLAN)])
+
+# Pierwsze słowa nagłówków sekcji (poza "interface" i "ip dhcp pool")
+_SECTION_KEYWORDS = frozenset(("vlan", "router", "line"))
+
+
+class ConfigSection:
+    """One section; lines is an ordered dict used as a set, with a ConfigSection as the value of a child that has a sub-block."""
+    __slots__ = ('header', 'lines')
+
+    def __init__(self, header):
+        self.header = header
+        self.lines = {}
+
+    def __repr__(self):
+        return f"ConfigSection({self.header!r}, {len(self.lines)} linii)"
+
+
+class ParsedConfig:
+    """Top-level items of a config: line -> None for global lines, header -> ConfigSection for sections."""
+    __slots__ = ('items',)
+
+    def __init__(self):
+        self.items = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def section(self, header):
+        section = self.items.get(header)
+        if section is None:
+            section = self.items[header] = ConfigSection(header)
+        return section
+
+    def open_section(self, header):
+        """Turn a global line that turned out to have indented children into a section."""
+        if header in self.items and self.items[header] is None:
+            del self.items[header]
+        return self.section(header)
+
+
+def negate(line):
+    """'no X' <-> 'X'."""
+    return line[3:] if line.startswith("no ") else "no " + line
+
+
+def _normalize_line(stripped):
+    line = " ".join(stripped.split()) if "  " in stripped or "\t" in stripped else stripped
+    if line.startswith(_ABBREVIATION_PREFIXES):
+        for short, full in _ABBREVIATIONS:
+            if line.startswith(short):
+                line = full + line[len(short):]
+    return line
+
+
+def _normalize_header(line):
+    if line.startswith("interface "):
+        return "interface " + normalize_interface_name(line[len("interface "):])
+    return line
+
+
+def _single_value_key(line, prefixes):
+    if line.startswith(prefixes) and not line.endswith(" secondary"):
+        for prefix in prefixes:
+            if line.startswith(prefix):
+                return prefix
+    return None
+
+
+def _set_line(lines, line, single_value):
+    """
+    Add a line to an ordered line set. 'no X' replaces an existing 'X' and
+    vice versa, and a single-value command replaces its previous value.
+    """
+    lines.pop(negate(line), None)
+    key = _single_value_key(line, single_value)
+    if key is not None:
+        for old in [old for old in lines if old.startswith(key) and old != line]:
+            del lines[old]
+    if line not in lines:  # istniejący podblok zostaje
+        lines[line] = None
+
+
+def _fold_allowed_vlans(lines, line):
+    """
+    The full 'switchport trunk allowed vlan <list>' line after applying line (which may
+    be an 'add', 'remove' or 'except' continuation) to the list already in lines.
+    """
+    current = None
+    try:
+        for old in lines:
+            if old.startswith(ALLOWED_VLANS):
+                current = apply_allowed_vlans(None, old[len(ALLOWED_VLANS):])
+                break
+        vlans = apply_allowed_vlans(current, line[len(ALLOWED_VLANS):])
+    except TemplateError:
+        return line  # niepoprawną listę porównujemy dosłownie
+    if vlans is None or vlans == _ALL_VLANS:
+        return ALLOWED_VLANS + "all"
+    return ALLOWED_VLANS + (str(vlans) if vlans else "none")
+
+
+def _set_child(section, line, parent):
+    """Add a body line to a section, or to the sub-block of its child line parent."""
+    if parent is None:
+        if line.startswith(ALLOWED_VLANS):
+            line = _fold_allowed_vlans(section.lines, line)
+        _set_line(section.lines, line, SECTION_SINGLE_VALUE)
+        return
+    block = section.lines.get(parent)
+    if block is None:
+        block = section.lines[parent] = ConfigSection(parent)
+    _set_line(block.lines, line, SECTION_SINGLE_VALUE)
+
+
+def _banner_start(stripped):
+    """(header, delimiter) of a multi-line 'banner <type> ^C' line, or None for a one-line banner."""
+    parts = stripped.split(None, 2)
+    if len(parts) < 3:
+        return None
+    text = parts[2]
+    delimiter = "^C" if text.startswith("^C") else text[0]
+    if delimiter in text[len(delimiter):]:
+        return None
+    return "banner " + parts[1], delimiter
+
+
+def parse_config(text):
+    """Parse config text (or an iterable of lines) into a ParsedConfig."""
+    lines = text.splitlines() if isinstance(text, str) else text
+    config = ParsedConfig()
+    items = config.items
+    targets = None  # sekcje, do których trafiają kolejne linie
+    router = False
+    pending = None  # ostatnia linia globalna - staje się nagłówkiem, jeśli ma wcięte linie
+    indent = None   # wcięcie pierwszego poziomu bieżącej sekcji
+    parent = None   # ostatnia linia pierwszego poziomu - rodzic głębiej wciętych
+    banner = None   # (nagłówek, ogranicznik, linie) zbieranego banera
+
+    for raw in lines:
+        if banner is not None:
+            banner[2].append(raw.rstrip("\r\n"))
+            if banner[1] in raw:
+                section = config.section(banner[0])
+                section.lines = {"\n".join(banner[2]): None}
+                banner = None
+            continue
+        stripped = raw.strip()
+        if not stripped:
+            continue
+        if stripped[0] == "!":
+            targets = pending = None
+            continue
+        lower = stripped.lower()
+        if lower in MODE_COMMANDS:
+            targets = pending = None
+            continue
+
+        if raw[0].isspace() and (targets is not None or pending is not None):
+            if targets is None:
+                targets = [config.open_section(pending)]
+                pending = indent = parent = None
+            depth = len(raw) - len(raw.lstrip())
+            if indent is None:
+                indent = depth
+            line = _normalize_line(stripped)
+            nested = depth > indent and parent is not None
+            for section in targets:
+                _set_child(section, line, parent if nested else None)
+            if not nested:
+                parent = line
+            continue
+        if targets is not None and router and lower.startswith(ROUTER_SUBCOMMANDS):
+            line = _normalize_line(stripped)
+            for section in targets:
+                _set_child(section, line, None)
+            continue
+
+        targets = pending = None
+        indent = parent = None
+        router = False
+        line = _normalize_line(stripped)
+        lower = line.lower()
+
+        keyword = lower.partition(" ")[0]
+        if keyword == "interface":
+            if lower.startswith("interface range "):
+                targets = [config.section("interface " + name)
+                           for name in expand_interface_range(line[len("interface range "):])]
+            else:
+                targets = [config.section(_normalize_header(line))]
+        elif keyword in _SECTION_KEYWORDS or keyword == "ip" and lower.startswith("ip dhcp pool "):
+            targets = [config.section(line)]
+            router = keyword == "router"
+        elif keyword == "banner":
+            start = _banner_start(stripped)
+            if start is None:
+                _set_line(items, line, GLOBAL_SINGLE_VALUE)
+            else:
+                banner = (*start, [stripped])
+        elif keyword == "default" and lower.startswith("default interface "):
+            spec = line[len("default interface "):]
+            names = expand_interface_range(spec[len("range "):]) if spec.lower().startswith("range ") else [spec]
+            for name in names:
+                config.section("interface " + normalize_interface_name(name)).lines.clear()
+        elif keyword == "no" and lower[3:].startswith(SECTION_PREFIXES):
+            items.pop(_normalize_header(line[3:]), None)
+        elif keyword == "no" and items.get(line[3:]) is not None:
+            del items[line[3:]]  # usunięcie całej sekcji, np. "no ip access-list extended X"
+        elif keyword in _IGNORED_KEYWORDS and lower.startswith(IGNORED_PREFIXES):
+            if lower.startswith(RESET_COMMANDS):
+                items.clear()
+        else:
+            _set_line(items, line, GLOBAL_SINGLE_VALUE)
+            pending = line
+    return config
+
+
+def _is_physical(header, interfaces):
+    name = header[len("interface "):]
+    return name in interfaces if interfaces is not None else not is_virtual_interface(name)
+
+
+def _body(lines, indent):
+    """Lines of a section body (with its sub-blocks) indented by indent."""
+    out = []
+    for line, block in lines.items():
+        out.append(indent + line)
+        if block is not None:
+            out.extend(_body(block.lines, indent + " "))
+            out.append(indent + " exit")
+    return out
+
+
+def _section_lines(section):
+    """Commands creating a whole section."""
+    if section.header.startswith("banner "):
+        return list(section.lines)
+    return [section.header, *_body(section.lines, " "), "exit"]
+
+
+def _body_changes(old, new, indent):
+    """
+    Commands turning the body old into new: `no` lines of removed lines first, then added
+    lines; a changed sub-block is entered and diffed the same way.
+    """
+    added = [line for line in new if line not in old]
+    # Nowa wartość polecenia jednowartościowego zastępuje starą bez osobnego "no"
+    replaced = {_single_value_key(line, SECTION_SINGLE_VALUE) for line in added}
+    replaced.discard(None)
+    removed = [negate(line) for line in old
+               if line not in new and _single_value_key(line, SECTION_SINGLE_VALUE) not in replaced]
+    # "no shutdown" usuwa "shutdown" i jednocześnie jest linią docelową - wysyłamy raz
+    added = set(added).difference(removed)
+    out = [indent + line for line in removed]
+    for line, block in new.items():
+        old_block = old.get(line)
+        if line in added:
+            out.append(indent + line)
+            if block is not None:
+                out.extend(_body(block.lines, indent + " "))
+                out.append(indent + " exit")
+        elif block is not None or old_block is not None:
+            nested = _body_changes(old_block.lines if old_block is not None else {},
+                                   block.lines if block is not None else {}, indent + " ")
+            if nested:
+                out.extend([indent + line, *nested, indent + " exit"])
+    return out
+
+
+def _remove_section(section, interfaces):
+    header = section.header
+    if header.startswith("interface "):
+        return [("default " if _is_physical(header, interfaces) else "no ") + header]
+    if header.startswith("line "):
+        return [header, *(" " + negate(line) for line in section.lines), "exit"]
+    return ["no " + header]
+
+
+def diff_configs(current, desired, interfaces=None):
+    """
+    Return the command lines moving the current ParsedConfig to the desired one.
+
+    Removed sections and global lines come first; then the desired items in
+    their order: new global lines, new sections and changed sections (their
+    `no` lines before the added ones). interfaces is the model's interface
+    list, used to tell physical ports (default interface) from virtual ones
+    (no interface).
+    """
+    if interfaces is not None:
+        interfaces = {normalize_interface_name(name) for name in interfaces}
+    current_items = current.items
+    desired_items = desired.items
+
+    removals = []
+    for key, section in current_items.items():
+        if key in desired_items:
+            continue
+        if section is None:
+            removals.append(negate(key))
+        else:
+            removals.extend(_remove_section(section, interfaces))
+
+    removed_globals = set(removals)
+    additions = []
+    for key, section in desired_items.items():
+        if section is None:
+            if key not in current_items and key not in removed_globals:
+                additions.append(key)
+            continue
+        old = current_items.get(key)
+        if old is None:
+            additions.extend(_section_lines(section))
+            continue
+        if key.startswith("banner "):
+            if old.lines != section.lines:
+                additions.extend(_section_lines(section))
+            continue
+        if key.startswith(ORDERED_SECTION_PREFIXES):
+            if _body(old.lines, " ") != _body(section.lines, " "):
+                additions.extend(["no " + key, *_section_lines(section)])
+            continue
+        changes = _body_changes(old.lines, section.lines, " ")
+        if changes and not section.lines and key.startswith("interface ") and _is_physical(key, interfaces):
+            additions.append("default " + key)
+        elif changes:
+            additions.extend([key, *changes, "exit"])
+    return removals + additions
+
+
+def config_delta(current_text, desired_text, interfaces=None, compact=False, overlay=False):
+    """
+    Return the delta as a ready-to-paste config, or '' when the device is up to date.
+
+    With overlay=True desired_text is a list of changes (e.g. a generated
+    session config) applied on top of current_text rather than a complete
+    config, so everything it does not touch stays as it is.
+    """
+    current_lines = current_text.splitlines()
+    desired_lines = desired_text.splitlines()
+    if overlay:
+        desired_lines = current_lines + desired_lines
+    lines = diff_configs(parse_config(current_lines), parse_config(desired_lines), interfaces)
+    if not lines:
+        return ""
+    if compact:
+        lines = compact_interface_lines(lines, interfaces)
+    return "\n".join(["enable", "configure terminal", *lines, "end"]) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m autoswitch.config_diff",
+                                     description="Wyznacza polecenia przenoszące urządzenie z bieżącej do docelowej konfiguracji.")
+    parser.add_argument("current", help="bieżąca konfiguracja (np. show running-config)")
+    parser.add_argument("desired", help="konfiguracja docelowa")
+    parser.add_argument("-o", "--output", default=None, help="plik wynikowy (domyślnie: standardowe wyjście)")
+    parser.add_argument("--overlay", action="store_true",
+                        help="konfiguracja docelowa to zmiany nakładane na bieżącą (np. wygenerowana sesja)")
+    parser.add_argument("--no-compact", dest="compact", action="store_false",
+                        help="nie łącz identycznych bloków portów w 'interface range'")
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.current, encoding="utf-8") as f:
+            current = f.read()
+        with open(args.desired, encoding="utf-8") as f:
+            desired = f.read()
+    except OSError as e:
+        print(f"Błąd odczytu: {e}", file=sys.stderr)
+        return 2
+
+    delta = config_delta(current, desired, compact=args.compact, overlay=args.overlay)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(delta)
+    else:
+        sys.stdout.write(delta)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+# autoswitch/document.py
+"""
+Session configuration as a list of typed blocks.
+
+Each apply adds one ConfigBlock (method, params, ports, lines) in O(1);
+the text is only produced when the document is rendered, and can be
+streamed block by block into a file, a socket or a string.
+"""
+from autoswitch.compaction import compact_interface_lines
+
+SEPARATOR = "! --- Kolejna konfiguracja ---"
+
+
+class ConfigBlock:
+    """Configuration generated by one template call."""
+    __slots__ = ('method', 'params', 'ports', 'lines')
+
+    def __init__(self, method, params, ports, lines):
+        self.method = method
+        self.params = params
+        self.ports = tuple(ports)
+        self.lines = lines.split("\n") if isinstance(lines, str) else list(lines)
+
+    def __repr__(self):
+        return f"ConfigBlock({self.method!r}, ports={len(self.ports)}, lines={len(self.lines)})"
+
+
+class ConfigDocument:
+    """Ordered collection of ConfigBlocks rendered lazily into CLI text."""
+
+    def __init__(self, header=("enable",)):
+        self.header = list(header)
+        self.blocks = []
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def __iter__(self):
+        return iter(self.blocks)
+
+    def __getitem__(self, index):
+        return self.blocks[index]
+
+    def append(self, method, params, ports, lines):
+        """Add a block at the end of the document and return it."""
+        block = ConfigBlock(method, params, ports, lines)
+        self.blocks.append(block)
+        return block
+
+    def remove(self, index):
+        """Remove and return the block at index."""
+        return self.blocks.pop(index)
+
+    def move(self, index, new_index):
+        """Move the block at index to new_index."""
+        self.blocks.insert(new_index, self.blocks.pop(index))
+
+    def clear(self):
+        self.blocks.clear()
+
+    def iter_chunks(self, compact=False, interfaces=None):
+        """Yield the rendered text piece by piece: the header, then one chunk per block."""
+        if self.header:
+            yield "\n".join(self.header) + "\n"
+        for block in self.blocks:
+            lines = compact_interface_lines(block.lines, interfaces) if compact else block.lines
+            yield f"\n{SEPARATOR}\n"
+            yield "\n".join(lines) + "\n"
+
+    def iter_lines(self, compact=False, interfaces=None):
+        """Yield the rendered document line by line."""
+        yield from self.header
+        for block in self.blocks:
+            yield ""
+            yield SEPARATOR
+            yield from (compact_interface_lines(block.lines, interfaces) if compact else block.lines)
+
+    def render(self, compact=False, interfaces=None):
+        """Return the whole document as one string."""
+        return "".join(self.iter_chunks(compact, interfaces))
+
+    def write_to(self, stream, compact=False, interfaces=None):
+        """Write the document into any object with a write() method (file, StringIO)."""
+        for chunk in self.iter_chunks(compact, interfaces):
+            stream.write(chunk)
+
+    def send_to(self, sock, compact=False, interfaces=None, encoding="utf-8"):
+        """Send the document over a connected socket, one block at a time."""
+        for chunk in self.iter_chunks(compact, interfaces):
+            sock.sendall(chunk.encode(encoding))
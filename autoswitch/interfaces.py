@@ -0,0 +1,63 @@
+# autoswitch/interfaces.py
+"""
+Interface name helpers shared by the config parsers.
+
+IOS accepts any unambiguous prefix of an interface type, so the same port
+can appear as "GigabitEthernet1/0/1", "gi1/0/1" or "Gi1/0/1". Names are
+normalised to the short form used by the device catalog in config.py.
+"""
+import re
+from functools import lru_cache
+
+# Kolejność ma znaczenie: "te" to TenGigabitEthernet, a nie Tunnel
+_INTERFACE_TYPES = (
+    ("tengigabitethernet", "Te"),
+    ("gigabitethernet", "Gi"),
+    ("fastethernet", "Fa"),
+    ("ethernet", "Et"),
+    ("port-channel", "Po"),
+    ("loopback", "Lo"),
+    ("tunnel", "Tu"),
+    ("serial", "Se"),
+    ("vlan", "Vlan"),
+)
+
+# Typy interfejsów, które nie są portami fizycznymi
+VIRTUAL_TYPES = ("Vlan", "Lo", "Tu", "Po")
+
+_NAME = re.compile(r"^([A-Za-z][A-Za-z-]*)\s*(\d[\d/.:]*)$")
+_RANGE_ITEM = re.compile(r"^(.*?)(\d+)\s*-\s*(\d+)$")
+
+
+@lru_cache(maxsize=4096)
+def normalize_interface_name(name):
+    """Return the short form of an interface name, e.g. 'GigabitEthernet0/1' -> 'Gi0/1'."""
+    name = name.strip()
+    match = _NAME.match(name)
+    if not match:
+        return name
+    kind, number = match.group(1).lower(), match.group(2)
+    for long_name, short_name in _INTERFACE_TYPES:
+        if long_name.startswith(kind):
+            return short_name + number
+    return match.group(1) + number
+
+
+def is_virtual_interface(name):
+    return normalize_interface_name(name).startswith(VIRTUAL_TYPES)
+
+
+def expand_interface_range(spec):
+    """Expand an 'interface range' argument like 'Gi1/0/1 - 4, Gi1/0/6' into port names."""
+    ports = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        match = _RANGE_ITEM.match(item)
+        if match:
+            prefix, first, last = match.group(1).strip(), int(match.group(2)), int(match.group(3))
+            ports.extend(normalize_interface_name(f"{prefix}{n}") for n in range(first, last + 1))
+        else:
+            ports.append(normalize_interface_name(item))
+    return ports
@@ -0,0 +1,320 @@
+# autoswitch/ipv4_batch.py
+"""
+Batch validation of IPv4 addresses and netmasks.
+
+parse_addresses() turns a sequence of dotted-quad strings into uint32
+values and per-row error codes in one pass; parse_netmasks() does the same
+for masks (dotted or a prefix length like "24") and rejects non-contiguous
+ones. network_batch() combines both into network addresses, prefix
+lengths and wildcard masks computed with bit operations.
+
+With NumPy installed the strings are laid out as a 16-column byte matrix
+and parsed one character column at a time for all rows at once, in place on
+preallocated byte rows; without it the same results come from a plain loop
+(as Python lists), so NumPy stays optional. Both accept exactly what
+ipaddress.IPv4Address accepts (no leading zeros, no whitespace).
+
+    values, codes = parse_addresses(["10.0.0.1", "10.0.0.256"])
+    codes  # [OK, INVALID_ADDRESS]
+"""
+import socket
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from autoswitch.netmasks import MASK_INTS, PREFIX_LENGTHS
+
+# Kody błędów zwracane dla każdego wiersza
+OK = 0
+INVALID_ADDRESS = 1
+INVALID_MASK = 2
+NONCONTIGUOUS_MASK = 3
+
+ERROR_MESSAGES = {
+    INVALID_ADDRESS: "niepoprawny adres IPv4",
+    INVALID_MASK: "niepoprawna maska",
+    NONCONTIGUOUS_MASK: "maska nie jest ciągła",
+}
+
+# Pola parametrów metod z adresem IPv4 i z maską podsieci (methods_data.py)
+ADDRESS_PARAMS = frozenset([
+    "VLAN IP Address", "Destination Network", "Next Hop IP", "Pool Start IP", "Pool End IP", "Network",
+    "Default Router", "DNS Server", "Network 1", "Network 2", "Network 3", "Network 4", "Firmware Server IP",
+])
+MASK_PARAMS = frozenset(["Subnet Mask", "Netmask", "Netmask 1", "Netmask 2", "Netmask 3", "Netmask 4"])
+
+# Poniżej tej liczby wierszy zwykła pętla jest szybsza niż przygotowanie tablic
+VECTOR_THRESHOLD = 64
+
+# Najdłuższy poprawny zapis: 255.255.255.255
+_WIDTH = 16
+
+_LENGTH_TEXTS = {str(length): length for length in range(33)}
+
+
+def _use_numpy(values, vectorized):
+    if vectorized is None:
+        vectorized = len(values) >= VECTOR_THRESHOLD
+    return vectorized and np is not None
+
+
+def _address_or_none(text):
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, text), "big")
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def _parse_addresses_loop(strings):
+    values = []
+    codes = []
+    for text in strings:
+        value = _address_or_none(text)
+        values.append(value or 0)
+        codes.append(OK if value is not None else INVALID_ADDRESS)
+    return values, codes
+
+
+def _char_matrix(strings):
+    """
+    (16, rows) uint8 matrix of the strings' bytes, column per string, zero-padded.
+
+    None when the strings can't be laid out like that (not str, non-ASCII or NUL
+    characters); the loop handles those rows.
+    """
+    if isinstance(strings, np.ndarray):
+        strings = strings.tolist()
+    try:
+        text = "".join(strings)
+    except TypeError:
+        return None
+    if not text.isascii() or "\0" in text:
+        return None
+    # Napisy dłuższe niż 16 znaków są obcinane, ale i tak mają znak w ostatniej kolumnie
+    return np.array(strings, dtype=f"S{_WIDTH}").view(np.uint8).reshape(-1, _WIDTH).T.copy()
+
+
+def _close_octets(closing, values, octet, digits, fields, invalid, flag, other, small, wide):
+    """Append the current octet of the closing rows to values; 1-3 digits, at most 255."""
+    np.subtract(digits, 1, out=small)
+    np.greater(small, 2, out=flag)
+    np.greater(octet, 255, out=other)
+    flag |= other
+    flag &= closing
+    invalid |= flag
+    closing = closing.view(np.uint8)
+    np.multiply(closing, 8, out=small)
+    np.left_shift(values, small, out=values)
+    np.multiply(octet, closing, out=wide)
+    values |= wide
+    fields += closing
+
+
+def _parse_chars(chars):
+    """
+    uint32 values and INVALID_ADDRESS codes of a (16, rows) character matrix, one column at a time.
+
+    Every step works in place on preallocated uint8/uint16 rows (booleans viewed as 0/1
+    multipliers instead of np.where), so a column costs a few passes over bytes.
+    """
+    rows = chars.shape[1]
+    values = np.zeros(rows, dtype=np.uint32)
+    octet = np.zeros(rows, dtype=np.uint16)
+    digits = np.zeros(rows, dtype=np.uint8)
+    fields = np.zeros(rows, dtype=np.uint8)
+    ended = np.zeros(rows, dtype=bool)
+    # Najdłuższy poprawny zapis ma 15 znaków
+    invalid = chars[_WIDTH - 1] != 0
+    digit = np.empty(rows, dtype=np.uint8)
+    small = np.empty(rows, dtype=np.uint8)
+    wide = np.empty(rows, dtype=np.uint16)
+    is_digit, is_dot, is_pad, closing, flag, other = (np.empty(rows, dtype=bool) for _ in range(6))
+    for column in chars[:_WIDTH - 1]:
+        np.subtract(column, 48, out=digit)
+        np.less(digit, 10, out=is_digit)
+        np.equal(column, 46, out=is_dot)
+        np.equal(column, 0, out=is_pad)
+        np.logical_or(is_digit, is_dot, out=flag)
+        flag |= is_pad
+        np.logical_not(flag, out=flag)
+        invalid |= flag
+        # Zera wiodące ("010") - ipaddress ich nie przyjmuje
+        np.equal(digits, 1, out=flag)
+        np.equal(octet, 0, out=other)
+        flag &= other
+        flag &= is_digit
+        invalid |= flag
+        # Oktet zamyka kropka albo pierwsze zero dopełnienia
+        np.greater(is_pad, ended, out=closing)
+        closing |= is_dot
+        _close_octets(closing, values, octet, digits, fields, invalid, flag, other, small, wide)
+        np.logical_not(closing, out=flag)
+        octet *= flag.view(np.uint8)
+        digits *= flag.view(np.uint8)
+        # Po końcu napisu i przy kropce cyfra jest zerowana; wartości w wierszach już błędnych nie mają znaczenia
+        digit *= is_digit.view(np.uint8)
+        octet *= 10
+        octet += digit
+        digits += is_digit.view(np.uint8)
+        ended |= is_pad
+    # Pełna szerokość bez końca napisu - ostatni oktet zamykamy tutaj
+    np.logical_not(ended, out=closing)
+    _close_octets(closing, values, octet, digits, fields, invalid, flag, other, small, wide)
+    invalid |= fields != 4
+    values[invalid] = 0
+    codes = invalid.view(np.uint8) * np.uint8(INVALID_ADDRESS)
+    return values, codes
+
+
+def _parse_addresses_numpy(strings):
+    chars = _char_matrix(strings)
+    if chars is None:
+        values, codes = _parse_addresses_loop(strings)
+        return np.asarray(values, dtype=np.uint32), np.asarray(codes, dtype=np.uint8)
+    return _parse_chars(chars)
+
+
+def parse_addresses(strings, vectorized=None):
+    """
+    Parse dotted-quad strings into (values, codes).
+
+    values are uint32 addresses (0 where invalid), codes OK or INVALID_ADDRESS per row. NumPy arrays
+    when NumPy is used (vectorized=None decides by size), lists otherwise.
+    """
+    if _use_numpy(strings, vectorized):
+        return _parse_addresses_numpy(strings)
+    return _parse_addresses_loop(strings)
+
+
+def _parse_netmasks_loop(strings, prefix_lengths):
+    length_texts = _LENGTH_TEXTS if prefix_lengths else {}
+    lengths = []
+    codes = []
+    for text in strings:
+        length = PREFIX_LENGTHS.get(text)
+        if length is None:
+            length = length_texts.get(text)
+        code = OK
+        if length is None:
+            # Poprawny adres spoza tablicy masek to maska nieciągła
+            code = INVALID_MASK if _address_or_none(text) is None else NONCONTIGUOUS_MASK
+            length = 0
+        lengths.append(length)
+        codes.append(code)
+    return lengths, codes
+
+
+def _parse_netmasks_numpy(strings, prefix_lengths):
+    chars = _char_matrix(strings)
+    if chars is None:
+        lengths, codes = _parse_netmasks_loop(strings, prefix_lengths)
+        return np.asarray(lengths, dtype=np.int8), np.asarray(codes, dtype=np.uint8)
+    values, codes = _parse_chars(chars)
+    table = np.array(MASK_INTS, dtype=np.uint32)
+    lengths = np.searchsorted(table, values).astype(np.int8)
+    contiguous = table[np.minimum(lengths, 32)] == values
+    codes = np.where(codes != OK, INVALID_MASK, np.where(contiguous, OK, NONCONTIGUOUS_MASK)).astype(np.uint8)
+    if not prefix_lengths:
+        lengths[codes != OK] = 0
+        return lengths, codes
+
+    # Długość prefiksu zamiast maski ("24"): jedna lub dwie cyfry, bez zera wiodącego, najwyżej 32
+    first, second = chars[0] - np.uint8(48), chars[1] - np.uint8(48)
+    second_digit = second < 10
+    short = (first < 10) & (chars[2] == 0) & (second_digit | (chars[1] == 0)) & ~((first == 0) & second_digit)
+    value = np.where(second_digit, first.astype(np.int8) * 10 + second.astype(np.int8), first.astype(np.int8))
+    short &= value <= 32
+    lengths[short] = value[short]
+    codes[short] = OK
+    lengths[codes != OK] = 0
+    return lengths, codes
+
+
+def parse_netmasks(strings, vectorized=None, prefix_lengths=True):
+    """
+    Parse netmasks (dotted, or a prefix length "0"-"32") into (prefix lengths, codes).
+
+    codes are OK, INVALID_MASK or NONCONTIGUOUS_MASK (e.g. 255.0.255.0) per row. With
+    prefix_lengths=False only dotted masks are accepted, as in the templates.
+    """
+    if _use_numpy(strings, vectorized):
+        return _parse_netmasks_numpy(strings, prefix_lengths)
+    return _parse_netmasks_loop(strings, prefix_lengths)
+
+
+def network_batch(addresses, masks, vectorized=None):
+    """
+    Validate address/mask pairs; returns (networks, prefix lengths, wildcards, codes).
+
+    The first error of a row wins: INVALID_ADDRESS, then the mask codes.
+    """
+    values, address_codes = parse_addresses(addresses, vectorized)
+    lengths, mask_codes = parse_netmasks(masks, vectorized)
+    if np is not None and isinstance(values, np.ndarray):
+        if not isinstance(lengths, np.ndarray):
+            lengths, mask_codes = np.asarray(lengths, dtype=np.int8), np.asarray(mask_codes, dtype=np.uint8)
+        table = np.array(MASK_INTS, dtype=np.uint32)
+        netmasks = table[lengths]
+        wildcards = ~netmasks
+        codes = np.where(address_codes != OK, address_codes, mask_codes).astype(np.uint8)
+        return values & netmasks, lengths, wildcards, codes
+    networks = []
+    wildcards = []
+    codes = []
+    for value, length, address_code, mask_code in zip(values, lengths, address_codes, mask_codes):
+        networks.append(value & MASK_INTS[length])
+        wildcards.append(~MASK_INTS[length] & 0xFFFFFFFF)
+        codes.append(address_code or mask_code)
+    return networks, list(lengths), wildcards, codes
+
+
+def to_dotted(values):
+    """Dotted-quad strings of uint32 values."""
+    if np is not None and isinstance(values, np.ndarray):
+        data = values.astype(">u4").tobytes()
+        return [socket.inet_ntoa(data[i:i + 4]) for i in range(0, len(data), 4)]
+    return [socket.inet_ntoa(int(value).to_bytes(4, "big")) for value in values]
+
+
+def error_rows(codes):
+    """Indices of rows with an error."""
+    if np is not None and isinstance(codes, np.ndarray):
+        return np.flatnonzero(codes).tolist()
+    return [row for row, code in enumerate(codes) if code]
+
+
+def inventory_address_errors(devices):
+    """
+    Validate the address and mask parameters of every inventory step in one batch per kind.
+
+    Returns {device name: [messages]} for devices with bad values, in inventory and step order, e.g.
+    "krok 2 (apply_static_routing): Subnet Mask '255.0.255.0' - maska nie jest ciągła".
+    """
+    addresses = []  # (wartość, (pozycja urządzenia, nazwa, numer kroku, metoda, pole))
+    masks = []
+    for position, device in enumerate(devices):
+        if not isinstance(device, dict) or not isinstance(device.get("steps"), list):
+            continue  # błędną strukturę zgłasza generator
+        for number, step in enumerate(device["steps"], 1):
+            params = step.get("params") if isinstance(step, dict) else None
+            if not isinstance(params, dict):
+                continue
+            for param, value in params.items():
+                rows = addresses if param in ADDRESS_PARAMS else masks if param in MASK_PARAMS else None
+                value = "" if value is None else str(value).strip()
+                if rows is not None and value:
+                    rows.append((value, (position, device.get("name", ""), number, step.get("method"), param)))
+
+    found = []
+    for rows, codes in ((addresses, parse_addresses([value for value, _ in addresses])[1]),
+                        (masks, parse_netmasks([value for value, _ in masks], prefix_lengths=False)[1])):
+        for row in error_rows(codes):
+            value, (position, name, number, method, param) = rows[row]
+            found.append((position, number, name, f"krok {number} ({method}): {param} '{value}' - {ERROR_MESSAGES[int(codes[row])]}"))
+    errors = {}
+    # Nazwy mogą być dowolnego typu (albo ich brak) - kolejność wyznacza pozycja w inwentarzu
+    for _, _, name, message in sorted(found, key=lambda error: error[:2]):
+        errors.setdefault(name, []).append(message)
+    return errors
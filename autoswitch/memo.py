@@ -0,0 +1,124 @@
+# autoswitch/memo.py
+"""
+Memoized template rendering.
+
+RenderCache sits in front of render_template and is keyed on a BLAKE2b
+digest of the method name, the canonicalized params, the port tuple and,
+for the VLAN-aware templates, the VLAN bitmap of the registry - the only
+registry state those templates read. The VLANs a call allocates are
+stored with the text and re-allocated on a hit, so the registry ends up
+exactly as after a real call; the same goes for a PrefixIndex, which
+is updated from the params on hits and misses alike. Entries are evicted least recently used
+once either max_entries or max_bytes is exceeded. Failed calls are not
+cached.
+
+    cache = RenderCache(max_entries=4096)
+    text = cache.render('set_access_vlan', params, ports, used_vlans)
+    cache.stats()  # {'hits': ..., 'misses': ..., 'hit_rate': ..., 'bytes': ...}
+"""
+import sys
+from collections import OrderedDict
+from hashlib import blake2b
+
+from autoswitch.template_logic import VLAN_TEMPLATE_FUNCTIONS, register_prefixes, render_template
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Stały narzut wpisu (klucz, krotka, węzeł OrderedDict) doliczany do rozmiaru tekstu
+_ENTRY_OVERHEAD = 200
+
+
+def _freeze(value):
+    """Hashable, order-independent form of a params value."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_freeze(v) for v in value))
+    return value
+
+
+def render_key(method_name, params, selected_ports, used_vlans=None):
+    """Content address of one template call."""
+    vlan_bits = used_vlans.bits if used_vlans is not None and method_name in VLAN_TEMPLATE_FUNCTIONS else None
+    canonical = (method_name, _freeze(params or {}), tuple(selected_ports), vlan_bits)
+    return blake2b(repr(canonical).encode("utf-8"), digest_size=16).digest()
+
+
+class RenderCache:
+    """LRU cache of rendered templates with replay of VLAN allocations."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # klucz -> (tekst, przydzielone VLAN-y)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def render(self, method_name, params, selected_ports, used_vlans, prefix_index=None, device=''):
+        """Same contract as render_template, served from the cache when possible."""
+        if self.max_entries <= 0:
+            return render_template(method_name, params, selected_ports, used_vlans, prefix_index, device)
+        text = self._render(method_name, params, selected_ports, used_vlans)
+        if prefix_index is not None:
+            register_prefixes(prefix_index, device, method_name, params, selected_ports)
+        return text
+
+    def _render(self, method_name, params, selected_ports, used_vlans):
+        key = render_key(method_name, params, selected_ports, used_vlans)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            text, allocated = entry
+            for vlan_id, name, color, description, method in allocated:
+                used_vlans.allocate(vlan_id, name, color, description, method)
+            return text
+
+        self.misses += 1
+        bits_before = used_vlans.bits if used_vlans is not None else 0
+        text = render_template(method_name, params, selected_ports, used_vlans)
+        allocated = ()
+        if used_vlans is not None and used_vlans.bits != bits_before:
+            new_bits = used_vlans.bits & ~bits_before
+            allocated = tuple((vlan_id, record.name, record.color, record.description, record.method)
+                              for vlan_id, record in used_vlans.items() if (new_bits >> vlan_id) & 1)
+        self._store(key, text, allocated)
+        return text
+
+    def _store(self, key, text, allocated):
+        entry_size = sys.getsizeof(text) + _ENTRY_OVERHEAD * (1 + len(allocated))
+        if entry_size > self.max_bytes:
+            return
+        self.entries[key] = (text, allocated)
+        self.size += entry_size
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            _, (old_text, old_allocated) = self.entries.popitem(last=False)
+            self.size -= sys.getsizeof(old_text) + _ENTRY_OVERHEAD * (1 + len(old_allocated))
+            self.evictions += 1
+
+    @property
+    def hit_rate(self):
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'entries': len(self.entries),
+            'bytes': self.size,
+            'evictions': self.evictions,
+        }
@@ -0,0 +1,50 @@
+# autoswitch/netmasks.py
+"""
+Lookup tables for the 33 valid IPv4 netmasks.
+
+Every table is indexed by prefix length (0-32); PREFIX_LENGTHS maps the
+canonical dotted mask back to its length, so a malformed or non-contiguous
+mask ("255.0.255.0") is rejected by a single dict miss. The dotted strings
+are interned, so generated configurations share them.
+
+    prefix_length("255.255.255.0")  # 24
+    wildcard("255.255.255.0")       # "0.0.0.255"
+    prefix_length("255.0.255.0")    # None
+"""
+import socket
+import sys
+
+# Maska jako liczba 32-bitowa dla każdej długości prefiksu
+MASK_INTS = tuple((0xFFFFFFFF << (32 - length)) & 0xFFFFFFFF for length in range(33))
+
+
+def _dotted(value):
+    return sys.intern(socket.inet_ntoa(value.to_bytes(4, "big")))
+
+
+MASKS = tuple(_dotted(mask) for mask in MASK_INTS)
+WILDCARDS = tuple(_dotted(~mask & 0xFFFFFFFF) for mask in MASK_INTS)
+# Liczba adresów hostów: bez adresu sieci i rozgłoszeniowego, /31 - dwa (łącza punkt-punkt), /32 - jeden
+HOST_COUNTS = tuple((1 << (32 - length)) - 2 if length < 31 else 2 if length == 31 else 1 for length in range(33))
+
+PREFIX_LENGTHS = {mask: length for length, mask in enumerate(MASKS)}
+
+
+def prefix_length(mask):
+    """Prefix length of a dotted netmask, or None for anything else (also non-contiguous masks)."""
+    return PREFIX_LENGTHS.get(mask)
+
+
+def wildcard(mask):
+    """Wildcard (inverse) mask of a dotted netmask, or None when it is not a valid netmask."""
+    length = PREFIX_LENGTHS.get(mask)
+    return WILDCARDS[length] if length is not None else None
+
+
+def network_address(address, length):
+    """Dotted network address of a dotted address with the given prefix length; raises ValueError for a bad address."""
+    try:
+        value = int.from_bytes(socket.inet_pton(socket.AF_INET, address), "big")
+    except (OSError, TypeError):
+        raise ValueError(f"'{address}' nie jest poprawnym adresem IPv4.")
+    return socket.inet_ntoa((value & MASK_INTS[length]).to_bytes(4, "big"))
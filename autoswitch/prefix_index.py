@@ -0,0 +1,407 @@
+# autoswitch/prefix_index.py
+"""
+IPv4 prefix index for conflict checks across applied configurations.
+
+Templates that configure addresses, pools or routes register what they
+configure as PrefixEntry records (interface subnets, interface addresses,
+DHCP and NAT pools, static routes and their next hops). Every register()
+first checks CONFLICT_RULES against the entries already in the index and
+raises PrefixConflict, listing each collision, before anything is added.
+
+Entries live in path-compressed binary radix tries, one per kind and
+device for rules within a device and one per kind for the whole fleet for
+rules such as duplicate addresses. Every trie node counts the entries in
+its subtree, so equality, containment and overlap checks walk at most 32
+levels even with 100k prefixes in the index. A journal of added entries
+allows rolling back everything added after mark().
+
+    index = PrefixIndex()
+    index.register("sw1", "apply_dhcp_server", [("dhcp-pool", "192.168.1.0/24", "LAN")])
+"""
+import argparse
+import ipaddress
+import socket
+import sys
+
+from autoswitch.netmasks import MASK_INTS, PREFIX_LENGTHS
+from autoswitch.validation import TemplateError
+
+DEVICE = 'device'
+FLEET = 'fleet'
+
+# Rodzaje wpisów i ich nazwy w komunikatach
+KIND_LABELS = {
+    'interface': "podsieć interfejsu",
+    'address': "adres interfejsu",
+    'dhcp-pool': "pula DHCP",
+    'nat-pool': "pula NAT",
+    'route': "trasa statyczna",
+    'next-hop': "next hop",
+}
+
+# (nowy rodzaj, istniejący rodzaj) -> (relacja, zasięg)
+# equal: ten sam prefiks, overlap: części wspólne, inside: nowy zawiera się w istniejącym,
+# covers: nowy obejmuje istniejący
+CONFLICT_RULES = {
+    ('interface', 'interface'): ('overlap', DEVICE),
+    ('address', 'address'): ('equal', FLEET),
+    ('dhcp-pool', 'dhcp-pool'): ('overlap', FLEET),
+    ('nat-pool', 'nat-pool'): ('overlap', DEVICE),
+    ('nat-pool', 'dhcp-pool'): ('overlap', DEVICE),
+    ('dhcp-pool', 'nat-pool'): ('overlap', DEVICE),
+    ('address', 'nat-pool'): ('inside', DEVICE),
+    ('nat-pool', 'address'): ('covers', DEVICE),
+    ('route', 'interface'): ('equal', DEVICE),
+    ('interface', 'route'): ('equal', DEVICE),
+    ('next-hop', 'address'): ('equal', DEVICE),
+    ('address', 'next-hop'): ('equal', DEVICE),
+}
+
+# Rodzaje, które trafiają też do drzewa całej floty
+FLEET_KINDS = frozenset(kind for pair, (_, scope) in CONFLICT_RULES.items() if scope == FLEET for kind in pair)
+
+
+def _address(text):
+    # inet_pton przyjmuje tylko pełny zapis a.b.c.d, bez zer wiodących - jak ipaddress, a kilka razy szybciej
+    return int.from_bytes(socket.inet_pton(socket.AF_INET, text), "big")
+
+
+def to_prefix(value):
+    """(network int, prefix length) of an IPv4Network, 'a.b.c.d/len', 'a.b.c.d/mask', 'a.b.c.d mask' or an address (/32)."""
+    if isinstance(value, tuple):
+        return value
+    if isinstance(value, ipaddress.IPv4Network):
+        return int(value.network_address), value.prefixlen
+    text = str(value).strip()
+    address, _, mask = text.replace(" ", "/").partition("/")
+    try:
+        key = _address(address)
+        if not mask:
+            length = 32
+        elif mask.isdecimal() and mask.isascii():
+            length = int(mask)
+        else:
+            length = PREFIX_LENGTHS[mask]
+    except (OSError, KeyError):
+        length = -1
+    if not 0 <= length <= 32:
+        raise TemplateError(f"'{text}' nie jest poprawną siecią IPv4.")
+    return key & MASK_INTS[length], length
+
+
+def format_prefix(key, length):
+    return f"{socket.inet_ntoa(key.to_bytes(4, 'big'))}/{length}"
+
+
+def range_prefixes(start, end):
+    """CIDR blocks exactly covering the address range start-end."""
+    try:
+        first, last = ipaddress.IPv4Address(start), ipaddress.IPv4Address(end)
+    except ValueError:
+        raise TemplateError(f"Zakres {start} - {end} zawiera niepoprawny adres IPv4.")
+    if first > last:
+        raise TemplateError(f"Początek zakresu {start} jest większy niż koniec {end}.")
+    return list(ipaddress.summarize_address_range(first, last))
+
+
+class PrefixEntry:
+    """One registered prefix: what configures it, where and for which ports or name."""
+    __slots__ = ('device', 'kind', 'key', 'length', 'method', 'label', 'ports')
+
+    def __init__(self, device, kind, key, length, method='', label='', ports=()):
+        self.device = device
+        self.kind = kind
+        self.key = key
+        self.length = length
+        self.method = method
+        self.label = label
+        self.ports = tuple(ports)
+
+    @property
+    def prefix(self):
+        return format_prefix(self.key, self.length)
+
+    def describe(self):
+        where = ", ".join(part for part in (self.device, self.method, self.label) if part)
+        return f"{KIND_LABELS.get(self.kind, self.kind)} {self.prefix}" + (f" ({where})" if where else "")
+
+    def __repr__(self):
+        return f"PrefixEntry({self.device!r}, {self.kind!r}, {self.prefix!r})"
+
+
+class PrefixConflict(TemplateError):
+    """Raised by PrefixIndex.register; conflicts holds (new entry, existing entry) pairs."""
+
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        lines = [f"{new.describe()} koliduje z: {existing.describe()}" for new, existing in conflicts]
+        super().__init__("Konflikt adresacji IP:\n" + "\n".join(lines))
+
+
+class _Node:
+    __slots__ = ('key', 'length', 'children', 'entries', 'count')
+
+    def __init__(self, key, length):
+        self.key = key
+        self.length = length
+        self.children = [None, None]
+        self.entries = None
+        self.count = 0  # wpisy w całym poddrzewie
+
+
+class PrefixTrie:
+    """Path-compressed binary radix trie of PrefixEntry objects, with entry counts per subtree."""
+
+    def __init__(self):
+        self.root = _Node(0, 0)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _find(self, key, length):
+        """Node of exactly (key, length), or None."""
+        node = self.root
+        while node is not None and node.length < length:
+            node = node.children[(key >> (31 - node.length)) & 1]
+        if node is None or node.length != length or node.key != key:
+            return None
+        return node
+
+    def add(self, entry):
+        key, length = entry.key, entry.length
+        node = self.root
+        node.count += 1
+        while node.length < length:
+            bit = (key >> (31 - node.length)) & 1
+            child = node.children[bit]
+            if child is None:
+                child = node.children[bit] = _Node(key, length)
+            elif child.length > length or (key & MASK_INTS[child.length]) != child.key:
+                # Rozdzielamy skompresowaną krawędź w miejscu rozejścia prefiksów
+                common = min(length, 32 - (key ^ child.key).bit_length())
+                middle = _Node(key & MASK_INTS[common], common)
+                middle.count = child.count
+                middle.children[(child.key >> (31 - common)) & 1] = child
+                child = node.children[bit] = middle
+            child.count += 1
+            node = child
+        if node.entries is None:
+            node.entries = []
+        node.entries.append(entry)
+        self.size += 1
+
+    def remove(self, entry):
+        key, length = entry.key, entry.length
+        node = self._find(key, length)
+        if node is None or not node.entries or entry not in node.entries:
+            return False
+        node.entries.remove(entry)
+        node = self.root
+        node.count -= 1
+        while node.length < length:
+            node = node.children[(key >> (31 - node.length)) & 1]
+            node.count -= 1
+        self.size -= 1
+        return True
+
+    def equal(self, key, length):
+        """Entries registered for exactly this prefix."""
+        node = self._find(key, length)
+        return list(node.entries) if node is not None and node.entries else []
+
+    def containing(self, key, length):
+        """Entries whose prefix contains (key, length), including equal ones."""
+        found = []
+        node = self.root
+        while node is not None and node.length <= length and (key & MASK_INTS[node.length]) == node.key:
+            if node.entries:
+                found.extend(node.entries)
+            if node.length == length:
+                break
+            node = node.children[(key >> (31 - node.length)) & 1]
+        return found
+
+    def first_within(self, key, length, strict=False):
+        """One entry inside (key, length) (equal ones too unless strict), found through the subtree counts."""
+        node = self.root
+        while node.length < length:
+            node = node.children[(key >> (31 - node.length)) & 1]
+            if node is None:
+                return None
+            if node.length >= length:
+                if (node.key & MASK_INTS[length]) != key:
+                    return None
+                break
+            if (key & MASK_INTS[node.length]) != node.key:
+                return None
+        # node jest korzeniem poddrzewa prefiksów zawartych w (key, length)
+        while node is not None and node.count:
+            if node.entries and not (strict and node.length == length):
+                return node.entries[0]
+            left, right = node.children
+            node = left if left is not None and left.count else right
+        return None
+
+
+class PrefixIndex:
+    """Prefix tries per device and kind and for the whole fleet, with conflict checks and a journal."""
+
+    def __init__(self, rules=CONFLICT_RULES):
+        self.rules = rules
+        self.rules_by_kind = {}  # rodzaj -> [(rodzaj istniejący, relacja, zasięg)]
+        for (kind, other_kind), (relation, scope) in rules.items():
+            self.rules_by_kind.setdefault(kind, []).append((other_kind, relation, scope))
+        self.devices = {}  # urządzenie -> {rodzaj: PrefixTrie}
+        self.fleet = {}    # rodzaj -> PrefixTrie
+        self.journal = []
+
+    def __len__(self):
+        return len(self.journal)
+
+    def conflicts(self, entry):
+        """(entry, existing) pairs for every rule the entry would break."""
+        found = []
+        key, length = entry.key, entry.length
+        for other_kind, relation, scope in self.rules_by_kind.get(entry.kind, ()):
+            tries = self.fleet if scope == FLEET else self.devices.get(entry.device, {})
+            trie = tries.get(other_kind)
+            if trie is None or not trie.size:
+                continue
+            if relation == 'equal':
+                found.extend((entry, existing) for existing in trie.equal(key, length))
+            elif relation == 'inside':
+                found.extend((entry, existing) for existing in trie.containing(key, length))
+            elif relation == 'covers':
+                existing = trie.first_within(key, length)
+                if existing is not None:
+                    found.append((entry, existing))
+            else:  # overlap
+                found.extend((entry, existing) for existing in trie.containing(key, length))
+                existing = trie.first_within(key, length, strict=True)
+                if existing is not None:
+                    found.append((entry, existing))
+        return found
+
+    def make_entries(self, device, method, entries):
+        """PrefixEntry objects from (kind, prefix, label[, ports]) tuples."""
+        made = []
+        for kind, prefix, label, *ports in entries:
+            made.append(PrefixEntry(device, kind, *to_prefix(prefix), method, label, ports[0] if ports else ()))
+        return made
+
+    def register(self, device, method, entries):
+        """
+        Check and add (kind, prefix, label[, ports]) entries all together.
+
+        Raises PrefixConflict (a TemplateError) with every conflict with the index (and between
+        the new entries up to the first conflict) and adds nothing in that case. Returns the added
+        PrefixEntry objects.
+        """
+        new_entries = self.make_entries(device, method, entries)
+        conflicts = []
+        added = []
+        for entry in new_entries:
+            conflicts.extend(self.conflicts(entry))
+            if not conflicts:
+                # Dodajemy od razu, żeby wykryć konflikty między nowymi wpisami
+                self._add(entry)
+                added.append(entry)
+        if conflicts:
+            for entry in reversed(added):
+                self._remove(entry)
+            raise PrefixConflict(conflicts)
+        self.journal.extend(added)
+        return added
+
+    def _add(self, entry):
+        tries = self.devices.setdefault(entry.device, {})
+        trie = tries.get(entry.kind)
+        if trie is None:
+            trie = tries[entry.kind] = PrefixTrie()
+        trie.add(entry)
+        if entry.kind in FLEET_KINDS:
+            trie = self.fleet.get(entry.kind)
+            if trie is None:
+                trie = self.fleet[entry.kind] = PrefixTrie()
+            trie.add(entry)
+
+    def _remove(self, entry):
+        self.devices[entry.device][entry.kind].remove(entry)
+        if entry.kind in FLEET_KINDS:
+            self.fleet[entry.kind].remove(entry)
+
+    def mark(self):
+        """Position in the journal to roll back to (removals made after it are not undone)."""
+        return len(self.journal)
+
+    def rollback(self, mark):
+        """Remove every entry registered after mark."""
+        while len(self.journal) > mark:
+            self._remove(self.journal.pop())
+
+    def remove_where(self, device, predicate):
+        """Remove the device's entries matching predicate (e.g. after default interface). Returns how many."""
+        kept = []
+        removed = 0
+        for entry in self.journal:
+            if entry.device == device and predicate(entry):
+                self._remove(entry)
+                removed += 1
+            else:
+                kept.append(entry)
+        self.journal = kept
+        return removed
+
+    def remove_interfaces(self, device, ports):
+        """Remove the device's entries configured on any of ports (after default interface)."""
+        ports = set(ports)
+        return self.remove_where(device, lambda entry: not ports.isdisjoint(entry.ports))
+
+    def clear_device(self, device):
+        """Forget everything registered for one device (e.g. after restart_device)."""
+        return self.remove_where(device, lambda entry: True)
+
+
+def check_inventory(devices):
+    """Render every inventory device into one fleet-wide PrefixIndex. Returns (index, [(device, error)])."""
+    from autoswitch.batch import build_document
+
+    index = PrefixIndex()
+    errors = []
+    for device in devices:
+        name = device.get("name", "") if isinstance(device, dict) else ""
+        try:
+            build_document(device, prefix_index=index)
+        except TemplateError as e:
+            errors.append((name, str(e)))
+    return index, errors
+
+
+def main(argv=None):
+    from autoswitch.batch import InventoryError, load_inventory
+    from autoswitch.ipv4_batch import inventory_address_errors
+
+    parser = argparse.ArgumentParser(prog="python -m autoswitch.prefix_index",
+                                     description="Sprawdza konflikty adresacji IP w całym inwentarzu.")
+    parser.add_argument("inventory", help="plik inwentarza (YAML lub JSON)")
+    args = parser.parse_args(argv)
+    try:
+        devices = load_inventory(args.inventory)
+    except (OSError, ValueError, InventoryError) as e:
+        print(f"Błąd inwentarza: {e}", file=sys.stderr)
+        return 2
+    # Najpierw wszystkie adresy i maski naraz; urządzeń z błędnymi wartościami nie generujemy
+    address_errors = inventory_address_errors(devices)
+    errors = [(name, message) for name, messages in address_errors.items() for message in messages]
+    valid = [device for device in devices if not isinstance(device, dict) or device.get("name", "") not in address_errors]
+    index, render_errors = check_inventory(valid)
+    errors.extend(render_errors)
+    for name, error in errors:
+        print(f"[BŁĄD] {name}: {error}", file=sys.stderr)
+    print(f"Sprawdzono {len(devices)} urządzeń, {len(index)} prefiksów, błędów: {len(errors)}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
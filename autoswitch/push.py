@@ -0,0 +1,403 @@
+# autoswitch/push.py
+"""
+Concurrent push of generated configurations to many devices.
+
+Each device gets one DeviceSession over a telnet-style line protocol
+(raw TCP with minimal telnet option handling). A session is reused for all
+jobs of the same host, and commands are pipelined: up to `window`
+commands are written ahead of the device prompts, with writer.drain() as
+backpressure. Replies are matched to commands by counting prompts, and
+every "% Invalid input"-style reply is reported with its command. The
+number of devices handled at once is bounded by a semaphore.
+
+    python -m autoswitch.push targets.txt -c 100
+    # targets.txt: "<host>[:<port>] <plik konfiguracji>" w każdej linii
+
+Any transport yielding asyncio (reader, writer) streams can be plugged in
+through the `connector` argument.
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import time
+
+DEFAULT_PORT = 23
+
+# Odpowiedzi IOS oznaczające odrzucone polecenie
+ERROR_MARKERS = ("% Invalid input", "% Incomplete command", "% Ambiguous command", "% Unknown command",
+                 "% Bad mask", "% Invalid")
+
+# Pytania o potwierdzenie kończą polecenie tak jak znak zachęty
+_CONFIRM = re.compile(r"(\[confirm\]|\[yes/no\]:?|\]\?)\s*$")
+_PROMPT = re.compile(r"^([A-Za-z0-9_.\-]+)(\([A-Za-z0-9_.\-]+\))?[>#]")
+_LOGIN = re.compile(r"(username|login):\s*$", re.IGNORECASE)
+_PASSWORD = re.compile(r"password:\s*$", re.IGNORECASE)
+
+# Telnet: IAC i kody negocjacji opcji
+IAC, DONT, DO, WONT, WILL, SB, SE = 255, 254, 253, 252, 251, 250, 240
+
+
+class PushError(Exception):
+    """Connection-level failure of a push (refused, closed, timed out)."""
+    pass
+
+
+class PushResult:
+    """Outcome of pushing one configuration to one device."""
+    __slots__ = ('host', 'port', 'commands', 'errors', 'error', 'elapsed')
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.commands = 0
+        self.errors = []   # (polecenie, odpowiedź urządzenia)
+        self.error = None  # błąd połączenia
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        return self.error is None and not self.errors
+
+    def __repr__(self):
+        return f"PushResult({self.host}:{self.port}, ok={self.ok}, commands={self.commands})"
+
+
+def config_commands(config):
+    """
+    Return the lines of a ConfigDocument or config text to send to a device.
+
+    Comment lines are skipped. Whitespace-only lines are kept as empty
+    commands because the templates use them to answer confirmations.
+    """
+    lines = config.iter_lines() if hasattr(config, 'iter_lines') else config.splitlines()
+    commands = []
+    for line in lines:
+        if line.startswith("!"):
+            continue
+        if not line.strip():
+            if line:
+                commands.append("")
+            continue
+        commands.append(line.strip())
+    return commands
+
+
+class DeviceSession:
+    """One telnet-style connection to a device, reusable for several pushes."""
+
+    def __init__(self, host, port=DEFAULT_PORT, timeout=30.0, window=32, username=None, password=None,
+                 secret=None, connector=asyncio.open_connection):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.window = max(1, window)
+        self.username = username
+        self.password = password
+        self.secret = secret
+        self.connector = connector
+        self.reader = None
+        self.writer = None
+        self.lock = asyncio.Lock()
+        self.hostname = None
+        self.hostname_aliases = set()  # nazwy ustawione poleceniem hostname w trakcie wysyłania
+        self.reloading = False
+
+        self.prompts = 0          # liczba zauważonych znaków zachęty
+        self.line = bytearray()   # bieżąca, niezakończona linia
+        self.line_counted = False
+        self.errors = []          # (indeks znaku zachęty, linia błędu)
+        self.telnet_state = None  # stan parsera sekwencji IAC
+
+    @property
+    def connected(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def connect(self):
+        try:
+            self.reader, self.writer = await asyncio.wait_for(self.connector(self.host, self.port), self.timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise PushError(f"nie można połączyć z {self.host}:{self.port}: {e or 'timeout'}") from e
+        self.prompts = 0
+        self.line.clear()
+        self.line_counted = False
+        self.errors.clear()
+        self.reloading = False
+        await self._wait_for_prompts(1)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+            self.writer = None
+
+    async def send_commands(self, commands, stop_on_error=False):
+        """
+        Send commands pipelined, up to `window` ahead of the device prompts.
+
+        Returns (number of commands sent, [(command, error line), ...] for rejected commands).
+        With stop_on_error every command waits for the reply to the previous one (a window of 1),
+        so nothing is sent after the first rejection.
+        """
+        if not self.connected:
+            await self.connect()
+        base = self.prompts
+        self.errors.clear()
+        sent = 0
+        total = len(commands)
+        writer = self.writer
+        # Przy zatrzymaniu na błędzie odpowiedź musi przyjść przed wysłaniem kolejnego polecenia
+        window = 1 if stop_on_error else self.window
+
+        while self.prompts - base < sent or sent < total:
+            # Okno: nie więcej niż `window` poleceń bez odpowiedzi
+            while sent < total and sent - (self.prompts - base) < window:
+                if stop_on_error and self.errors:
+                    total = sent
+                    break
+                command = commands[sent]
+                if command.startswith("hostname "):
+                    self.hostname_aliases.add(command[len("hostname "):].strip())
+                elif command.startswith("reload"):
+                    self.reloading = True
+                writer.write(command.encode() + b"\n")
+                sent += 1
+            await writer.drain()
+            if self.prompts - base >= sent and sent >= total:
+                break
+            await self._read_chunk()
+            if not self.connected:
+                break
+
+        # Odpowiedź na polecenie k pojawia się po znaku zachęty o indeksie base - 1 + k
+        first = base - 1
+        return sent, [(commands[index - first], line) for index, line in self.errors
+                      if 0 <= index - first < len(commands)]
+
+    async def _wait_for_prompts(self, count):
+        target = self.prompts + count
+        while self.prompts < target:
+            await self._read_chunk()
+
+    async def _read_chunk(self):
+        try:
+            data = await asyncio.wait_for(self.reader.read(65536), self.timeout)
+        except asyncio.TimeoutError as e:
+            raise PushError(f"{self.host}:{self.port}: brak odpowiedzi przez {self.timeout:.0f} s") from e
+        except OSError as e:
+            raise PushError(f"{self.host}:{self.port}: {e}") from e
+        if not data:
+            if self.reloading:
+                # Po reload urządzenie zamyka połączenie - to oczekiwany koniec
+                await self.close()
+                return
+            raise PushError(f"{self.host}:{self.port}: połączenie zamknięte przez urządzenie")
+        self._feed(self._strip_telnet(data))
+
+    def _strip_telnet(self, data):
+        """Drop telnet negotiation from data, refusing every option."""
+        if IAC not in data and self.telnet_state is None:
+            return data
+        out = bytearray()
+        replies = bytearray()
+        state = self.telnet_state
+        for byte in data:
+            if state is None:
+                if byte == IAC:
+                    state = 'iac'
+                else:
+                    out.append(byte)
+            elif state == 'iac':
+                if byte in (DO, DONT, WILL, WONT):
+                    state = byte
+                elif byte == SB:
+                    state = 'sb'
+                else:
+                    if byte == IAC:
+                        out.append(IAC)
+                    state = None
+            elif state == 'sb':
+                state = 'sb-iac' if byte == IAC else 'sb'
+            elif state == 'sb-iac':
+                state = None if byte == SE else 'sb'
+            else:
+                if state == DO:
+                    replies += bytes((IAC, WONT, byte))
+                elif state == WILL:
+                    replies += bytes((IAC, DONT, byte))
+                state = None
+        self.telnet_state = state
+        if replies and self.writer is not None:
+            self.writer.write(bytes(replies))
+        return bytes(out)
+
+    def _feed(self, data):
+        """Split data into lines, counting prompts and collecting error lines."""
+        start = 0
+        while True:
+            end = data.find(b"\n", start)
+            if end < 0:
+                self.line += data[start:]
+                self._check_partial()
+                return
+            self.line += data[start:end]
+            self._complete_line()
+            start = end + 1
+
+    def _complete_line(self):
+        text = self.line.decode("utf-8", "replace").strip("\r")
+        if not self.line_counted and self._is_prompt(text):
+            self.prompts += 1
+        elif text.lstrip().startswith(ERROR_MARKERS):
+            # Błąd dotyczy polecenia wysłanego po ostatnim znaku zachęty
+            self.errors.append((self.prompts - 1, text.strip()))
+        self.line.clear()
+        self.line_counted = False
+
+    def _check_partial(self):
+        if self.line_counted or not self.line:
+            return
+        text = self.line.decode("utf-8", "replace").strip("\r")
+        if self._is_prompt(text) or _CONFIRM.search(text):
+            self.prompts += 1
+            self.line_counted = True
+        elif self.writer is not None:
+            # Logowanie i hasło do trybu enable
+            if _LOGIN.search(text) and self.username:
+                self.writer.write(self.username.encode() + b"\n")
+                self.line_counted = True
+            elif _PASSWORD.search(text):
+                # Przed pierwszym znakiem zachęty to logowanie, później hasło trybu enable
+                secret = self.password if self.hostname is None else self.secret or self.password
+                if secret:
+                    self.writer.write(secret.encode() + b"\n")
+                    self.line_counted = True
+
+    def _is_prompt(self, text):
+        match = _PROMPT.match(text)
+        if not match:
+            return False
+        name = match.group(1)
+        if self.hostname is None:
+            self.hostname = name
+            return True
+        if name != self.hostname and name in self.hostname_aliases:
+            self.hostname = name
+        return name == self.hostname
+
+
+async def push_config(session, config, stop_on_error=False):
+    """Push one ConfigDocument or config text over an existing session."""
+    result = PushResult(session.host, session.port)
+    commands = config_commands(config)
+    start = time.perf_counter()
+    async with session.lock:
+        try:
+            result.commands, result.errors = await session.send_commands(commands, stop_on_error)
+        except PushError as e:
+            result.error = str(e)
+            await session.close()
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def push_many(jobs, concurrency=64, window=32, timeout=30.0, stop_on_error=False,
+                    username=None, password=None, secret=None, connector=asyncio.open_connection):
+    """
+    Push configs to many devices at once.
+
+    jobs is an iterable of (host, port, config); jobs for the same host
+    reuse one session and run in order. At most `concurrency` devices are
+    handled at a time. Returns PushResults in job order.
+    """
+    jobs = list(jobs)
+    by_device = {}
+    for index, (host, port, config) in enumerate(jobs):
+        by_device.setdefault((host, port), []).append((index, config))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    results = [None] * len(jobs)
+
+    async def run_device(host, port, device_jobs):
+        async with semaphore:
+            session = DeviceSession(host, port, timeout, window, username, password, secret, connector)
+            try:
+                for index, config in device_jobs:
+                    results[index] = await push_config(session, config, stop_on_error)
+            finally:
+                await session.close()
+
+    await asyncio.gather(*(run_device(host, port, device_jobs)
+                           for (host, port), device_jobs in by_device.items()))
+    return results
+
+
+def parse_target(text):
+    host, sep, port = text.rpartition(":")
+    if not sep or not port.isdigit():
+        return text, DEFAULT_PORT
+    return host, int(port)
+
+
+def load_targets(path):
+    """Read '<host>[:<port>] <config file>' lines into push jobs."""
+    jobs = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            target, _, config_path = line.partition(" ")
+            if not config_path.strip():
+                raise ValueError(f"{path}:{number}: brak pliku konfiguracji")
+            with open(config_path.strip(), encoding="utf-8") as config_file:
+                jobs.append((*parse_target(target), config_file.read()))
+    return jobs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m autoswitch.push",
+                                     description="Wysyła konfiguracje do wielu urządzeń jednocześnie (telnet).")
+    parser.add_argument("targets", help="plik z liniami '<host>[:<port>] <plik konfiguracji>'")
+    parser.add_argument("-c", "--concurrency", type=int, default=64, help="liczba urządzeń naraz (domyślnie 64)")
+    parser.add_argument("-w", "--window", type=int, default=32,
+                        help="liczba poleceń wysyłanych przed odpowiedzią urządzenia (domyślnie 32)")
+    parser.add_argument("-t", "--timeout", type=float, default=30.0, help="limit czasu odpowiedzi (s)")
+    parser.add_argument("--stop-on-error", action="store_true",
+                        help="nie wysyłaj dalszych poleceń po pierwszym błędzie (polecenia idą wtedy pojedynczo)")
+    parser.add_argument("--username", default=os.environ.get("AUTOSWITCH_USERNAME"))
+    parser.add_argument("--password", default=os.environ.get("AUTOSWITCH_PASSWORD"))
+    parser.add_argument("--secret", default=os.environ.get("AUTOSWITCH_SECRET"), help="hasło trybu enable")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = load_targets(args.targets)
+    except (OSError, ValueError) as e:
+        print(f"Błąd listy urządzeń: {e}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    results = asyncio.run(push_many(jobs, args.concurrency, args.window, args.timeout, args.stop_on_error,
+                                    args.username, args.password, args.secret))
+    elapsed = time.perf_counter() - start
+
+    failed = 0
+    for result in results:
+        if result.ok:
+            continue
+        failed += 1
+        if result.error:
+            print(f"[BŁĄD] {result.host}:{result.port}: {result.error}", file=sys.stderr)
+        for command, message in result.errors:
+            print(f"[BŁĄD] {result.host}:{result.port}: '{command}' -> {message}", file=sys.stderr)
+    commands = sum(result.commands for result in results)
+    print(f"Wysłano {len(results) - failed}/{len(results)} konfiguracji ({commands} poleceń) w {elapsed:.2f} s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+# autoswitch/running_config.py
+"""
+Streaming reader of `show running-config` and `show vlan brief` output.
+
+The text is processed one line at a time (files through mmap), so an
+archive of any size is read in constant memory: only the resulting state
+is kept, i.e. a VlanRegistry with the device's VLANs and a small __slots__
+record per port. When a file holds several captures, later lines win.
+
+    state = load_device_state("sw1-running.txt")
+    state.vlans        # VlanRegistry
+    state.port_vlan("Gi1/0/1")
+"""
+import mmap
+import os
+import re
+
+from autoswitch.interfaces import normalize_interface_name
+from autoswitch.vlans import MAX_VLAN, MIN_VLAN, VlanRangeSet, VlanRegistry, apply_allowed_vlans
+from autoswitch.validation import TemplateError
+
+# VLAN-y istniejące na każdym przełączniku - nie trafiają do rejestru
+DEFAULT_VLANS = frozenset((1, 1002, 1003, 1004, 1005))
+
+# Kolory VLAN-ów wczytanych z urządzenia (nie mają koloru w konfiguracji), nadawane po kolei
+VLAN_PALETTE = ('#4CAF50', '#2196F3', '#FF9800', '#9C27B0', '#009688',
+                '#E91E63', '#795548', '#3F51B5', '#CDDC39', '#FF5722')
+
+SOURCE_METHOD = 'running-config'
+
+# Co tyle bajtów zwalniamy już przeczytane strony pliku
+RELEASE_CHUNK = 8 * 1024 * 1024
+
+_VLAN_BRIEF_ROW = re.compile(r"^(\d+)\s+(\S+)\s+(\S+)\s*(.*)$")
+_PAGER = re.compile(r"\s*--More--\s*(?:\x08+\s+\x08+)?")
+
+
+class PortState:
+    """Switching state of one interface read from the device."""
+    __slots__ = ('name', 'mode', 'access_vlan', 'native_vlan', 'allowed_vlans', 'description', 'shutdown')
+
+    def __init__(self, name):
+        self.name = name
+        self.mode = None
+        self.access_vlan = None
+        self.native_vlan = None
+        self.allowed_vlans = None  # VlanRangeSet; None = wszystkie
+        self.description = ''
+        self.shutdown = False
+
+    def __repr__(self):
+        return f"PortState({self.name!r}, mode={self.mode!r}, access={self.access_vlan}, native={self.native_vlan})"
+
+
+class DeviceState:
+    """VLANs and per-port state of one device."""
+    __slots__ = ('hostname', 'vlans', 'ports')
+
+    def __init__(self):
+        self.hostname = None
+        self.vlans = VlanRegistry()
+        self.ports = {}
+
+    def port(self, name):
+        port = self.ports.get(name)
+        if port is None:
+            port = self.ports[name] = PortState(name)
+        return port
+
+    def add_vlan(self, vlan_id, name=None):
+        """Register a VLAN seen on the device; a later name overrides the earlier one."""
+        if vlan_id in DEFAULT_VLANS or not MIN_VLAN <= vlan_id <= MAX_VLAN:
+            return
+        record = self.vlans.get(vlan_id)
+        if record is None:
+            color = VLAN_PALETTE[len(self.vlans) % len(VLAN_PALETTE)]
+            self.vlans.allocate(vlan_id, name or f"VLAN{vlan_id:04d}", color, '', SOURCE_METHOD)
+        elif name:
+            record.name = name
+
+    def port_vlan(self, name):
+        """VLAN that colours the port: the access VLAN, or the native VLAN of a trunk."""
+        port = self.ports.get(name)
+        if port is None:
+            return None
+        vlan_id = port.native_vlan if port.mode == 'trunk' else port.access_vlan
+        return vlan_id if vlan_id in self.vlans else None
+
+
+class RunningConfigParser:
+    """Line-by-line state machine filling a DeviceState."""
+
+    def __init__(self, state=None):
+        self.state = state if state is not None else DeviceState()
+        self.port = None        # interfejs, którego dotyczą linie z wcięciem
+        self.vlan_ids = ()      # VLAN-y, których dotyczą linie z wcięciem
+        self.brief_vlan = None  # wiersz tabeli show vlan brief, do którego dopisujemy porty
+
+    def feed(self, line):
+        if "--More--" in line:
+            line = _PAGER.sub("", line)
+        stripped = line.strip()
+        if not stripped or stripped[0] == "!":
+            self.port = None
+            self.vlan_ids = ()
+            self.brief_vlan = None
+            return
+
+        if line[0].isspace():
+            if self.port is not None:
+                self._interface_line(stripped)
+            elif self.vlan_ids:
+                if stripped.startswith("name "):
+                    for vlan_id in self.vlan_ids:
+                        self.state.add_vlan(vlan_id, stripped[5:].strip())
+            elif self.brief_vlan is not None:
+                self._brief_ports(self.brief_vlan, stripped)
+            return
+
+        self.port = None
+        self.vlan_ids = ()
+        self.brief_vlan = None
+        if stripped[0].isdigit():
+            self._brief_row(stripped)
+        elif stripped.startswith("interface "):
+            name = stripped[len("interface "):]
+            if not name.startswith("range "):
+                self.port = self.state.port(normalize_interface_name(name))
+        elif stripped.startswith("vlan ") and stripped[5:6].isdigit():
+            self.vlan_ids = _vlan_ids(stripped[5:])
+            for vlan_id in self.vlan_ids:
+                self.state.add_vlan(vlan_id)
+        elif stripped.startswith("no vlan "):
+            for vlan_id in _vlan_ids(stripped[8:]):
+                self.state.vlans.free(vlan_id)
+        elif stripped.startswith("hostname "):
+            self.state.hostname = stripped[len("hostname "):].strip()
+
+    def _interface_line(self, line):
+        port = self.port
+        if line.startswith("switchport mode "):
+            mode = line[len("switchport mode "):].split()[0]
+            port.mode = mode if mode in ('access', 'trunk') else port.mode
+        elif line.startswith("switchport access vlan "):
+            port.access_vlan = _to_vlan(line[len("switchport access vlan "):])
+            port.mode = port.mode or 'access'
+        elif line.startswith("switchport trunk native vlan "):
+            port.native_vlan = _to_vlan(line[len("switchport trunk native vlan "):])
+        elif line.startswith("switchport trunk allowed vlan "):
+            port.allowed_vlans = _allowed_vlans(port.allowed_vlans, line[len("switchport trunk allowed vlan "):])
+        elif line.startswith("description "):
+            port.description = line[len("description "):]
+        elif line == "shutdown":
+            port.shutdown = True
+        elif line == "no shutdown":
+            port.shutdown = False
+
+    def _brief_row(self, line):
+        match = _VLAN_BRIEF_ROW.match(line)
+        if not match:
+            return
+        vlan_id = int(match.group(1))
+        self.state.add_vlan(vlan_id, match.group(2))
+        self.brief_vlan = vlan_id
+        self._brief_ports(vlan_id, match.group(4))
+
+    def _brief_ports(self, vlan_id, text):
+        # show vlan brief wymienia tylko porty dostępowe
+        for name in text.split(","):
+            name = name.strip()
+            if name:
+                port = self.state.port(normalize_interface_name(name))
+                port.mode = 'access'
+                port.access_vlan = vlan_id
+
+
+def _vlan_ids(text):
+    """VLAN IDs of a 'vlan 10' or 'vlan 10,20-30' header; [] when the list is invalid."""
+    text = text.strip()
+    if text.isdigit():
+        return [int(text)]
+    try:
+        vlans = VlanRangeSet.parse(text)
+    except TemplateError:
+        return []
+    return [vlan_id for first, last in vlans.ranges for vlan_id in range(first, last + 1)]
+
+
+def _to_vlan(text):
+    text = text.strip()
+    return int(text) if text.isdigit() else None
+
+
+def _allowed_vlans(current, text):
+    """Apply 'switchport trunk allowed vlan [add|remove|except] ...' to the current VlanRangeSet."""
+    try:
+        return apply_allowed_vlans(current, text)
+    except TemplateError:
+        return current
+
+
+def parse_device_state(lines, state=None):
+    """Parse an iterable of lines (running-config and/or show vlan brief) into a DeviceState."""
+    parser = RunningConfigParser(state)
+    for line in lines:
+        parser.feed(line)
+    return parser.state
+
+
+def iter_file_lines(path, encoding="utf-8"):
+    """
+    Yield the lines of a file through mmap, without loading the whole file.
+
+    Already processed pages are released every RELEASE_CHUNK bytes (where
+    the platform supports madvise), so the resident size stays flat even
+    for archives of hundreds of megabytes.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            release = hasattr(mm, "madvise") and hasattr(mmap, "MADV_DONTNEED")
+            if release and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            released = 0
+            readline = mm.readline
+            for raw in iter(readline, b""):
+                yield raw.decode(encoding, "replace").rstrip("\r\n")
+                if release and mm.tell() - released >= RELEASE_CHUNK:
+                    end = mm.tell() - mm.tell() % mmap.PAGESIZE
+                    mm.madvise(mmap.MADV_DONTNEED, released, end - released)
+                    released = end
+
+
+def load_device_state(*paths, encoding="utf-8"):
+    """Read one or more captured files (e.g. running-config and show vlan brief) into one DeviceState."""
+    state = DeviceState()
+    for path in paths:
+        parse_device_state(iter_file_lines(path, encoding), state)
+    return state
@@ -0,0 +1,240 @@
+# autoswitch/simulator.py
+"""
+Local IOS-like prompt simulator for testing and benchmarking autoswitch.push.
+
+Every simulated device listens on its own TCP port and behaves like a
+console session: it echoes commands, keeps the CLI mode (`SW1>`, `SW1#`,
+`SW1(config)#`, `SW1(config-if)#`...), asks for confirmations on erase and
+reload, and answers "% Invalid input" for commands used in the wrong mode
+or matching the reject pattern. Configuration lines are stored per device.
+It is lenient about mode changes (e.g. `configure terminal` from a config
+sub-mode) and does not validate IOS syntax.
+
+    python -m autoswitch.simulator --count 500 --base-port 20000 --delay-ms 5
+
+--delay-ms delays every reply without blocking the next command, which
+models the round trip of a slow management network.
+"""
+import argparse
+import asyncio
+import re
+import sys
+
+# Polecenia otwierające podtryby konfiguracji
+SUBMODES = (
+    ("interface range ", "config-if-range"),
+    ("interface ", "config-if"),
+    ("vlan ", "config-vlan"),
+    ("router ", "config-router"),
+    ("ip dhcp pool ", "dhcp-config"),
+    ("line ", "config-line"),
+)
+
+EXEC_COMMANDS = ("show ", "write", "copy ", "erase ", "reload", "ping ", "terminal ", "dir", "disable", "clear ")
+
+INVALID = "% Invalid input detected at '^' marker.\r\n"
+
+
+class SimulatedDevice:
+    """CLI state and stored configuration of one simulated device."""
+
+    def __init__(self, hostname, reject=None):
+        self.hostname = hostname
+        self.reject = re.compile(reject) if reject else None
+        self.mode = 'exec'   # exec, privileged, config lub nazwa podtrybu
+        self.config = []
+        self.pending = None  # obsługa następnej linii po pytaniu o potwierdzenie
+        self.modified = False
+        self.closed = False
+
+    def prompt(self):
+        if self.mode == 'exec':
+            return f"{self.hostname}>"
+        if self.mode == 'privileged':
+            return f"{self.hostname}#"
+        if self.mode == 'config':
+            return f"{self.hostname}(config)#"
+        return f"{self.hostname}({self.mode})#"
+
+    def execute(self, command):
+        """Run one command line; return the text shown after its echo."""
+        if self.pending is not None:
+            handler, self.pending = self.pending, None
+            return handler(command)
+        command = command.strip()
+        if not command:
+            return self.prompt()
+        if self.reject is not None and self.reject.search(command):
+            return INVALID + self.prompt()
+
+        if self.mode == 'exec':
+            if command in ("enable", "en"):
+                self.mode = 'privileged'
+                return self.prompt()
+            if command.startswith(("show ", "ping ", "terminal ")):
+                return self.prompt()
+            return INVALID + self.prompt()
+
+        if command in ("enable", "en"):
+            return self.prompt()  # już w trybie uprzywilejowanym - jak IOS, bez błędu
+        if command.startswith("do "):
+            return self._exec_command(command[3:]) if self.mode != 'privileged' else INVALID + self.prompt()
+        if self.mode == 'privileged':
+            if command in ("configure terminal", "conf t"):
+                self.mode = 'config'
+                return "Enter configuration commands, one per line.  End with CNTL/Z.\r\n" + self.prompt()
+            if command in ("end", "exit"):
+                return self.prompt()
+            return self._exec_command(command)
+
+        # Tryb konfiguracji i podtryby
+        if command == "end":
+            self.mode = 'privileged'
+            return self.prompt()
+        if command == "exit":
+            self.mode = 'privileged' if self.mode == 'config' else 'config'
+            return self.prompt()
+        if command in ("configure terminal", "conf t"):
+            self.mode = 'config'
+            return self.prompt()
+        if command.startswith(EXEC_COMMANDS):
+            return INVALID + self.prompt()
+        if command.startswith("hostname "):
+            self.hostname = command[len("hostname "):].strip()
+        submode = next((mode for prefix, mode in SUBMODES if command.startswith(prefix)), None)
+        if submode is not None:
+            self.mode = submode
+            self.config.append(command)
+        else:
+            self.config.append(command if self.mode == 'config' else " " + command)
+        self.modified = True
+        return self.prompt()
+
+    def _exec_command(self, command):
+        if command.startswith(("erase startup-config", "write erase")):
+            self.pending = self._confirm_erase
+            return "Erasing the nvram filesystem will remove all configuration files! Continue? [confirm]"
+        if command.startswith("reload"):
+            if self.modified:
+                self.pending = self._save_before_reload
+                return "System configuration has been modified. Save? [yes/no]: "
+            self.pending = self._confirm_reload
+            return "Proceed with reload? [confirm]"
+        if command.startswith(("write", "copy running-config")):
+            self.modified = False
+            return "Building configuration...\r\n[OK]\r\n" + self.prompt()
+        if command.startswith("copy "):
+            return "Accessing source...\r\n[OK]\r\n" + self.prompt()
+        if command.startswith("show running-config"):
+            return "\r\n".join(["Building configuration...", "!", f"hostname {self.hostname}",
+                                *self.config, "end", ""]) + self.prompt()
+        if command.startswith(EXEC_COMMANDS):
+            return self.prompt()
+        return INVALID + self.prompt()
+
+    def _confirm_erase(self, answer):
+        self.config.clear()
+        return "[OK]\r\nErase of nvram: complete\r\n" + self.prompt()
+
+    def _save_before_reload(self, answer):
+        self.modified = False
+        self.pending = self._confirm_reload
+        return "Proceed with reload? [confirm]"
+
+    def _confirm_reload(self, answer):
+        self.closed = True
+        self.mode = 'exec'
+        return ""
+
+
+class SimulatorServer:
+    """Serves one SimulatedDevice per listening port."""
+
+    def __init__(self, delay=0.0, reject=None, hostname_prefix="SW"):
+        self.delay = delay
+        self.reject = reject
+        self.hostname_prefix = hostname_prefix
+        self.devices = {}
+        self.servers = []
+        self.connections = set()
+
+    async def start(self, count, base_port, host="127.0.0.1"):
+        for i in range(count):
+            port = base_port + i
+            device = self.devices[port] = SimulatedDevice(f"{self.hostname_prefix}{i + 1}", self.reject)
+            server = await asyncio.start_server(lambda r, w, d=device: self.handle(d, r, w), host, port)
+            self.servers.append(server)
+        return self
+
+    async def close(self):
+        for server in self.servers:
+            server.close()
+        for writer in list(self.connections):
+            writer.close()
+        for server in self.servers:
+            await server.wait_closed()
+        self.servers.clear()
+        await asyncio.sleep(0)
+
+    async def handle(self, device, reader, writer):
+        loop = asyncio.get_running_loop()
+        device.mode = 'exec'
+        device.pending = None
+        device.closed = False
+        self.connections.add(writer)
+        self._send(loop, writer, "\r\n" + device.prompt())
+        try:
+            while not device.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode("utf-8", "replace").rstrip("\r\n")
+                self._send(loop, writer, command + "\r\n" + device.execute(command))
+                if writer.transport.get_write_buffer_size() > 1 << 20:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections.discard(writer)
+            if self.delay:
+                # Zamykamy po wysłaniu opóźnionych odpowiedzi
+                loop.call_later(self.delay, writer.close)
+            else:
+                writer.close()
+
+    def _send(self, loop, writer, text):
+        data = text.encode()
+        if self.delay:
+            # Stałe opóźnienie zachowuje kolejność odpowiedzi
+            loop.call_later(self.delay, lambda: writer.is_closing() or writer.write(data))
+        else:
+            writer.write(data)
+
+
+async def serve(count, base_port, host, delay, reject):
+    simulator = await SimulatorServer(delay, reject).start(count, base_port, host)
+    print(f"Symulator: {count} urządzeń na {host}:{base_port}-{base_port + count - 1}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m autoswitch.simulator",
+                                     description="Lokalny symulator urządzeń IOS do testów wysyłania konfiguracji.")
+    parser.add_argument("--count", type=int, default=1, help="liczba urządzeń (kolejne porty)")
+    parser.add_argument("--base-port", type=int, default=20000)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="opóźnienie każdej odpowiedzi (ms)")
+    parser.add_argument("--reject", default=None, help="wyrażenie regularne poleceń odrzucanych jako błędne")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.count, args.base_port, args.host, args.delay_ms / 1000, args.reject))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,32 +1,11 @@
-# template_logic.py
+# autoswitch/template_logic.py
 import ipaddress
-from PyQt6.QtCore import QRegularExpression
-from PyQt6.QtGui import QRegularExpressionValidator
-from PyQt6.uic.properties import QtGui
 
-
-class TemplateError(Exception):
-    """Custom exception for template errors."""
-    pass
-
-
-def is_valid_ipv4(address):
-    try:
-        ipaddress.IPv4Address(address)
-        return True
-    except ipaddress.AddressValueError:
-        return False
-
-
-def validate_color(c):
-    """Validate if the color string is in #RRGGBB format."""
-    if isinstance(c, str) and c.startswith('#') and len(c) == 7:
-        try:
-            int(c[1:], 16)
-            return True
-        except ValueError:
-            return False
-    return False
+from autoswitch.bulk_routes import route_commands, route_prefixes, route_table
+from autoswitch.netmasks import network_address, prefix_length, wildcard
+from autoswitch.prefix_index import range_prefixes
+from autoswitch.validation import TemplateError, is_valid_ipv4, validate_color
+from autoswitch.vlans import VlanRangeSet, VlanRegistry
 
 
 def assign_interface_labels(interfaces):
@@ -52,7 +31,7 @@ def assign_interface_labels(interfaces):
 
 def apply_data_template(params, selected_ports, used_vlans=None):
     if used_vlans is None:
-        used_vlans = {}
+        used_vlans = VlanRegistry()
 
     # Pobieranie i walidacja VLAN ID
     vlan_id = params.get("VLAN ID")
@@ -85,6 +64,8 @@ def apply_data_template(params, selected_ports, used_vlans=None):
     if vlan_routing and vlan_mode == "Static":
         if not vlan_ip or not subnet_mask:
             raise TemplateError("Dla statycznego routingu VLAN wymagane są VLAN IP Address i Subnet Mask.")
+    if subnet_mask and prefix_length(subnet_mask) is None:
+        raise TemplateError(f"Subnet Mask '{subnet_mask}' jest niepoprawną maską podsieci.")
 
     # Walidacja parametrów DHCP
     dhcp_server = params.get("DHCP Server", False)
@@ -119,7 +100,7 @@ def apply_data_template(params, selected_ports, used_vlans=None):
     # Konfiguracja DHCP jeśli włączone
     if dhcp_server:
         try:
-            network = ipaddress.IPv4Network(f"{vlan_ip}/{subnet_mask}", strict=False)
+            network = network_address(vlan_ip, prefix_length(subnet_mask))
         except ValueError:
             raise TemplateError("Nieprawidłowy VLAN IP Address lub Subnet Mask.")
 
@@ -127,7 +108,7 @@ def apply_data_template(params, selected_ports, used_vlans=None):
         lease_stop = int(stop)
         lines.extend([
             f"ip dhcp pool {profile_name}_pool",
-            f" network {network.network_address} {subnet_mask}",
+            f" network {network} {subnet_mask}",
             f" default-router {vlan_ip}",
             " dns-server 8.8.8.8",
             f" lease {lease_start} {lease_stop}",
@@ -149,12 +130,7 @@ def apply_data_template(params, selected_ports, used_vlans=None):
     lines.append("exit")
 
     # Aktualizacja używanych VLAN-ów
-    used_vlans[vlan_id] = {
-        'name': profile_name,
-        'color': color,
-        'description': f"VLAN {vlan_id}",
-        'method': 'apply_data_template'
-    }
+    used_vlans.allocate(vlan_id, profile_name, color, f"VLAN {vlan_id}", 'apply_data_template')
 
     return "\n".join(lines)
 
@@ -179,17 +155,12 @@ def set_access_vlan(params, selected_ports, used_vlans=None):
         color = "#5F5F5F"
 
     if used_vlans is None:
-        used_vlans = {}
+        used_vlans = VlanRegistry()
 
     if vlan_id in used_vlans:
         raise TemplateError(f"VLAN ID {vlan_id} jest już w użyciu.")
 
-    used_vlans[vlan_id] = {
-        'name': f"VLAN {vlan_id}",
-        'color': color,
-        'description': description,
-        'method': 'set_access_vlan'
-    }
+    used_vlans.allocate(vlan_id, f"VLAN {vlan_id}", color, description, 'set_access_vlan')
 
     lines = ["configure terminal",
              f"vlan {vlan_id}",
@@ -217,23 +188,22 @@ def set_trunk_vlan(params, selected_ports, used_vlans=None):
     description = params.get("Description", "").strip()
 
     if not allowed_vlans_str:
-        raise TemplateError("Allowed VLANs jest wymagane (np. 10,20,30).")
+        raise TemplateError("Allowed VLANs jest wymagane (np. 10,20,30-40).")
 
     # Sprawdzenie poprawności VLANów
-    allowed_vlans = [v.strip() for v in allowed_vlans_str.split(',') if v.strip().isdigit()]
+    allowed_vlans = VlanRangeSet.parse(allowed_vlans_str)
     if not allowed_vlans:
         raise TemplateError("Brak poprawnych VLANów w Allowed VLANs.")
 
-    allowed_vlans_out = ",".join(allowed_vlans)
+    allowed_vlans_out = str(allowed_vlans)
 
     if used_vlans is None:
-        used_vlans = {}
+        used_vlans = VlanRegistry()
 
-    # Sprawdzenie, czy wszystkie VLANy są już utworzone
-    for vid_str in allowed_vlans:
-        vid = int(vid_str)
-        if vid not in used_vlans:
-            raise TemplateError(f"VLAN ID {vid} nie istnieje. Utwórz VLAN przed przypisaniem do trunku.")
+    # Sprawdzenie, czy wszystkie VLANy są już utworzone (koszt zależy od liczby zakresów)
+    if not allowed_vlans.issubset(used_vlans):
+        missing = allowed_vlans.difference(used_vlans)
+        raise TemplateError(f"VLAN ID {missing} nie istnieje. Utwórz VLAN przed przypisaniem do trunku.")
 
     lines = ["configure terminal"]
 
@@ -246,7 +216,7 @@ def set_trunk_vlan(params, selected_ports, used_vlans=None):
         lines.append(f" switchport trunk allowed vlan {allowed_vlans_out}")
         lines.append(" no shutdown")
         lines.append("exit")
-        lines.append("ip routing")
+    lines.append("ip routing")
 
 
     return "\n".join(lines)
@@ -259,7 +229,7 @@ def set_native_vlan(params, selected_ports, used_vlans=None):
     Parameters:
         params (dict): Parametry zawierające ID Native VLAN, opis, kolor i allowed VLANs.
         selected_ports (list): Lista wybranych interfejsów.
-        used_vlans (dict, optional): Słownik VLAN-ów używanych w konfiguracji.
+        used_vlans (VlanRegistry, optional): Tabela VLAN-ów używanych w konfiguracji.
     Returns:
         str: Wygenerowana konfiguracja CLI.
     """
@@ -282,25 +252,18 @@ def set_native_vlan(params, selected_ports, used_vlans=None):
     if allowed_vlans:
         # Walidacja listy VLANs
         try:
-            vlan_list = [int(v.strip()) for v in allowed_vlans.split(",") if v.strip().isdigit()]
-            if any(v < 1 or v > 4094 for v in vlan_list):
-                raise ValueError
-        except ValueError:
-            raise TemplateError("Lista Allowed VLANs zawiera nieprawidłowe wartości.")
-        allowed_vlans = ",".join(map(str, vlan_list))  # Konwersja na poprawny format CLI
+            vlan_ranges = VlanRangeSet.parse(allowed_vlans)
+        except TemplateError as e:
+            raise TemplateError(f"Lista Allowed VLANs zawiera nieprawidłowe wartości. {e}")
+        allowed_vlans = str(vlan_ranges)  # Konwersja na najkrótszy zapis CLI
 
     if used_vlans is None:
-        used_vlans = {}
+        used_vlans = VlanRegistry()
 
     if native_vlan in used_vlans:
         raise TemplateError(f"VLAN ID {native_vlan} jest już w użyciu.")
 
-    used_vlans[native_vlan] = {
-        'name': f"VLAN {native_vlan}",
-        'color': color,
-        'description': description,
-        'method': 'set_native_vlan'
-    }
+    used_vlans.allocate(native_vlan, f"VLAN {native_vlan}", color, description, 'set_native_vlan')
 
     # Generowanie konfiguracji CLI
     lines = ["configure terminal",
@@ -337,6 +300,8 @@ def apply_nat(params, selected_ports):
         raise TemplateError("Musisz wybrać rolę interfejsu: Inside lub Outside.")
     if not pool_name or not pool_start or not pool_end or not acl:
         raise TemplateError("Pool Name, Pool Start IP, Pool End IP i Access List są wymagane.")
+    if prefix_length(netmask) is None:
+        raise TemplateError(f"Netmask '{netmask}' jest niepoprawną maską podsieci.")
     if not selected_ports:
         raise TemplateError("Wybierz co najmniej jeden port.")
 
@@ -394,22 +359,14 @@ def apply_static_routing(params, selected_ports):
     except ipaddress.AddressValueError:
         raise TemplateError(f"Destination Network '{destination_network}' jest niepoprawnym adresem IP.")
 
-    try:
-        ipaddress.IPv4Address(subnet_mask)
-    except ipaddress.AddressValueError:
-        raise TemplateError(f"Subnet Mask '{subnet_mask}' jest niepoprawnym adresem IP.")
+    if prefix_length(subnet_mask) is None:
+        raise TemplateError(f"Subnet Mask '{subnet_mask}' jest niepoprawną maską podsieci.")
 
     try:
         ipaddress.IPv4Address(next_hop_ip)
     except ipaddress.AddressValueError:
         raise TemplateError(f"Next Hop IP '{next_hop_ip}' jest niepoprawnym adresem IP.")
 
-    # Validate network
-    try:
-        network = ipaddress.IPv4Network(f"{destination_network}/{subnet_mask}", strict=False)
-    except ipaddress.NetmaskValueError:
-        raise TemplateError(f"Subnet Mask '{subnet_mask}' jest niepoprawną maską podsieci.")
-
     lines = ["configure terminal"]
 
     # Add static route
@@ -419,6 +376,27 @@ def apply_static_routing(params, selected_ports):
     return "\n".join(lines)
 
 
+def apply_bulk_static_routing(params, selected_ports):
+    """
+    Apply many static routes at once from the "Routes CSV" parameter.
+
+    Every line is "network,mask,next hop" or "network/length,next hop". Routes are grouped by
+    next hop and aggregated into the minimal covering set (see autoswitch.bulk_routes).
+
+    Returns:
+        str: Generated static routing configuration commands.
+    """
+    routes_csv = params.get("Routes CSV", "")
+    if not routes_csv.strip():
+        raise TemplateError("Routes CSV jest wymagane.")
+    routes = route_table(routes_csv)
+
+    lines = ["configure terminal"]
+    lines.extend(route_commands(routes))
+
+    return "\n".join(lines)
+
+
 def apply_dynamic_routing(params, selected_ports):
     """
     Apply dynamic routing configuration based on the provided parameters.
@@ -475,18 +453,11 @@ def apply_dynamic_routing(params, selected_ports):
         netmask = params.get(f"Netmask {i}", "").strip()
 
         if network and netmask:  # Only process when both network and netmask are provided
-            try:
-                # Validate network address
-                network_addr = ipaddress.IPv4Address(network)
-                # Validate netmask
-                netmask_addr = ipaddress.IPv4Address(netmask)
-                # Calculate wildcard mask correctly
-                netmask_octets = [int(octet) for octet in netmask.split('.')]
-                wildcard_octets = [str(255 - octet) for octet in netmask_octets]
-                wildcard_mask = '.'.join(wildcard_octets)
-                validated_networks.append(f"network {network} {wildcard_mask}")
-            except (ipaddress.AddressValueError, ValueError):
+            # Maska wildcard z tablicy - maska nieciągła nie ma wildcard i jest odrzucana
+            wildcard_mask = wildcard(netmask)
+            if wildcard_mask is None or not is_valid_ipv4(network):
                 raise TemplateError(f"Network '{network}' lub Netmask '{netmask}' jest niepoprawny.")
+            validated_networks.append(f"network {network} {wildcard_mask}")
 
     if not validated_networks:
         raise TemplateError("Co najmniej jedna sieć z maską musi być skonfigurowana.")
@@ -526,8 +497,8 @@ def apply_dhcp_server(params, selected_ports):
     # walidacja ip
     if not is_valid_ipv4(network):
         raise TemplateError("Network nie jest ip")
-    if not is_valid_ipv4(subnet_mask):
-        raise TemplateError("subnet_mask nie jest ip")
+    if prefix_length(subnet_mask) is None:
+        raise TemplateError("subnet_mask nie jest poprawną maską podsieci")
     if not is_valid_ipv4(default_router):
         raise TemplateError("default_router nie jest ip")
     if lease_time:
@@ -698,6 +669,7 @@ TEMPLATE_FUNCTIONS = {
     'set_native_vlan': set_native_vlan,
     'apply_nat': apply_nat,
     'apply_static_routing': apply_static_routing,
+    'apply_bulk_static_routing': apply_bulk_static_routing,
     'apply_dynamic_routing': apply_dynamic_routing,
     'apply_dhcp_server': apply_dhcp_server,
     'restart_device': restart_device,
@@ -706,3 +678,73 @@ TEMPLATE_FUNCTIONS = {
     'enable_vlan': enable_vlan,
     'default_interface': default_interface
 }
+
+# Metody, które korzystają z tabeli VLAN-ów urządzenia (used_vlans)
+VLAN_TEMPLATE_FUNCTIONS = ('apply_data_template', 'set_access_vlan', 'set_trunk_vlan', 'set_native_vlan')
+
+
+def render_template(method_name, params, selected_ports, used_vlans, prefix_index=None, device=''):
+    """
+    Run the template for method_name, passing used_vlans to the VLAN-aware templates.
+
+    With a prefix_index the addresses, pools and routes the call configures are registered
+    for device, so an IP conflict raises PrefixConflict like any other TemplateError.
+    """
+    func = TEMPLATE_FUNCTIONS.get(method_name)
+    if func is None:
+        raise TemplateError(f"Brak logiki dla metody: {method_name}")
+    if method_name in VLAN_TEMPLATE_FUNCTIONS:
+        text = func(params, selected_ports, used_vlans)
+    else:
+        text = func(params, selected_ports)
+    if prefix_index is not None:
+        register_prefixes(prefix_index, device, method_name, params, selected_ports)
+    return text
+
+
+def template_prefixes(method_name, params, selected_ports):
+    """(kind, prefix, label[, ports]) entries a successful template call configures, for PrefixIndex.register."""
+    ports = tuple(selected_ports)
+    entries = []
+    if method_name == 'apply_data_template':
+        vlan_id = params.get("VLAN ID")
+        vlan_ip = params.get("VLAN IP Address", "").strip()
+        subnet_mask = params.get("Subnet Mask", "").strip()
+        if vlan_ip and subnet_mask:
+            entries.append(('interface', f"{vlan_ip}/{subnet_mask}", f"interface vlan {vlan_id}"))
+            entries.append(('address', vlan_ip, f"interface vlan {vlan_id}"))
+            if params.get("DHCP Server", False):
+                entries.append(('dhcp-pool', f"{vlan_ip}/{subnet_mask}", f"{params.get('Profile Name', '').strip()}_pool"))
+    elif method_name == 'apply_nat':
+        pool_name = params.get("Pool Name", "").strip()
+        for network in range_prefixes(params.get("Pool Start IP", "").strip(), params.get("Pool End IP", "").strip()):
+            entries.append(('nat-pool', network, pool_name))
+    elif method_name == 'apply_static_routing':
+        network = f"{params.get('Destination Network', '').strip()}/{params.get('Subnet Mask', '').strip()}"
+        entries.append(('route', network, "ip route"))
+        entries.append(('next-hop', params.get("Next Hop IP", "").strip(), f"ip route {network}"))
+    elif method_name == 'apply_bulk_static_routing':
+        entries.extend(route_prefixes(route_table(params.get("Routes CSV", ""))))
+    elif method_name == 'apply_dhcp_server':
+        pool_name = params.get("Pool Name", "").strip()
+        subnet_mask = params.get("Subnet Mask", "").strip()
+        default_router = params.get("Default Router", "").strip()
+        entries.append(('dhcp-pool', f"{params.get('Network', '').strip()}/{subnet_mask}", pool_name))
+        if ports:
+            # Ten sam adres na wszystkich wybranych portach - jeden wpis na wywołanie
+            label = ", ".join(ports)
+            entries.append(('interface', f"{default_router}/{subnet_mask}", label, ports))
+            entries.append(('address', default_router, label, ports))
+    return entries
+
+
+def register_prefixes(prefix_index, device, method_name, params, selected_ports):
+    """Update prefix_index after a template call; raises PrefixConflict (a TemplateError) on conflicts."""
+    if method_name == 'restart_device':
+        prefix_index.clear_device(device)
+    elif method_name == 'default_interface':
+        prefix_index.remove_interfaces(device, selected_ports)
+    else:
+        entries = template_prefixes(method_name, params, selected_ports)
+        if entries:
+            prefix_index.register(device, method_name, entries)
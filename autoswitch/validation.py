@@ -0,0 +1,26 @@
+# autoswitch/validation.py
+import ipaddress
+
+
+class TemplateError(Exception):
+    """Custom exception for template errors."""
+    pass
+
+
+def is_valid_ipv4(address):
+    try:
+        ipaddress.IPv4Address(address)
+        return True
+    except ipaddress.AddressValueError:
+        return False
+
+
+def validate_color(c):
+    """Validate if the color string is in #RRGGBB format."""
+    if isinstance(c, str) and c.startswith('#') and len(c) == 7:
+        try:
+            int(c[1:], 16)
+            return True
+        except ValueError:
+            return False
+    return False
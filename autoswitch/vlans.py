@@ -0,0 +1,325 @@
+# autoswitch/vlans.py
+"""
+VLAN table of a single device and VLAN lists such as "10-20,30".
+
+VlanRegistry keeps VLAN membership in a 4096-bit bitmap (a Python int), so
+allocation, "next free VLAN", range checks and set operations between
+devices are a handful of integer operations regardless of how many VLANs
+are in use. Per-VLAN details live in small __slots__ records.
+
+VlanRangeSet is a sorted list of disjoint intervals; its set operations
+cost O(number of ranges), not O(number of VLANs).
+"""
+from autoswitch.validation import TemplateError
+
+MIN_VLAN = 1
+MAX_VLAN = 4094
+
+# Bity 1..4094 - wszystkie VLAN-y, które można skonfigurować
+_VALID_MASK = ((1 << (MAX_VLAN + 1)) - 1) & ~1
+
+
+def _range_mask(first, last):
+    return ((1 << (last - first + 1)) - 1) << first
+
+
+class VlanRecord:
+    """Details of one configured VLAN."""
+    __slots__ = ('name', 'color', 'description', 'method')
+
+    def __init__(self, name, color, description='', method=''):
+        self.name = name
+        self.color = color
+        self.description = description
+        self.method = method
+
+    def __repr__(self):
+        return f"VlanRecord({self.name!r}, {self.color!r}, method={self.method!r})"
+
+
+class VlanRegistry:
+    """Bitmap-backed set of VLAN IDs with a record for each VLAN."""
+    __slots__ = ('bits', 'records')
+
+    def __init__(self):
+        self.bits = 0
+        self.records = {}
+
+    def __contains__(self, vlan_id):
+        return isinstance(vlan_id, int) and MIN_VLAN <= vlan_id <= MAX_VLAN and (self.bits >> vlan_id) & 1 == 1
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+    def __iter__(self):
+        """Iterate over VLAN IDs in the order they were allocated."""
+        return iter(self.records)
+
+    def __getitem__(self, vlan_id):
+        return self.records[vlan_id]
+
+    def __repr__(self):
+        return f"VlanRegistry({len(self)} VLAN)"
+
+    def get(self, vlan_id, default=None):
+        return self.records.get(vlan_id, default)
+
+    def items(self):
+        return self.records.items()
+
+    def allocate(self, vlan_id, name, color, description='', method=''):
+        """Mark vlan_id as used and store its details. Raises TemplateError if it is taken."""
+        if not isinstance(vlan_id, int) or not MIN_VLAN <= vlan_id <= MAX_VLAN:
+            raise TemplateError(f"VLAN ID musi być w zakresie {MIN_VLAN}-{MAX_VLAN}.")
+        if vlan_id in self:
+            raise TemplateError(f"VLAN ID {vlan_id} jest już w użyciu.")
+        self.bits |= 1 << vlan_id
+        record = VlanRecord(name, color, description, method)
+        self.records[vlan_id] = record
+        return record
+
+    def free(self, vlan_id):
+        """Release vlan_id. Returns its record, or None if it was not used."""
+        self.bits &= ~(1 << vlan_id)
+        return self.records.pop(vlan_id, None)
+
+    def next_free(self, start=MIN_VLAN):
+        """Return the lowest unused VLAN ID >= start, or None when the table is full."""
+        free_bits = ~self.bits & _VALID_MASK & ~((1 << start) - 1)
+        if not free_bits:
+            return None
+        return (free_bits & -free_bits).bit_length() - 1
+
+    def contains_range(self, first, last):
+        """True when every VLAN in first..last is used."""
+        mask = _range_mask(first, last)
+        return self.bits & mask == mask
+
+    def any_in_range(self, first, last):
+        """True when at least one VLAN in first..last is used."""
+        return self.bits & _range_mask(first, last) != 0
+
+    def vlan_ids(self):
+        """Return the used VLAN IDs in ascending order."""
+        bits = self.bits
+        ids = []
+        while bits:
+            low = bits & -bits
+            ids.append(low.bit_length() - 1)
+            bits ^= low
+        return ids
+
+    def range_set(self):
+        """Return the used VLAN IDs as a VlanRangeSet."""
+        return VlanRangeSet.from_bits(self.bits)
+
+    def copy(self):
+        registry = VlanRegistry()
+        registry.bits = self.bits
+        registry.records = dict(self.records)
+        return registry
+
+    def _from_bits(self, bits, *sources):
+        registry = VlanRegistry()
+        registry.bits = bits
+        for source in sources:
+            for vlan_id, record in source.records.items():
+                if (bits >> vlan_id) & 1 and vlan_id not in registry.records:
+                    registry.records[vlan_id] = record
+        return registry
+
+    def union(self, other):
+        """VLANs used on either device; records from self win."""
+        return self._from_bits(self.bits | other.bits, self, other)
+
+    def intersection(self, other):
+        """VLANs used on both devices."""
+        return self._from_bits(self.bits & other.bits, self)
+
+    def difference(self, other):
+        """VLANs used on self but not on other."""
+        return self._from_bits(self.bits & ~other.bits, self)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+
+class VlanRangeSet:
+    """Immutable set of VLAN IDs stored as sorted, non-adjacent (first, last) intervals."""
+    __slots__ = ('ranges',)
+
+    def __init__(self, ranges=()):
+        merged = []
+        for first, last in sorted(ranges):
+            if merged and first <= merged[-1][1] + 1:
+                if last > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], last)
+            else:
+                merged.append((first, last))
+        self.ranges = tuple(merged)
+
+    @classmethod
+    def parse(cls, text):
+        """Parse a VLAN list like '10-20,30,100-4000'. Raises TemplateError on invalid input."""
+        ranges = []
+        for token in text.split(","):
+            token = token.strip()
+            if not token:
+                continue
+            first, sep, last = token.partition("-")
+            first = first.strip()
+            last = last.strip() if sep else first
+            if not first.isdigit() or not last.isdigit():
+                raise TemplateError(f"Nieprawidłowy element listy VLAN: '{token}'.")
+            first, last = int(first), int(last)
+            if not MIN_VLAN <= first <= last <= MAX_VLAN:
+                raise TemplateError(f"Zakres VLAN '{token}' wykracza poza {MIN_VLAN}-{MAX_VLAN}.")
+            ranges.append((first, last))
+        return cls(ranges)
+
+    @classmethod
+    def from_bits(cls, bits):
+        """Build a range set from a VLAN bitmap, one step per run of set bits."""
+        ranges = []
+        while bits:
+            first = (bits & -bits).bit_length() - 1
+            run = bits >> first
+            length = (run ^ (run + 1)).bit_length() - 1
+            ranges.append((first, first + length - 1))
+            bits &= ~(((1 << length) - 1) << first)
+        result = cls.__new__(cls)
+        result.ranges = tuple(ranges)
+        return result
+
+    def to_bits(self):
+        bits = 0
+        for first, last in self.ranges:
+            bits |= _range_mask(first, last)
+        return bits
+
+    def __str__(self):
+        """Shortest CLI notation, e.g. '10-20,30'."""
+        return ",".join(f"{first}-{last}" if last > first else str(first) for first, last in self.ranges)
+
+    def __repr__(self):
+        return f"VlanRangeSet('{self}')"
+
+    def __bool__(self):
+        return bool(self.ranges)
+
+    def __len__(self):
+        return sum(last - first + 1 for first, last in self.ranges)
+
+    def __eq__(self, other):
+        return isinstance(other, VlanRangeSet) and self.ranges == other.ranges
+
+    def __hash__(self):
+        return hash(self.ranges)
+
+    def __contains__(self, vlan_id):
+        for first, last in self.ranges:
+            if vlan_id < first:
+                return False
+            if vlan_id <= last:
+                return True
+        return False
+
+    def union(self, other):
+        other = _as_range_set(other)
+        result = []
+        a, b = self.ranges, other.ranges
+        i = j = 0
+        while i < len(a) or j < len(b):
+            if j >= len(b) or (i < len(a) and a[i] <= b[j]):
+                current = a[i]
+                i += 1
+            else:
+                current = b[j]
+                j += 1
+            if result and current[0] <= result[-1][1] + 1:
+                if current[1] > result[-1][1]:
+                    result[-1] = (result[-1][0], current[1])
+            else:
+                result.append(current)
+        return _from_sorted(result)
+
+    def intersection(self, other):
+        other = _as_range_set(other)
+        result = []
+        a, b = self.ranges, other.ranges
+        i = j = 0
+        while i < len(a) and j < len(b):
+            first = max(a[i][0], b[j][0])
+            last = min(a[i][1], b[j][1])
+            if first <= last:
+                result.append((first, last))
+            if a[i][1] < b[j][1]:
+                i += 1
+            else:
+                j += 1
+        return _from_sorted(result)
+
+    def difference(self, other):
+        """VLANs in self but not in other (a VlanRangeSet or a VlanRegistry)."""
+        if isinstance(other, VlanRegistry):
+            return VlanRangeSet.from_bits(self.to_bits() & ~other.bits)
+        result = []
+        b = other.ranges
+        j = 0
+        for first, last in self.ranges:
+            while j < len(b) and b[j][1] < first:
+                j += 1
+            k = j
+            while k < len(b) and b[k][0] <= last:
+                if b[k][0] > first:
+                    result.append((first, b[k][0] - 1))
+                first = max(first, b[k][1] + 1)
+                k += 1
+            if first <= last:
+                result.append((first, last))
+        return _from_sorted(result)
+
+    def issubset(self, other):
+        """True when every VLAN of self is in other (a VlanRangeSet or a VlanRegistry)."""
+        if isinstance(other, VlanRegistry):
+            return all(other.contains_range(first, last) for first, last in self.ranges)
+        return not self.difference(other)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __le__ = issubset
+
+
+def apply_allowed_vlans(current, text):
+    """
+    Apply the argument of 'switchport trunk allowed vlan' ('10-20', 'add 30', 'remove 15',
+    'except 1', 'all', 'none') to current, a VlanRangeSet or None for all VLANs.
+
+    Returns the new VlanRangeSet, or None for all VLANs. Raises TemplateError on an invalid list.
+    """
+    text = text.strip()
+    if text == "all":
+        return None
+    if text == "none":
+        return VlanRangeSet()
+    all_vlans = VlanRangeSet([(MIN_VLAN, MAX_VLAN)])
+    action, _, rest = text.partition(" ")
+    if action == "add":
+        return (current if current is not None else all_vlans) | VlanRangeSet.parse(rest)
+    if action == "remove":
+        return (current if current is not None else all_vlans) - VlanRangeSet.parse(rest)
+    if action == "except":
+        return all_vlans - VlanRangeSet.parse(rest)
+    return VlanRangeSet.parse(text)
+
+
+def _from_sorted(ranges):
+    result = VlanRangeSet.__new__(VlanRangeSet)
+    result.ranges = tuple(ranges)
+    return result
+
+
+def _as_range_set(other):
+    return other.range_set() if isinstance(other, VlanRegistry) else other
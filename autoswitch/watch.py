@@ -0,0 +1,317 @@
+# autoswitch/watch.py
+"""
+Watch mode: keep a directory of device configs in sync with the inventory.
+
+The inventory and the device catalog files (catalogs/*.json) are watched with inotify
+(through ctypes, no extra packages) or, where inotify is not available,
+by polling their mtime and size. The parent directories are watched, so
+editors that save by writing a new file and renaming it are followed too.
+Bursts of events are debounced, then the changed file is reloaded and
+each device is compared by its build cache key: only devices whose entry
+or model changed are regenerated, and outputs of removed devices are
+deleted.
+
+    python -m autoswitch.watch inventory.yaml -o configs
+"""
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+import config
+from autoswitch.batch import (STALE_SUFFIX, InventoryError, cache_key, load_inventory, output_filename, run_batch,
+                              validate_names)
+from autoswitch.build_cache import DEFAULT_CACHE_DIR, reset_model_digests
+from autoswitch.catalog import CatalogError, load_catalogs
+from autoswitch.memo import DEFAULT_MAX_ENTRIES
+
+DEFAULT_DEBOUNCE = 0.1
+DEFAULT_POLL_INTERVAL = 0.5
+
+# Słowniki modeli z config.py, aktualizowane w miejscu po zmianie pliku katalogu
+CATALOG_NAMES = ("Cisco_Router", "Cisco_Switch")
+
+# inotify(7)
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Reports changes of a set of files through inotify on their directories."""
+
+    def __init__(self, paths):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 nie powiodło się")
+        self.paths = {os.path.abspath(path) for path in paths}
+        self.directories = {}  # deskryptor obserwacji -> katalog
+        try:
+            for directory in {os.path.dirname(path) for path in self.paths}:
+                wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+                if wd < 0:
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch({directory}) nie powiodło się")
+                self.directories[wd] = directory
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def wait(self, timeout=None):
+        """Return the watched paths changed within timeout seconds (an empty set on timeout)."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            path = os.path.join(self.directories.get(wd, ""), os.fsdecode(name))
+            if path in self.paths:
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback watcher comparing (mtime, size) of the files every interval seconds."""
+
+    def __init__(self, paths, interval=DEFAULT_POLL_INTERVAL):
+        self.paths = {os.path.abspath(path) for path in paths}
+        self.interval = interval
+        self.signatures = {path: self._signature(path) for path in self.paths}
+
+    @staticmethod
+    def _signature(path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                signature = self._signature(path)
+                if signature != self.signatures[path]:
+                    self.signatures[path] = signature
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            delay = self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+    def close(self):
+        pass
+
+
+def create_watcher(paths, poll_interval=None):
+    """InotifyWatcher where available, otherwise (or with poll_interval) a PollingWatcher."""
+    if poll_interval is None and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(paths, poll_interval or DEFAULT_POLL_INTERVAL)
+
+
+def _device_fingerprint(device, compact):
+    """Build cache key of a device; entries without one (no name, unknown model) compare by content."""
+    key = cache_key(device, compact)
+    return key if key is not None else repr(device)
+
+
+class FleetWatcher:
+    """Regenerates the configs of devices affected by inventory and catalog edits."""
+
+    def __init__(self, inventory_path, out_dir, catalog_paths=None, compact=True, cache_size=DEFAULT_MAX_ENTRIES,
+                 cache_dir=DEFAULT_CACHE_DIR, jobs=1, debounce=DEFAULT_DEBOUNCE, log=print):
+        self.inventory_path = os.path.abspath(inventory_path)
+        self.catalog_paths = [os.path.abspath(path) for path in (catalog_paths or config.CATALOG_FILES)]
+        self.out_dir = out_dir
+        self.compact = compact
+        self.cache_size = cache_size
+        self.cache_dir = cache_dir
+        self.jobs = jobs
+        self.debounce = debounce
+        self.log = log
+        self.devices = {}       # nazwa -> wpis inwentarza
+        self.fingerprints = {}  # nazwa -> klucz
+        self.name_failures = []  # (etykieta, błąd) wpisów bez poprawnej, niepowtarzalnej nazwy
+
+    def load(self):
+        """
+        Read the inventory into {name: device}.
+
+        Names are checked as by the batch generator (validate_names); entries without a usable
+        name and repeated names are kept in name_failures and reported with every update.
+        """
+        devices, self.name_failures = validate_names(load_inventory(self.inventory_path))
+        return {device["name"]: device for device in devices}
+
+    def build_all(self):
+        """
+        Initial pass: bring the whole output directory up to date (unchanged files are skipped).
+
+        Catalog files other than the default ones are loaded first; raises CatalogError when they
+        cannot be read, instead of building with the default catalog.
+        """
+        if self.catalog_paths != [os.path.abspath(path) for path in config.CATALOG_FILES]:
+            try:
+                self.reload_catalog()
+            except OSError as e:
+                raise CatalogError(str(e)) from e
+        self.devices = self.load()
+        self.fingerprints = {name: _device_fingerprint(device, self.compact) for name, device in self.devices.items()}
+        return self.name_failures + self.regenerate(list(self.devices.values()))
+
+    def reload_catalog(self):
+        """Re-read the catalog files in place; returns the names of models whose entry changed."""
+        namespace = load_catalogs(self.catalog_paths)
+        changed = set()
+        for catalog_name in CATALOG_NAMES:
+            catalog = getattr(config, catalog_name)
+            new_catalog = namespace.get(catalog_name, {})
+            for model in set(catalog) | set(new_catalog):
+                if catalog.get(model) != new_catalog.get(model):
+                    changed.add(model)
+            catalog.clear()
+            catalog.update(new_catalog)
+        reset_model_digests()
+        return changed
+
+    def update(self, changed_paths):
+        """Handle one debounced batch of changed files. Returns (generated, removed, failures)."""
+        models = self.reload_catalog() if changed_paths & set(self.catalog_paths) else set()
+        reloaded = self.inventory_path in changed_paths
+        devices = self.load() if reloaded else self.devices
+        failures = list(self.name_failures) if reloaded else []
+
+        affected = []
+        fingerprints = {}
+        for name, device in devices.items():
+            old = self.devices.get(name)
+            if (name in self.fingerprints and old == device
+                    and not (isinstance(device, dict) and device.get("model") in models)):
+                # Porównanie słowników jest tańsze niż liczenie skrótu
+                fingerprints[name] = self.fingerprints[name]
+                continue
+            fingerprint = _device_fingerprint(device, self.compact)
+            fingerprints[name] = fingerprint
+            if self.fingerprints.get(name) != fingerprint:
+                affected.append(device)
+        removed = [name for name in self.devices if name not in devices]
+        for name in removed:
+            filename = output_filename(name)
+            for path in (os.path.join(self.out_dir, filename), os.path.join(self.out_dir, filename + STALE_SUFFIX)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    failures.append((name, f"Nie udało się usunąć {path}: {e}"))
+
+        self.devices = devices
+        self.fingerprints = fingerprints
+        build_failures = self.regenerate(affected) if affected else []
+        return len(affected) - len(build_failures), len(removed), failures + build_failures
+
+    def regenerate(self, devices):
+        return run_batch(devices, self.out_dir, self.jobs, self.compact, self.cache_size, None, self.cache_dir)
+
+    def run(self, watcher=None, stop=None):
+        """Watch until stop() returns True (or forever), logging every update."""
+        watcher = watcher or create_watcher([self.inventory_path] + self.catalog_paths)
+        try:
+            while stop is None or not stop():
+                changed = watcher.wait(0.5)
+                if not changed:
+                    continue
+                # Zbieramy serię zapisów, aż pliki przestaną się zmieniać
+                while True:
+                    more = watcher.wait(self.debounce)
+                    if not more:
+                        break
+                    changed |= more
+                start = time.perf_counter()
+                try:
+                    generated, removed, failures = self.update(changed)
+                except (OSError, ValueError, InventoryError, CatalogError) as e:
+                    self.log(f"[BŁĄD] Nie udało się wczytać zmian: {e}")
+                    continue
+                except Exception as e:
+                    # Jedna błędna edycja nie może zatrzymać obserwacji
+                    self.log(f"[BŁĄD] Nieoczekiwany błąd przy obsłudze zmian: {e!r}")
+                    continue
+                for name, error in failures:
+                    self.log(f"[BŁĄD] {name}: {error}")
+                self.log(f"Zmiana {', '.join(sorted(os.path.basename(path) for path in changed))}: "
+                         f"wygenerowano {generated}, usunięto {removed} "
+                         f"w {(time.perf_counter() - start) * 1000:.0f} ms")
+        finally:
+            watcher.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m autoswitch.watch",
+                                     description="Obserwuje inwentarz i katalog urządzeń, generując na bieżąco "
+                                                 "konfiguracje zmienionych urządzeń.")
+    parser.add_argument("inventory", help="plik inwentarza (YAML lub JSON)")
+    parser.add_argument("-o", "--output", default="configs", help="katalog wyjściowy (domyślnie: configs)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="liczba procesów przy dużych zmianach (domyślnie 1)")
+    parser.add_argument("--catalog", action="append", default=None,
+                        help="plik katalogu urządzeń, można podać kilka razy (domyślnie: catalogs/*.json)")
+    parser.add_argument("--no-compact", dest="compact", action="store_false",
+                        help="nie łącz identycznych bloków portów w 'interface range'")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"katalog cache wygenerowanych konfiguracji (domyślnie: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--debounce-ms", type=float, default=DEFAULT_DEBOUNCE * 1000,
+                        help="czas ciszy po ostatnim zapisie przed generowaniem (ms)")
+    parser.add_argument("--poll", type=float, default=None, metavar="SEKUNDY",
+                        help="sprawdzaj pliki co podany czas zamiast używać inotify")
+    args = parser.parse_args(argv)
+
+    watcher = FleetWatcher(args.inventory, args.output, args.catalog, args.compact, cache_dir=args.cache_dir,
+                           jobs=args.jobs, debounce=args.debounce_ms / 1000)
+    try:
+        failures = watcher.build_all()
+    except CatalogError as e:
+        print(f"Błąd katalogu urządzeń: {e}", file=sys.stderr)
+        return 2
+    except (OSError, ValueError, InventoryError) as e:
+        print(f"Błąd inwentarza: {e}", file=sys.stderr)
+        return 2
+    for name, error in failures:
+        print(f"[BŁĄD] {name}: {error}", file=sys.stderr)
+    print(f"Obserwuję {args.inventory} ({len(watcher.devices)} urządzeń) -> {args.output}. Ctrl+C kończy.", flush=True)
+    try:
+        watcher.run(create_watcher([watcher.inventory_path] + watcher.catalog_paths, args.poll))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
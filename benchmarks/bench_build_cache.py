@@ -0,0 +1,115 @@
+# benchmarks/bench_build_cache.py
+"""
+Incremental fleet regeneration with the on-disk build cache.
+
+Generates a synthetic inventory of --devices access switches with
+--variants distinct step lists, then runs the batch generator three
+times in a temporary directory: cold, unchanged and with one device
+changed. Also reports the time of hashing the inputs alone. Exits with
+status 1 when the unchanged rerun takes longer than --ratio times the
+hashing time, when a device with a numeric, invalid or repeated name
+stops the others from being written, or when written or restored files
+do not get the permissions open() would give them:
+
+    python benchmarks/bench_build_cache.py --devices 5000 -j 1
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from autoswitch.batch import find_model, run_batch  # noqa: E402
+from autoswitch.build_cache import FILE_MODE, device_key  # noqa: E402
+
+MODEL = 'Cisco Catalyst 2960'
+
+
+def sample_inventory(devices, variants):
+    _, device_data = find_model(MODEL)
+    ports = device_data['interfaces']
+    inventory = []
+    for i in range(devices):
+        variant = i % variants
+        inventory.append({
+            "name": f"sw-access-{i:05d}",
+            "model": MODEL,
+            "steps": [
+                {"method": "set_access_vlan", "params": {"VLAN ID": 10 + variant % 180, "Description": f"Biuro {variant}"},
+                 "ports": ports[:12]},
+                {"method": "set_access_vlan", "params": {"VLAN ID": 200, "Description": "Druk"},
+                 "ports": ports[12:20]},
+                {"method": "set_trunk_vlan", "params": {"Allowed VLANs": f"{10 + variant % 180},200"},
+                 "ports": ports[-2:]},
+            ],
+        })
+    return inventory
+
+
+def check_outputs(tmp):
+    """Errors of batch runs with bad names next to a valid device: without the cache, cold and restored from it."""
+    valid, numeric = sample_inventory(2, 2)
+    numeric["name"] = 1001
+    inventory = [numeric, valid, {"name": ["sw"], "model": MODEL}, dict(valid)]
+    errors = []
+    cache_dir = os.path.join(tmp, "names-cache")
+    for run, run_cache_dir in (("bez cache", None), ("z cache", cache_dir), ("odtworzenie", cache_dir)):
+        out_dir = os.path.join(tmp, f"names-{run}")
+        failures = run_batch(inventory, out_dir, 1, cache_dir=run_cache_dir)
+        expected = {"1001.txt", valid["name"] + ".txt"}
+        missing = expected - set(os.listdir(out_dir))
+        if missing or len(failures) != 2:
+            errors.append(f"{run}: brak plików {sorted(missing)}, błędy {failures}")
+        modes = {oct(os.stat(os.path.join(out_dir, name)).st_mode & 0o777) for name in expected - missing}
+        if modes - {oct(FILE_MODE)}:
+            errors.append(f"{run}: prawa plików {sorted(modes)} zamiast {oct(FILE_MODE)}")
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiar ponownego generowania floty z cache.")
+    parser.add_argument("--devices", type=int, default=5000)
+    parser.add_argument("--variants", type=int, default=5000, help="liczba różnych zestawów kroków")
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    parser.add_argument("--ratio", type=float, default=3.0,
+                        help="dopuszczalna krotność czasu haszowania dla niezmienionego inwentarza")
+    args = parser.parse_args(argv)
+
+    inventory = sample_inventory(args.devices, args.variants)
+    _, device_data = find_model(MODEL)
+    start = time.perf_counter()
+    for device in inventory:
+        device_key(device, device_data)
+    hashing = time.perf_counter() - start
+    print(f"haszowanie {args.devices} urządzeń: {hashing:.2f} s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        errors = check_outputs(tmp)
+        out_dir = os.path.join(tmp, "configs")
+        cache_dir = os.path.join(tmp, "cache")
+        timings = {}
+        for run in ("zimny start", "bez zmian", "jedna zmiana"):
+            if run == "jedna zmiana":
+                inventory[0]["steps"][0]["params"]["Description"] = "Zmiana"
+            stats = {}
+            start = time.perf_counter()
+            failures = run_batch(inventory, out_dir, args.jobs, stats=stats, cache_dir=cache_dir)
+            timings[run] = time.perf_counter() - start
+            print(f"{run}: {timings[run]:.2f} s, bez zmian {stats['unchanged']}, z cache {stats['restored']}, "
+                  f"błędów {len(failures)}")
+
+    for error in errors:
+        print(f"[REGRESJA] pliki wyjściowe: {error}", file=sys.stderr)
+    if errors:
+        return 1
+    if timings["bez zmian"] > args.ratio * hashing:
+        print(f"[REGRESJA] niezmieniony inwentarz trwa dłużej niż {args.ratio}x haszowanie", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
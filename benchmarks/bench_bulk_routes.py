@@ -0,0 +1,76 @@
+# benchmarks/bench_bulk_routes.py
+"""
+Bulk static-route import compared with one apply_static_routing per route.
+
+Builds a CSV of --routes routes (runs of adjacent /24 and /25 networks
+plus some duplicates and covered prefixes) spread over --next-hops next
+hops, then times apply_bulk_static_routing on the whole file against
+calling apply_static_routing once per route. Exits with status 1 when
+the bulk import is less than --min-speedup times faster:
+
+    python benchmarks/bench_bulk_routes.py --routes 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from autoswitch.template_logic import apply_bulk_static_routing, apply_static_routing  # noqa: E402
+
+
+def sample_routes(count, next_hops, seed=1):
+    """(network, mask, next hop) strings of a routing table with aggregatable runs."""
+    rng = random.Random(seed)
+    routes = []
+    while len(routes) < count:
+        hop = f"203.0.113.{rng.randrange(next_hops) + 1}"
+        first, second, third = rng.randrange(1, 224), rng.randrange(256), rng.randrange(0, 256, 16)
+        for i in range(rng.choice((2, 4, 8, 16))):
+            if rng.random() < 0.2:
+                routes.append((f"{first}.{second}.{third + i}.0", "255.255.255.128", hop))
+                routes.append((f"{first}.{second}.{third + i}.128", "255.255.255.128", hop))
+            else:
+                routes.append((f"{first}.{second}.{third + i}.0", "255.255.255.0", hop))
+        if rng.random() < 0.1:
+            routes.append((f"{first}.{second}.{third}.0", "255.255.255.0", hop))  # duplikat
+    return routes[:count]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiar importu tras statycznych z CSV.")
+    parser.add_argument("--routes", type=int, default=100000)
+    parser.add_argument("--next-hops", type=int, default=4)
+    parser.add_argument("--min-speedup", type=float, default=1.2,
+                        help="wymagana krotność przyspieszenia względem tras dodawanych pojedynczo")
+    args = parser.parse_args(argv)
+
+    routes = sample_routes(args.routes, args.next_hops)
+    csv_text = "\n".join(",".join(route) for route in routes)
+
+    start = time.perf_counter()
+    single_lines = 0
+    for network, mask, hop in routes:
+        text = apply_static_routing({"Destination Network": network, "Subnet Mask": mask, "Next Hop IP": hop}, [])
+        single_lines += text.count("ip route")
+    single = time.perf_counter() - start
+    print(f"pojedynczo: {single:.2f} s, {single_lines} poleceń 'ip route'")
+
+    start = time.perf_counter()
+    text = apply_bulk_static_routing({"Routes CSV": csv_text}, [])
+    bulk = time.perf_counter() - start
+    bulk_lines = text.count("ip route")
+    print(f"import CSV: {bulk:.2f} s, {bulk_lines} poleceń 'ip route' "
+          f"({bulk_lines / single_lines:.0%} tablicy), przyspieszenie {single / bulk:.1f}x")
+
+    if single / bulk < args.min_speedup:
+        print(f"[REGRESJA] import CSV jest szybszy mniej niż {args.min_speedup}x", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# benchmarks/bench_catalog.py
+"""
+Loading a large device catalog.
+
+Writes a catalog of --models models (standalone and stacked switches with
+up to 9 members of 48 ports, plus routers) to a temporary directory, then
+measures the first load (parsing and compiling the file), loads from the
+marshal cache and the memory those loads keep, and the cost of expanding
+the interfaces of one model. Exits with status 1 when a cached load takes
+more than --budget-ms:
+
+    python benchmarks/bench_catalog.py --models 300
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from autoswitch.catalog import expand_specs, load_catalogs  # noqa: E402
+
+PALETTE = {"normal": "#5F5F5F", "hover": "#6F6F6F", "checked": "#505358"}
+SWITCH_METHODS = ["set_access_vlan", "set_trunk_vlan", "set_native_vlan", "apply_dhcp_server", "default_interface"]
+ROUTER_METHODS = ["restart_device", "apply_static_routing", "apply_dynamic_routing", "apply_nat", "default_interface"]
+
+
+def sample_catalog(models):
+    """Catalog data with the given number of models, a quarter of them routers."""
+    catalog = {"palettes": {"default": PALETTE}, "routers": {}, "switches": {}}
+    for i in range(models):
+        if i % 4 == 3:
+            catalog["routers"][f"Router {i:03d}"] = {
+                "interfaces": [f"Gi0/0/0-{1 + i % 4}", "Se0/1/0-1"],
+                "description": f"Router testowy {i % 10}.", "method_list": ROUTER_METHODS}
+        else:
+            members = 1 + i % 9
+            catalog["switches"][f"Switch {i:03d}"] = {
+                "interfaces": [f"Gi1-{members}/0/1-{24 * (1 + i % 2)}", f"Te1-{members}/1/1-4"],
+                "description": f"Switch testowy {i % 10}.", "method_list": SWITCH_METHODS}
+    return catalog
+
+
+def timed_load(paths):
+    tracemalloc.start()
+    start = time.perf_counter()
+    catalog = load_catalogs(paths)
+    elapsed = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return catalog, elapsed * 1000, memory / 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiar wczytywania katalogu urządzeń.")
+    parser.add_argument("--models", type=int, default=300)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=20.0, help="maksymalny czas wczytania z cache (ms)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(sample_catalog(args.models), f)
+
+        catalog, first_ms, _ = timed_load([path])
+        print(f"pierwsze wczytanie {args.models} modeli (kompilacja): {first_ms:.1f} ms")
+        cached_ms = None
+        for _ in range(args.repeats):
+            catalog, elapsed, memory = timed_load([path])
+            cached_ms = elapsed if cached_ms is None else min(cached_ms, elapsed)
+        print(f"wczytanie z cache: {cached_ms:.1f} ms, {memory:.0f} KiB")
+
+        models = list(catalog["Cisco_Switch"].values()) + list(catalog["Cisco_Router"].values())
+        expand_specs.cache_clear()
+        tracemalloc.start()
+        start = time.perf_counter()
+        ports = sum(len(model["interfaces"]) for model in models)
+        expand_ms = (time.perf_counter() - start) * 1000
+        expanded = tracemalloc.get_traced_memory()[0] / 1024
+        tracemalloc.stop()
+        print(f"rozwinięcie interfejsów wszystkich modeli: {ports} portów, {expand_ms:.1f} ms, {expanded:.0f} KiB "
+              f"(wspólne krotki: {expand_specs.cache_info().currsize} dla {len(models)} modeli)")
+
+    if cached_ms > args.budget_ms:
+        print(f"[REGRESJA] wczytanie katalogu z cache przekracza {args.budget_ms} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# benchmarks/bench_config_diff.py
+"""
+Diff of two large configurations.
+
+Builds a synthetic running-config of about --lines lines (interfaces,
+VLANs, access lists, policy maps and static routes) and a desired config
+differing in about 10% of them, then reports the parse and diff times.
+Exits with status 1 when a full parse + diff exceeds the budget, or when
+the delta handles a removed access list, a changed policy map or a trunk
+VLAN list continued with 'add' lines wrong:
+
+    python benchmarks/bench_config_diff.py --lines 50000 --budget-ms 500
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from autoswitch.config_diff import diff_configs, parse_config  # noqa: E402
+
+
+def synthetic_config(lines, variant):
+    """Return config lines; variant 1 changes every tenth VLAN, port, access list, policy map and route, and the uplinks."""
+    out = ["hostname BENCH", "ip routing", "!"]
+    vlans = min(4000, lines // 20)
+    for vlan_id in range(2, vlans + 2):
+        name = f"V{vlan_id}_NEW" if variant and vlan_id % 10 == 0 else f"V{vlan_id}"
+        out += [f"vlan {vlan_id}", f" name {name}", "!"]
+    port = 0
+    while len(out) < lines * 0.7:
+        vlan_id = port % vlans + 2
+        access = vlan_id + 1 if variant and port % 10 == 0 else vlan_id
+        out += [f"interface GigabitEthernet{port // 48 + 1}/0/{port % 48 + 1}", f" description port {port}",
+                " switchport mode access", f" switchport access vlan {access}", "!"]
+        port += 1
+    # Uplinki z listą VLAN-ów dopisywaną liniami "add", jak w show running-config
+    for uplink in range(max(1, lines // 5000)):
+        out += [f"interface TenGigabitEthernet1/1/{uplink + 1}", " switchport mode trunk",
+                " switchport trunk allowed vlan 1-100",
+                " switchport trunk allowed vlan add 400" if variant else " switchport trunk allowed vlan add 200-300",
+                "!"]
+    # Listy dostępu o identycznych wpisach; wariant 1 usuwa co dziesiątą
+    for acl in range(lines // 200):
+        if variant and acl % 10 == 0:
+            continue
+        out += [f"ip access-list extended ACL{acl}", " permit tcp any any eq 22",
+                " deny ip any any log", "!"]
+    for policy in range(lines // 500):
+        rate = 16000 if variant and policy % 10 == 0 else 8000
+        out += [f"policy-map QOS{policy}", " class web", f"  police {rate} conform-action transmit",
+                " class voice", "  police 8000 conform-action transmit", "!"]
+    route = 0
+    while len(out) < lines:
+        next_hop = 2 if variant and route % 10 == 0 else 1
+        out.append(f"ip route 10.{route // 256 % 256}.{route % 256}.0 255.255.255.0 192.0.2.{next_hop}")
+        route += 1
+    return out
+
+
+def check_delta(delta, lines):
+    """Errors of the delta of synthetic_config(lines, 0) -> synthetic_config(lines, 1)."""
+    errors = []
+    removed = {f"no ip access-list extended ACL{acl}" for acl in range(0, lines // 200, 10)}
+    if removed - set(delta):
+        errors.append(f"brak usunięcia list dostępu: {sorted(removed - set(delta))[:3]}")
+    trunk = ["interface Te1/1/1", " switchport trunk allowed vlan 1-100,400", "exit"]
+    start = delta.index(trunk[0]) if trunk[0] in delta else -1
+    if delta[start:start + len(trunk)] != trunk:
+        errors.append("lista VLAN-ów trunka nie jest wysyłana w całości")
+    stray = [line for line in delta if line.startswith(("no permit ", "no deny "))]
+    if stray:
+        errors.append(f"wpisy list dostępu poza sekcją: {stray[:3]}")
+    if lines // 500:
+        block = ["policy-map QOS0", " class web", "  no police 8000 conform-action transmit",
+                 "  police 16000 conform-action transmit", "  exit", "exit"]
+        start = delta.index(block[0]) if block[0] in delta else -1
+        if delta[start:start + len(block)] != block:
+            errors.append("niepoprawna zmiana policy-map QOS0")
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiar wyznaczania różnicy konfiguracji.")
+    parser.add_argument("--lines", type=int, default=50000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="maksymalny czas parsowania i porównania")
+    args = parser.parse_args(argv)
+
+    current_lines = synthetic_config(args.lines, 0)
+    desired_lines = synthetic_config(args.lines, 1)
+
+    best_parse = best_diff = None
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        current = parse_config(current_lines)
+        desired = parse_config(desired_lines)
+        parsed = time.perf_counter()
+        delta = diff_configs(current, desired)
+        done = time.perf_counter()
+        best_parse = min(best_parse or parsed - start, parsed - start)
+        best_diff = min(best_diff or done - parsed, done - parsed)
+
+    print(f"{len(current_lines)} + {len(desired_lines)} linii: parsowanie {best_parse * 1000:.1f} ms, "
+          f"różnica {best_diff * 1000:.1f} ms, {len(delta)} poleceń w delcie")
+    errors = check_delta(delta, args.lines)
+    for error in errors:
+        print(f"[REGRESJA] {error}", file=sys.stderr)
+    if errors:
+        return 1
+    if (best_parse + best_diff) * 1000 > args.budget_ms:
+        print(f"[REGRESJA] przekroczono budżet {args.budget_ms:.0f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
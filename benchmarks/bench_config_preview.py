@@ -0,0 +1,97 @@
+# benchmarks/bench_config_preview.py
+"""
+Opening, scrolling and searching a large config in ConfigPreview (offscreen Qt).
+
+Builds a ConfigDocument of about --lines lines and reports the time until
+the first chunk is shown, the time to load the whole document through the
+event loop with the longest event-loop stall, the average scroll frame
+and one indexed search. Exits with status 1 when opening or a scroll
+frame exceeds --budget-ms:
+
+    python benchmarks/bench_config_preview.py --lines 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PyQt6 import QtWidgets  # noqa: E402
+
+from autoswitch.document import ConfigDocument  # noqa: E402
+from autoswitch.template_logic import render_template  # noqa: E402
+from autoswitch.vlans import VlanRegistry  # noqa: E402
+
+
+def sample_document(lines):
+    """Access VLAN blocks over 48-port switches until the document has about `lines` lines."""
+    document = ConfigDocument()
+    registry = VlanRegistry()
+    names = [f"Gi1/0/{i + 1}" for i in range(48)]
+    total = 0
+    vlan_id = 10
+    while total < lines:
+        params = {"VLAN ID": vlan_id, "Description": f"bench {vlan_id}", "Color": "#4CAF50"}
+        block = document.append('set_access_vlan', params, names,
+                                render_template('set_access_vlan', params, names, registry))
+        total += len(block.lines) + 2
+        vlan_id += 1
+    return document
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiar podglądu dużej konfiguracji.")
+    parser.add_argument("--lines", type=int, default=100000)
+    parser.add_argument("--scroll-steps", type=int, default=200)
+    parser.add_argument("--budget-ms", type=float, default=100.0,
+                        help="maksymalny czas otwarcia podglądu i klatki przewijania")
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication(sys.argv)
+    from widgets.config_preview import ConfigPreview
+
+    document = sample_document(args.lines)
+    preview = ConfigPreview()
+    preview.resize(600, 800)
+    preview.show()
+    app.processEvents()
+
+    start = time.perf_counter()
+    preview.set_document(document)
+    preview.repaint()
+    opened = time.perf_counter() - start
+
+    stall = 0.0
+    while preview.is_loading:
+        step = time.perf_counter()
+        app.processEvents()
+        stall = max(stall, time.perf_counter() - step)
+    loaded = time.perf_counter() - start
+    print(f"{preview.line_count} linii: pierwszy widok {opened * 1000:.1f} ms, "
+          f"całość {loaded * 1000:.0f} ms, najdłuższy krok pętli {stall * 1000:.1f} ms")
+
+    scrollbar = preview.text_edit.verticalScrollBar()
+    start = time.perf_counter()
+    for i in range(args.scroll_steps):
+        scrollbar.setValue(scrollbar.maximum() * i // args.scroll_steps)
+        preview.text_edit.viewport().repaint()
+    frame = (time.perf_counter() - start) / args.scroll_steps
+    print(f"przewijanie: {frame * 1000:.2f} ms/klatkę")
+
+    start = time.perf_counter()
+    preview.search_edit.setText("switchport access vlan 300")
+    preview.find_next()
+    print(f"wyszukiwanie: {len(preview.matches)} trafień w {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if max(opened, frame) * 1000 > args.budget_ms:
+        print(f"[REGRESJA] otwarcie lub przewijanie przekracza {args.budget_ms} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
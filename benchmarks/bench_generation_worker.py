@@ -0,0 +1,127 @@
+# benchmarks/bench_generation_worker.py
+"""
+UI responsiveness while configuration is generated (offscreen Qt).
+
+Runs --tasks set_access_vlan calls over --ports ports each, once on the
+main thread (as apply_configuration used to) and once through
+GenerationWorker on the thread pool. Meanwhile a 60 Hz timer repaints a
+widget and records the gaps between its frames. Exits with status 1 when
+the worst frame gap with the worker exceeds --budget-ms:
+
+    python benchmarks/bench_generation_worker.py --tasks 40 --ports 2048
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PyQt6 import QtCore, QtWidgets  # noqa: E402
+
+from autoswitch.template_logic import render_template  # noqa: E402
+from autoswitch.vlans import VlanRegistry  # noqa: E402
+from pages.generation_worker import GenerationTask, GenerationWorker  # noqa: E402
+
+FRAME_MS = 1000 / 60
+
+
+def sample_tasks(tasks, ports):
+    names = [f"Gi{i // 48 + 1}/0/{i % 48 + 1}" for i in range(ports)]
+    return [GenerationTask('set_access_vlan',
+                           {"VLAN ID": 10 + i, "Description": f"bench {i}", "Color": "#4CAF50"}, names)
+            for i in range(tasks)]
+
+
+class FrameClock:
+    """Repaints a widget from a 60 Hz timer and records the gaps between frames."""
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.stamps = []
+        self.timer = QtCore.QTimer()
+        self.timer.setTimerType(QtCore.Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(int(FRAME_MS))
+        self.timer.timeout.connect(self.tick)
+
+    def tick(self):
+        self.stamps.append(time.perf_counter())
+        self.widget.repaint()
+
+    def start(self):
+        self.stamps = [time.perf_counter()]
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        self.stamps.append(time.perf_counter())
+        return [(b - a) * 1000 for a, b in zip(self.stamps, self.stamps[1:])]
+
+
+def run_blocking(app, clock, tasks):
+    clock.start()
+    app.processEvents()
+    registry = VlanRegistry()
+    for task in tasks:
+        render_template(task.method, task.params, task.ports, registry)
+    app.processEvents()
+    return clock.stop()
+
+
+def run_worker(app, clock, tasks):
+    done = []
+    worker = GenerationWorker(tasks, VlanRegistry())
+    worker.connect(lambda *_: None, done.append, lambda message, _: done.append(message))
+    clock.start()
+    QtCore.QThreadPool.globalInstance().start(worker)
+    while not done:
+        app.processEvents(QtCore.QEventLoop.ProcessEventsFlag.WaitForMoreEvents)
+    gaps = clock.stop()
+    if isinstance(done[0], str):
+        raise RuntimeError(done[0])
+    return gaps, sum(text.count("\n") for text in done[0].texts)
+
+
+def report(name, gaps):
+    gaps = sorted(gaps)
+    p99 = gaps[min(len(gaps) - 1, int(len(gaps) * 0.99))]
+    print(f"{name}: {len(gaps)} klatek, najdłuższa przerwa {gaps[-1]:.1f} ms, p99 {p99:.1f} ms")
+    return gaps[-1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiar płynności interfejsu podczas generowania konfiguracji.")
+    parser.add_argument("--tasks", type=int, default=40)
+    parser.add_argument("--ports", type=int, default=2048)
+    parser.add_argument("--budget-ms", type=float, default=2 * FRAME_MS,
+                        help="maksymalna przerwa między klatkami przy generowaniu w tle")
+    parser.add_argument("--skip-blocking", action="store_true", help="nie mierz generowania w głównym wątku")
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication(sys.argv)
+    widget = QtWidgets.QLabel("Generowanie...")
+    widget.resize(400, 300)
+    widget.show()
+    clock = FrameClock(widget)
+    tasks = sample_tasks(args.tasks, args.ports)
+
+    if not args.skip_blocking:
+        report("Główny wątek", run_blocking(app, clock, tasks))
+
+    start = time.perf_counter()
+    gaps, lines = run_worker(app, clock, tasks)
+    elapsed = time.perf_counter() - start
+    print(f"GenerationWorker: {lines} linii w {elapsed:.2f} s")
+    worst = report("GenerationWorker", gaps)
+
+    if worst > args.budget_ms:
+        print(f"[REGRESJA] przerwa między klatkami przekracza {args.budget_ms:.1f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
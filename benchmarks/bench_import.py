@@ -0,0 +1,66 @@
+# benchmarks/bench_import.py
+"""
+Import-time budget for the Qt-free core.
+
+Imports the core modules in a fresh interpreter, checks that no PyQt6 module
+got loaded and that the import stays within the budget. Exits with status 1
+when either check fails, so it can run in CI:
+
+    python benchmarks/bench_import.py --budget-ms 30
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CORE_MODULES = ["autoswitch.validation", "autoswitch.template_logic"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+qt = sorted(m for m in sys.modules if m.split('.')[0] == 'PyQt6')
+print(json.dumps({{'seconds': elapsed, 'qt_modules': qt}}))
+"""
+
+
+def measure_import(modules, repeats=5):
+    """Return (best import time in seconds, Qt modules loaded) over fresh interpreters."""
+    code = PROBE.format(modules=modules)
+    best = None
+    qt_modules = []
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                             capture_output=True, text=True).stdout
+        result = json.loads(out)
+        qt_modules = result['qt_modules'] or qt_modules
+        if best is None or result['seconds'] < best:
+            best = result['seconds']
+    return best, qt_modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sprawdza czas importu rdzenia bez PyQt6.")
+    parser.add_argument("--budget-ms", type=float, default=30.0, help="maksymalny czas importu (ms)")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    seconds, qt_modules = measure_import(CORE_MODULES, args.repeats)
+    print(f"Import {', '.join(CORE_MODULES)}: {seconds * 1000:.1f} ms (budżet {args.budget_ms:.0f} ms)")
+
+    if qt_modules:
+        print(f"[BŁĄD] Rdzeń załadował moduły Qt: {', '.join(qt_modules)}", file=sys.stderr)
+        return 1
+    if seconds * 1000 > args.budget_ms:
+        print("[BŁĄD] Przekroczono budżet czasu importu.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
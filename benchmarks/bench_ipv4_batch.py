@@ -0,0 +1,86 @@
+# benchmarks/bench_ipv4_batch.py
+"""
+Batch IPv4 validation of a large address list.
+
+Generates --rows addresses (1% of them malformed) and as many netmasks,
+then times parse_addresses() and network_batch() with NumPy and with the
+plain loop. Exits with status 1 when the NumPy path needs more than
+--budget-ms for the addresses or is not --min-speedup times faster than
+the loop; without NumPy only the loop is measured:
+
+    python benchmarks/bench_ipv4_batch.py --rows 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from autoswitch import ipv4_batch  # noqa: E402
+from autoswitch.ipv4_batch import error_rows, network_batch, parse_addresses, to_dotted  # noqa: E402
+
+BAD_ADDRESSES = ("10.0.0.256", "10.0.0", "10.00.0.1", "1.2.3.4 ", "a.b.c.d")
+
+
+def sample_rows(rows, seed=1):
+    """Addresses (every hundredth one malformed) and dotted netmasks."""
+    rng = random.Random(seed)
+    addresses = [f"{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}"
+                 for _ in range(rows)]
+    for row in range(0, rows, 100):
+        addresses[row] = rng.choice(BAD_ADDRESSES)
+    masks = to_dotted([(0xFFFFFFFF << (32 - rng.randrange(33))) & 0xFFFFFFFF for _ in range(rows)])
+    return addresses, masks
+
+
+def measure(addresses, masks, vectorized):
+    start = time.perf_counter()
+    _, codes = parse_addresses(addresses, vectorized)
+    parse_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    network_batch(addresses, masks, vectorized)
+    network_ms = (time.perf_counter() - start) * 1000
+    return parse_ms, network_ms, len(error_rows(codes))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiar wsadowej walidacji adresów IPv4.")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--budget-ms", type=float, default=800.0,
+                        help="maksymalny czas walidacji adresów z NumPy (ms)")
+    parser.add_argument("--min-speedup", type=float, default=1.5,
+                        help="wymagane przyspieszenie NumPy względem pętli (adresy)")
+    args = parser.parse_args(argv)
+
+    addresses, masks = sample_rows(args.rows)
+    modes = [("pętla", False)]
+    if ipv4_batch.np is not None:
+        modes.insert(0, ("NumPy", True))
+    else:
+        print("NumPy nie jest zainstalowany - mierzona jest tylko pętla, bez budżetu")
+
+    results = {}
+    for label, vectorized in modes:
+        parse_ms, network_ms, errors = measure(addresses, masks, vectorized)
+        results[vectorized] = parse_ms
+        print(f"{label}: {args.rows} adresów w {parse_ms:.0f} ms (błędnych {errors}), "
+              f"adres+maska w {network_ms:.0f} ms")
+
+    if True in results and results[True] > args.budget_ms:
+        print(f"[REGRESJA] walidacja adresów przekracza {args.budget_ms} ms", file=sys.stderr)
+        return 1
+    if True in results:
+        speedup = results[False] / results[True]
+        print(f"przyspieszenie NumPy: {speedup:.1f}x")
+        if speedup < args.min_speedup:
+            print(f"[REGRESJA] NumPy jest tylko {speedup:.1f}x szybszy od pętli "
+                  f"(wymagane {args.min_speedup}x)", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+# benchmarks/bench_method_switch.py
+"""
+Cost of switching methods in ConfigPage (offscreen Qt).
+
+Cycles through every method of a device several times and reports the
+average switch time and the widget churn, i.e. how many widgets were
+added to the page while switching:
+
+    python benchmarks/bench_method_switch.py --device "Cisco 2911" --cycles 20
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PyQt6 import QtCore, QtWidgets  # noqa: E402
+
+
+class WidgetChurnCounter(QtCore.QObject):
+    """Counts widgets added as children anywhere in the application."""
+
+    def __init__(self):
+        super().__init__()
+        self.added = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Type.ChildAdded and event.child().isWidgetType():
+            self.added += 1
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiar przełączania metod w ConfigPage.")
+    parser.add_argument("--device-type", default="router", choices=("router", "switch"))
+    parser.add_argument("--device", default="Cisco 2911")
+    parser.add_argument("--cycles", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication(sys.argv)
+    from pages.config_page import ConfigPage
+
+    stacked_widget = QtWidgets.QStackedWidget()
+    page = ConfigPage(stacked_widget)
+    stacked_widget.addWidget(page)
+    page.initialize(args.device_type, args.device)
+    stacked_widget.show()
+    app.processEvents()
+
+    counter = WidgetChurnCounter()
+    app.installEventFilter(counter)
+
+    methods = page.method_combo.count()
+    switches = 0
+    start = time.perf_counter()
+    for _ in range(args.cycles):
+        for i in range(methods):
+            page.method_combo.setCurrentIndex(i)
+            app.processEvents()
+            switches += 1
+    elapsed = time.perf_counter() - start
+    app.removeEventFilter(counter)
+
+    print(f"{args.device}: {switches} przełączeń metod, "
+          f"{elapsed / switches * 1000:.2f} ms/przełączenie, "
+          f"{counter.added} dodanych widżetów ({counter.added / switches:.1f} na przełączenie)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# benchmarks/bench_port_grid.py
+"""
+Full repaint of the port grid (offscreen Qt).
+
+Paints a grid of --ports ports with both implementations, PortGridView and
+one PortButton per port, recolouring every port before each frame. Exits
+with status 1 when a PortGridView frame exceeds the budget (one 60 Hz frame
+by default):
+
+    python benchmarks/bench_port_grid.py --ports 384 --frames 50
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PyQt6 import QtWidgets  # noqa: E402
+
+COLORS = ('#4CAF50', '#2196F3', '#FF9800', '#9C27B0', '#5F5F5F')
+
+
+def port_labels(count):
+    return [f"Gi{i // 48 + 1}/0/{i % 48 + 1}" for i in range(count)]
+
+
+def build_grid_view(labels, columns):
+    from widgets.port_grid import PortGridView
+    view = PortGridView(labels, columns=columns)
+    return view, view.items
+
+
+def build_port_buttons(labels, columns):
+    from widgets.custom_widgets import PortButton
+    container = QtWidgets.QWidget()
+    layout = QtWidgets.QGridLayout(container)
+    layout.setSpacing(5)
+    buttons = []
+    for i, label in enumerate(labels):
+        btn = PortButton(label)
+        layout.addWidget(btn, *divmod(i, columns))
+        buttons.append(btn)
+    return container, buttons
+
+
+def measure(app, widget, ports, frames):
+    """Return the average time (s) of recolouring all ports and repainting the widget."""
+    widget.show()
+    app.processEvents()
+    start = time.perf_counter()
+    for frame in range(frames):
+        color = COLORS[frame % len(COLORS)]
+        for port in ports:
+            port.set_color(color)
+        widget.repaint()
+        app.processEvents()
+    elapsed = time.perf_counter() - start
+    widget.hide()
+    return elapsed / frames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiar odświeżania siatki portów.")
+    parser.add_argument("--ports", type=int, default=384)
+    parser.add_argument("--columns", type=int, default=14)
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--budget-ms", type=float, default=16.7, help="maksymalny czas klatki PortGridView")
+    parser.add_argument("--skip-buttons", action="store_true", help="nie mierz wersji z PortButton")
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication(sys.argv)
+    labels = port_labels(args.ports)
+
+    view, items = build_grid_view(labels, args.columns)
+    grid_time = measure(app, view, items, args.frames)
+    print(f"PortGridView: {args.ports} portów, {grid_time * 1000:.2f} ms/klatkę")
+
+    if not args.skip_buttons:
+        container, buttons = build_port_buttons(labels, args.columns)
+        buttons_time = measure(app, container, buttons, args.frames)
+        print(f"PortButton:   {args.ports} portów, {buttons_time * 1000:.2f} ms/klatkę")
+
+    if grid_time * 1000 > args.budget_ms:
+        print(f"[REGRESJA] klatka PortGridView przekracza {args.budget_ms} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+# benchmarks/bench_prefix_index.py
+"""
+Conflict checks of the IPv4 prefix index with a large fleet.
+
+Registers --prefixes entries (interface subnets and addresses, DHCP pools
+and static routes spread over --devices devices) into one PrefixIndex,
+then times conflict checks of entries that do and do not collide. Exits
+with status 1 when an average register() or check exceeds --budget-us:
+
+    python benchmarks/bench_prefix_index.py --prefixes 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from autoswitch.prefix_index import PrefixConflict, PrefixIndex, format_prefix  # noqa: E402
+
+
+def sample_entries(prefixes, devices, seed=1):
+    """(device, entries) registrations: one /24 per interface, so nothing collides."""
+    rng = random.Random(seed)
+    subnets = rng.sample(range(1 << 24), prefixes // 4 + 1)
+    registrations = []
+    for i, subnet in enumerate(subnets[:-1]):
+        device = f"r{i % devices:05d}"
+        base = subnet << 8
+        registrations.append((device, 'apply_dhcp_server', [
+            ('dhcp-pool', format_prefix(base, 24), f"pool{i}"),
+            ('interface', format_prefix(base + 1, 24), "Gi0/0", ("Gi0/0",)),
+            ('address', format_prefix(base + 1, 32), "Gi0/0", ("Gi0/0",)),
+        ]))
+        registrations.append((device, 'apply_static_routing', [('route', format_prefix(base + 256 * 7, 29), "ip route")]))
+    return registrations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiar indeksu prefiksów IPv4.")
+    parser.add_argument("--prefixes", type=int, default=100000)
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--checks", type=int, default=20000)
+    parser.add_argument("--budget-us", type=float, default=100.0, help="maksymalny średni czas operacji (µs)")
+    args = parser.parse_args(argv)
+
+    registrations = sample_entries(args.prefixes, args.devices)
+    index = PrefixIndex()
+    start = time.perf_counter()
+    for device, method, entries in registrations:
+        index.register(device, method, entries)
+    elapsed = time.perf_counter() - start
+    register_us = elapsed / len(index) * 1e6
+    print(f"rejestracja {len(index)} prefiksów: {elapsed:.2f} s ({register_us:.1f} µs/prefiks)")
+
+    rng = random.Random(2)
+    samples = [registrations[2 * rng.randrange(len(registrations) // 2)] for _ in range(args.checks)]
+    conflicts = 0
+    start = time.perf_counter()
+    for device, method, entries in samples:
+        try:
+            # Ta sama pula na innym urządzeniu - konflikt w całej flocie
+            index.register(device + "-kopia", method, entries)
+        except PrefixConflict:
+            conflicts += 1
+    elapsed = time.perf_counter() - start
+    check_us = elapsed / args.checks * 1e6
+    print(f"{args.checks} sprawdzeń kolidujących wpisów: {check_us:.1f} µs/sprawdzenie, konfliktów {conflicts}")
+
+    if max(register_us, check_us) > args.budget_us:
+        print(f"[REGRESJA] operacja indeksu przekracza {args.budget_us} µs", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+# benchmarks/bench_push.py
+"""
+Concurrent push to simulated devices.
+
+Starts autoswitch.simulator with --devices devices in a separate process,
+generates one access-switch configuration and pushes it to all of them,
+once per --window value, reporting the total time and commands/s.
+Before that, two configurations are pushed to one device over a shared
+session, which must give no errors, and a configuration with a rejected
+command is pushed with stop_on_error, which must send nothing after it.
+Exits with status 1 on any error:
+
+    python benchmarks/bench_push.py --devices 500 --delay-ms 5 --window 1 --window 32
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from autoswitch.document import ConfigDocument  # noqa: E402
+from autoswitch.push import config_commands, push_many  # noqa: E402
+from autoswitch.simulator import SimulatorServer  # noqa: E402
+from autoswitch.template_logic import render_template  # noqa: E402
+from autoswitch.vlans import VlanRegistry  # noqa: E402
+
+
+def sample_document(ports=48, vlans=6):
+    """Access-switch config: the ports split evenly between a few VLANs."""
+    document = ConfigDocument()
+    registry = VlanRegistry()
+    names = [f"Gi1/0/{i + 1}" for i in range(ports)]
+    group = max(1, ports // vlans)
+    for i in range(vlans):
+        params = {"VLAN ID": 10 * (i + 1), "Description": f"bench {i}", "Color": "#4CAF50"}
+        selected = names[i * group:(i + 1) * group]
+        document.append('set_access_vlan', params, selected,
+                        render_template('set_access_vlan', params, selected, registry))
+    document.append('apply_static_routing', {}, [],
+                    "ip route 0.0.0.0 0.0.0.0 192.0.2.1\nend")
+    return document
+
+
+def start_simulator(devices, base_port, delay_ms):
+    process = subprocess.Popen([sys.executable, "-m", "autoswitch.simulator", "--count", str(devices),
+                                "--base-port", str(base_port), "--delay-ms", str(delay_ms)],
+                               cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    process.stdout.readline()  # czekamy, aż symulator zacznie nasłuchiwać
+    return process
+
+
+async def check_push(port):
+    """
+    Errors of pushing two documents to one host (both start with 'enable' on the same session)
+    and of a stop_on_error push whose fifth command is rejected.
+    """
+    server = await SimulatorServer(reject="^bogus").start(1, port)
+    try:
+        document = sample_document(ports=4, vlans=2)
+        results = await push_many([("127.0.0.1", port, document), ("127.0.0.1", port, document)])
+        errors = [f"{result.host}:{result.port}: {result.error or result.errors}" for result in results if not result.ok]
+        config = "enable\nconfigure terminal\nvlan 10\n name A\nbogus 1\n" + "".join(f"vlan {i}\n" for i in range(11, 17))
+        result, = await push_many([("127.0.0.1", port, config)], stop_on_error=True)
+        if result.commands != 5 or len(result.errors) != 1:
+            errors.append(f"stop_on_error: wysłano {result.commands} poleceń, błędy {result.errors}")
+    finally:
+        await server.close()
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiar równoległego wysyłania konfiguracji.")
+    parser.add_argument("--devices", type=int, default=500)
+    parser.add_argument("--base-port", type=int, default=20000)
+    parser.add_argument("--delay-ms", type=float, default=5.0, help="opóźnienie odpowiedzi symulatora (ms)")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--window", type=int, action="append", help="rozmiar okna (można podać kilka razy)")
+    args = parser.parse_args(argv)
+    windows = args.window or [1, 32]
+
+    errors = asyncio.run(check_push(args.base_port + args.devices))
+    for error in errors:
+        print(f"[REGRESJA] wysyłanie: {error}", file=sys.stderr)
+    if errors:
+        return 1
+
+    document = sample_document()
+    commands = len(config_commands(document))
+    simulator = start_simulator(args.devices, args.base_port, args.delay_ms)
+    failed = 0
+    try:
+        for window in windows:
+            jobs = [("127.0.0.1", args.base_port + i, document) for i in range(args.devices)]
+            start = time.perf_counter()
+            results = asyncio.run(push_many(jobs, args.concurrency, window, timeout=60))
+            elapsed = time.perf_counter() - start
+            failed = sum(not result.ok for result in results)
+            print(f"okno {window:>3}: {args.devices} urządzeń x {commands} poleceń w {elapsed:.2f} s "
+                  f"({args.devices * commands / elapsed:,.0f} poleceń/s), błędów: {failed}")
+    finally:
+        simulator.terminate()
+        simulator.wait()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
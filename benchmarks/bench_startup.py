@@ -0,0 +1,82 @@
+# benchmarks/bench_startup.py
+"""
+Startup-time budget of the GUI (offscreen Qt).
+
+Starts the application in a fresh interpreter and measures the import time
+of main.py and the time until the start page is painted for the first
+time. Also checks that ConfigPage was not imported before the user left
+the start page. Exits with status 1 when a check fails, so it can run in CI:
+
+    python benchmarks/bench_startup.py --budget-ms 250
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, os, sys, time
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+from PyQt6 import QtCore, QtWidgets
+
+class FirstPaint(QtCore.QObject):
+    painted = None
+
+    def eventFilter(self, obj, event):
+        if self.painted is None and event.type() == QtCore.QEvent.Type.Paint:
+            self.painted = time.perf_counter()
+        return False
+
+app = QtWidgets.QApplication(sys.argv)
+first_paint = FirstPaint()
+app.installEventFilter(first_paint)
+window = main.build_main_window(app)
+window.show()
+while first_paint.painted is None:
+    app.processEvents()
+print(json.dumps({'import': imported - start, 'first_paint': first_paint.painted - start,
+                  'config_page_loaded': 'pages.config_page' in sys.modules}))
+"""
+
+
+def measure_startup(repeats=5):
+    """Return the best import and first-paint times (s) and whether ConfigPage was loaded eagerly."""
+    best = None
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, check=True,
+                             capture_output=True, text=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        if best is None or result['first_paint'] < best['first_paint']:
+            best = result
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sprawdza czas uruchomienia aplikacji.")
+    parser.add_argument("--budget-ms", type=float, default=250.0,
+                        help="maksymalny czas do pierwszego odrysowania okna (ms)")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    result = measure_startup(args.repeats)
+    print(f"Import main: {result['import'] * 1000:.1f} ms, "
+          f"pierwsze odrysowanie: {result['first_paint'] * 1000:.1f} ms (budżet {args.budget_ms:.0f} ms)")
+
+    if result['config_page_loaded']:
+        print("[BŁĄD] pages.config_page został zaimportowany przed przejściem do konfiguracji.", file=sys.stderr)
+        return 1
+    if result['first_paint'] * 1000 > args.budget_ms:
+        print("[BŁĄD] Przekroczono budżet czasu uruchomienia.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
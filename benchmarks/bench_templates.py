@@ -0,0 +1,187 @@
+# benchmarks/bench_templates.py
+"""
+Benchmark of every TEMPLATE_FUNCTIONS entry over synthetic devices.
+
+Each template runs for 2, 48, 384 and 4096 ports; the VLAN-aware ones also
+for several sizes of the VLAN table. Throughput (ops/s) and peak memory
+are compared with benchmarks/baseline.json and the script exits with
+status 1 when any case regresses by more than the threshold:
+
+    python benchmarks/bench_templates.py                 # porównanie z baseline
+    python benchmarks/bench_templates.py --update-baseline
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from autoswitch.bulk_routes import route_table  # noqa: E402
+from autoswitch.template_logic import TEMPLATE_FUNCTIONS, VLAN_TEMPLATE_FUNCTIONS  # noqa: E402
+from autoswitch.vlans import VlanRegistry  # noqa: E402
+
+PORT_COUNTS = (2, 48, 384, 4096)
+VLAN_TABLE_SIZES = (1, 100, 4000)
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# VLAN tworzony przez szablony; tabela VLAN-ów zajmuje 2..N+1, więc 4094 jest zawsze wolny
+NEW_VLAN = 4094
+
+# 1024 tras /24 do dwóch next hopów - łączą się w dwie trasy /15
+BULK_ROUTES_CSV = "\n".join(f"10.{i // 256}.{i % 256}.0,255.255.255.0,203.0.113.{1 + i // 512}" for i in range(1024))
+
+SAMPLE_PARAMS = {
+    'apply_data_template': {"VLAN ID": NEW_VLAN, "Profile Name": "BENCH", "Color": "#4CAF50",
+                            "VLAN Routing": True, "VLAN Mode": "Static",
+                            "VLAN IP Address": "10.10.0.1", "Subnet Mask": "255.255.255.0",
+                            "DHCP Server": True, "start": "1", "stop": "0"},
+    'set_access_vlan': {"VLAN ID": NEW_VLAN, "Description": "bench", "Color": "#4CAF50"},
+    'set_trunk_vlan': {"Allowed VLANs": "2", "Description": "uplink"},
+    'set_native_vlan': {"Native VLAN ID": NEW_VLAN, "Allowed VLANs": "2", "Description": "native",
+                        "Color": "#4CAF50"},
+    'apply_nat': {"Interface Role": "Inside", "Pool Name": "POOL", "Pool Start IP": "203.0.113.10",
+                  "Pool End IP": "203.0.113.20", "Access List": "1", "Netmask": "255.255.255.0"},
+    'apply_static_routing': {"Destination Network": "192.168.2.0", "Subnet Mask": "255.255.255.0",
+                             "Next Hop IP": "203.0.113.1"},
+    'apply_bulk_static_routing': {"Routes CSV": BULK_ROUTES_CSV},
+    'apply_dynamic_routing': {"Routing Protocol": "OSPF", "Process ID": 1, "Area ID": 0,
+                              "Network 1": "10.0.0.0", "Netmask 1": "255.0.0.0",
+                              "Network 2": "192.168.0.0", "Netmask 2": "255.255.0.0"},
+    'apply_dhcp_server': {"Pool Name": "LAN", "Network": "192.168.1.0", "Subnet Mask": "255.255.255.0",
+                          "Default Router": "192.168.1.1", "DNS Server": "8.8.8.8", "Lease Time": 7},
+    'restart_device': {},
+    'update_firmware': {"Firmware Server IP": "192.0.2.10", "Firmware Image Name": "c2960.bin"},
+    'enable_vlan': {"VLAN ID": NEW_VLAN, "VLAN Name": "BENCH"},
+    'default_interface': {},
+}
+
+
+def synthetic_ports(count):
+    """Port names of a stack of 48-port members: Gi1/0/1 ... Gi86/0/16."""
+    return [f"Gi{i // 48 + 1}/0/{i % 48 + 1}" for i in range(count)]
+
+
+def vlan_table(size):
+    registry = VlanRegistry()
+    for vlan_id in range(2, size + 2):
+        registry.allocate(vlan_id, f"VLAN {vlan_id}", "#5F5F5F", "", 'bench')
+    return registry
+
+
+def make_case(method_name, ports, vlan_size):
+    """Return a zero-argument callable running one template call on fresh state."""
+    func = TEMPLATE_FUNCTIONS[method_name]
+    params = dict(SAMPLE_PARAMS[method_name])
+    if method_name == 'apply_bulk_static_routing':
+        # route_table pamięta ostatnie pliki CSV - mierzymy pełne parsowanie
+        return lambda: (route_table.cache_clear(), func(params, ports))
+    if method_name not in VLAN_TEMPLATE_FUNCTIONS:
+        return lambda: func(params, ports)
+
+    registry = vlan_table(vlan_size)
+    if "Allowed VLANs" in params:
+        params["Allowed VLANs"] = f"2-{vlan_size + 1}" if vlan_size > 1 else "2"
+
+    def run():
+        func(params, ports, registry)
+        registry.free(NEW_VLAN)
+    return run
+
+
+def measure(case, min_time):
+    """Return (ops/s, peak bytes) for one case."""
+    tracemalloc.start()
+    case()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ops = 0
+    start = time.perf_counter()
+    deadline = start + min_time
+    while True:
+        case()
+        ops += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+    return ops / (now - start), peak
+
+
+def run_benchmarks(min_time, name_filter=None):
+    missing = set(TEMPLATE_FUNCTIONS) - set(SAMPLE_PARAMS)
+    if missing:
+        raise SystemExit(f"Brak parametrów benchmarku dla: {', '.join(sorted(missing))}")
+
+    results = {}
+    for method_name in TEMPLATE_FUNCTIONS:
+        if name_filter and name_filter not in method_name:
+            continue
+        vlan_sizes = VLAN_TABLE_SIZES if method_name in VLAN_TEMPLATE_FUNCTIONS else (0,)
+        for port_count in PORT_COUNTS:
+            ports = synthetic_ports(port_count)
+            for vlan_size in vlan_sizes:
+                key = f"{method_name}[ports={port_count},vlans={vlan_size}]"
+                ops, peak = measure(make_case(method_name, ports, vlan_size), min_time)
+                results[key] = {'ops_per_sec': round(ops, 1), 'peak_bytes': peak}
+                print(f"{key:<55} {ops:>12.1f} ops/s {peak / 1024:>10.1f} KiB")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return a list of regression messages."""
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        if current['ops_per_sec'] < base['ops_per_sec'] * (1 - threshold):
+            regressions.append(f"{key}: {current['ops_per_sec']:.1f} ops/s "
+                               f"(baseline {base['ops_per_sec']:.1f})")
+        if current['peak_bytes'] > base['peak_bytes'] * (1 + threshold):
+            regressions.append(f"{key}: {current['peak_bytes']} B pamięci "
+                               f"(baseline {base['peak_bytes']} B)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark funkcji TEMPLATE_FUNCTIONS.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="plik JSON z wynikami bazowymi")
+    parser.add_argument("--update-baseline", action="store_true", help="zapisz wyniki jako nowy baseline")
+    parser.add_argument("--threshold", type=float, default=0.3,
+                        help="dopuszczalny spadek wydajności / wzrost pamięci (domyślnie 0.3 = 30%%)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="czas pomiaru jednego przypadku (s)")
+    parser.add_argument("--filter", default=None, help="uruchom tylko metody zawierające ten tekst")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.min_time, args.filter)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Zapisano baseline: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Brak pliku baseline {args.baseline}; uruchom z --update-baseline.", file=sys.stderr)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    for message in regressions:
+        print(f"[REGRESJA] {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
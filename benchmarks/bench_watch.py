@@ -0,0 +1,123 @@
+# benchmarks/bench_watch.py
+"""
+Save-to-disk latency of watch mode.
+
+Writes an inventory of --devices switches to a temporary directory, builds
+it once, then runs FleetWatcher in a thread and edits one device --edits
+times (saving the file by rename, like most editors). Reports the time
+from each save to the updated config on disk and exits with status 1 when
+the worst one exceeds --budget-ms, or when an entry with a numeric,
+invalid or repeated name stops the watcher or is not reported:
+
+    python benchmarks/bench_watch.py --devices 10000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_build_cache import sample_inventory  # noqa: E402
+from autoswitch.batch import output_filename  # noqa: E402
+from autoswitch.watch import FleetWatcher, create_watcher  # noqa: E402
+
+
+def save(path, devices):
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"devices": devices}, f)
+    os.replace(path + ".tmp", path)
+
+
+def wait_for_text(path, text, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with open(path, encoding="utf-8") as f:
+                if text in f.read():
+                    return True
+        except FileNotFoundError:
+            pass
+        time.sleep(0.002)
+    return False
+
+
+def check_names(tmp):
+    """Errors of a build and an update with bad names next to valid devices."""
+    first, second = sample_inventory(2, 2)
+    numeric = dict(first, name=1001)
+    inventory_path = os.path.join(tmp, "names.json")
+    out_dir = os.path.join(tmp, "names")
+    save(inventory_path, [first, numeric, dict(second, name=first["name"])])
+    watcher = FleetWatcher(inventory_path, out_dir, cache_dir=None, log=lambda _: None)
+    errors = []
+    failures = watcher.build_all()
+    if len(failures) != 1 or {"1001.txt", output_filename(first["name"])} - set(os.listdir(out_dir)):
+        errors.append(f"pierwsze generowanie: {failures}, pliki {sorted(os.listdir(out_dir))}")
+    save(inventory_path, [second, {"name": ["sw"], "model": first["model"]}])
+    generated, removed, failures = watcher.update({watcher.inventory_path})
+    if (generated, removed, len(failures)) != (1, 2, 1) or set(os.listdir(out_dir)) != {output_filename(second["name"])}:
+        errors.append(f"zmiana: {generated} wygenerowanych, {removed} usuniętych, {failures}, "
+                      f"pliki {sorted(os.listdir(out_dir))}")
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiar opóźnienia trybu obserwacji.")
+    parser.add_argument("--devices", type=int, default=10000)
+    parser.add_argument("--edits", type=int, default=5)
+    parser.add_argument("--poll", type=float, default=None, help="użyj odpytywania co podany czas (s) zamiast inotify")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="maksymalne opóźnienie zapis -> plik")
+    args = parser.parse_args(argv)
+
+    devices = sample_inventory(args.devices, args.devices)
+    with tempfile.TemporaryDirectory() as tmp:
+        errors = check_names(tmp)
+        for error in errors:
+            print(f"[REGRESJA] nazwy urządzeń: {error}", file=sys.stderr)
+        if errors:
+            return 1
+        inventory_path = os.path.join(tmp, "inventory.json")
+        out_dir = os.path.join(tmp, "configs")
+        save(inventory_path, devices)
+        watcher = FleetWatcher(inventory_path, out_dir, cache_dir=os.path.join(tmp, "cache"), log=lambda _: None)
+        start = time.perf_counter()
+        watcher.build_all()
+        print(f"pierwsze generowanie {args.devices} urządzeń: {time.perf_counter() - start:.2f} s")
+
+        stop = threading.Event()
+        file_watcher = create_watcher([watcher.inventory_path] + watcher.catalog_paths, args.poll)
+        thread = threading.Thread(target=watcher.run, args=(file_watcher, stop.is_set))
+        thread.start()
+        latencies = []
+        try:
+            for edit in range(args.edits):
+                device = devices[(edit * 7919) % len(devices)]
+                marker = f"Edycja {edit}"
+                device["steps"][0]["params"]["Description"] = marker
+                save(inventory_path, devices)
+                start = time.perf_counter()
+                if not wait_for_text(os.path.join(out_dir, output_filename(device["name"])), marker):
+                    print(f"[BŁĄD] brak zmiany w konfiguracji {device['name']}", file=sys.stderr)
+                    return 1
+                latencies.append((time.perf_counter() - start) * 1000)
+                time.sleep(0.2)
+        finally:
+            stop.set()
+            thread.join()
+
+    print(f"opóźnienie zapis -> konfiguracja: średnio {sum(latencies) / len(latencies):.0f} ms, "
+          f"najwyżej {max(latencies):.0f} ms")
+    if max(latencies) > args.budget_ms:
+        print(f"[REGRESJA] opóźnienie przekracza {args.budget_ms} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,11 +3,9 @@ import sys
 from PyQt6 import QtWidgets, QtGui
 
 from pages.start_page import StartPage
-from pages.config_page import ConfigPage
 
-def main():
-    app = QtWidgets.QApplication(sys.argv)
-    
+def build_main_window(app):
+    """Create the main window with the start page; ConfigPage is built on first navigation."""
     # Set the application-wide style sheet
     app.setStyleSheet("QMainWindow { background-color: #2B2B2B; }")
     app.setWindowIcon(QtGui.QIcon("AutoSwitchLogo.ico"))
@@ -19,18 +17,27 @@ def main():
     main_window.setCentralWidget(stacked_widget)
 
     start_page = StartPage(stacked_widget)
-    config_page = ConfigPage(stacked_widget)
-
     stacked_widget.addWidget(start_page)   # Index 0
-    stacked_widget.addWidget(config_page)  # Index 1
+    pages = {}
 
     def go_to_config_page(device_type, device_name):
+        config_page = pages.get('config')
+        if config_page is None:
+            # Strona konfiguracji i jej zależności ładują się dopiero przy pierwszym przejściu
+            from pages.config_page import ConfigPage
+            config_page = pages['config'] = ConfigPage(stacked_widget)
+            stacked_widget.addWidget(config_page)  # Index 1
         config_page.initialize(device_type, device_name)
-        stacked_widget.setCurrentIndex(1)
+        stacked_widget.setCurrentWidget(config_page)
 
     start_page.go_to_config_page = go_to_config_page
 
     main_window.resize(800, 600)
+    return main_window
+
+def main():
+    app = QtWidgets.QApplication(sys.argv)
+    main_window = build_main_window(app)
     main_window.show()
     sys.exit(app.exec())
 
@@ -3,6 +3,7 @@
 methods_inputs = {
     'apply_data_template': ["VLAN ID", "Profile Name", "Color", "VLAN Routing", "VLAN Mode", "VLAN IP Address", "Subnet Mask", "DHCP Server", "start", "stop"],
     'apply_static_routing': ["Destination Network", "Subnet Mask", "Next Hop IP"],
+    'apply_bulk_static_routing': ["Routes CSV"],
     'apply_dynamic_routing': [
         "Routing Protocol",
         "Process ID",
@@ -32,6 +33,7 @@ methods_inputs = {
 optional_params = {
     'apply_data_template': ["Color", "DHCP Server", "start", "stop"],
     'apply_static_routing': [],
+    'apply_bulk_static_routing': [],
     'apply_dynamic_routing': ["Area ID", "Network 2", "Netmask 2", "Network 3", "Netmask 3", "Network 4", "Netmask 4"],
     'apply_nat': [],
     'apply_dhcp_server': ["DNS Server", "Lease Time"],
@@ -1,14 +1,29 @@
 # pages/config_page.py
 
 from PyQt6 import QtWidgets, QtCore, QtGui
-from PyQt6.QtCore import QRegularExpression
-from PyQt6.QtGui import QRegularExpressionValidator, QClipboard
+from PyQt6.QtGui import QClipboard
 
 from config import Cisco_Router, Cisco_Switch, description_color
 from methods_data import methods_inputs, optional_params
-from template_logic import TEMPLATE_FUNCTIONS, TemplateError, assign_interface_labels
+from autoswitch.config_diff import config_delta
+from autoswitch.document import ConfigDocument
+from autoswitch.interfaces import normalize_interface_name
+from autoswitch.prefix_index import PrefixIndex
+from autoswitch.running_config import load_device_state
+from autoswitch.template_logic import (TEMPLATE_FUNCTIONS, VLAN_TEMPLATE_FUNCTIONS, TemplateError, assign_interface_labels,
+                                       register_prefixes)
+from autoswitch.vlans import VlanRegistry
+from widgets.config_preview import ConfigPreview
 from widgets.custom_widgets import PortButton, VLANLegend
-from styles import BASE_STYLE, GROUPBOX_STYLE, LABEL_STYLE
+from widgets.param_fields import MAX_DYNAMIC_NETWORKS, field_spec, ip_validator
+from widgets.port_grid import PortGridView
+from pages.generation_worker import GenerationTask, GenerationWorker
+from styles import BASE_STYLE, GROUPBOX_STYLE, LABEL_STYLE, SPINBOX_STYLE
+
+DEFAULT_PORT_COLOR = '#5F5F5F'
+
+# PortGridView rysuje wszystkie porty w jednym widżecie; False wraca do osobnych PortButton
+USE_PORT_GRID = True
 
 class ConfigPage(QtWidgets.QWidget):
     def __init__(self, stacked_widget):
@@ -34,21 +49,34 @@ class ConfigPage(QtWidgets.QWidget):
         # Set the scroll content
         scroll.setWidget(self.scroll_content)
         
+        # Podgląd konfiguracji sesji obok formularza
+        self.config_preview = ConfigPreview()
+        splitter = QtWidgets.QSplitter(QtCore.Qt.Orientation.Horizontal)
+        splitter.addWidget(scroll)
+        splitter.addWidget(self.config_preview)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 1)
+        splitter.setCollapsible(0, False)
+
         # Create main layout for the page
         layout = QtWidgets.QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(scroll)
+        layout.addWidget(splitter)
 
         self.device_type = None
         self.device_name = None
         self.methods = []
         self.physical_interfaces = []
         self.port_buttons = {}
-        self.used_vlans = {}
+        self.port_grid = None
+        self.used_vlans = VlanRegistry()
+        self.prefix_index = PrefixIndex()
+        self.port_vlans = {}  # interfejs -> VLAN, którego kolor ma port
+        self.interface_buttons = {}
         self.labeled_interfaces = []
-        self.full_config = ""
-
-        self.setStyleSheet(BASE_STYLE + GROUPBOX_STYLE + LABEL_STYLE)
+        self.config_document = ConfigDocument()
+        self.style_applied = False
+        self.generation_worker = None
 
         self.params_group = None
         self.params_layout = None
@@ -56,10 +84,18 @@ class ConfigPage(QtWidgets.QWidget):
         self.vlan_legend = None
 
     def initialize(self, device_type, device_name):
+        if not self.style_applied:
+            # Duży arkusz stylów parsujemy dopiero, gdy strona ma coś pokazać
+            self.setStyleSheet(BASE_STYLE + GROUPBOX_STYLE + LABEL_STYLE + SPINBOX_STYLE)
+            self.style_applied = True
+        self.cancel_generation()
         self.device_type = device_type
         self.device_name = device_name
-        self.used_vlans = {}
-        self.full_config = "enable\n"
+        self.used_vlans = VlanRegistry()
+        self.prefix_index = PrefixIndex()
+        self.port_vlans = {}
+        self.config_document = ConfigDocument()
+        self.config_preview.set_document(self.config_document)
 
         if self.device_type == 'router':
             if device_name not in Cisco_Router:
@@ -94,7 +130,6 @@ class ConfigPage(QtWidgets.QWidget):
         header_label = QtWidgets.QLabel(f"Urządzenie: {self.device_name} ({device_label})")
         header_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
         header_label.setProperty("heading", True)
-        header_label.setStyleSheet(BASE_STYLE)
         self.main_layout.addWidget(header_label)
 
         device_description = Cisco_Router[self.device_name]['description'] if self.device_type == 'router' else Cisco_Switch[self.device_name]['description']
@@ -104,30 +139,22 @@ class ConfigPage(QtWidgets.QWidget):
         ports_group = QtWidgets.QGroupBox("Porty (zaznacz interfejsy dla wybranej metody)")
         ports_layout = QtWidgets.QVBoxLayout()
         ports_group.setLayout(ports_layout)
-        ports_container = QtWidgets.QWidget()
-
-        grid_layout = QtWidgets.QGridLayout()
-        grid_layout.setSpacing(5)
         columns = 14
-        row = 0
-        col = 0
 
         self.port_buttons = {}
-        for iface in self.labeled_interfaces:
-            port_label = iface['label']
-            btn = PortButton(port_label)
-            btn.setProperty("interface_name", iface['name'])
-            btn.set_color(colors['normal'])
-            self.port_buttons[port_label] = btn
-
-            grid_layout.addWidget(btn, row, col)
-            col += 1
-            if col >= columns:
-                col = 0
-                row += 1
-
-        ports_container.setLayout(grid_layout)
-        ports_layout.addWidget(ports_container)
+        self.interface_buttons = {}
+        if USE_PORT_GRID:
+            # Jeden widżet rysuje wszystkie porty - bez osobnego QPushButton i stylu na port
+            self.port_grid = PortGridView([iface['label'] for iface in self.labeled_interfaces],
+                                          [iface['name'] for iface in self.labeled_interfaces], columns)
+            for iface, item in zip(self.labeled_interfaces, self.port_grid.items):
+                item.set_color(colors['normal'])
+                self.port_buttons[iface['label']] = item
+                self.interface_buttons[iface['name']] = item
+            ports_layout.addWidget(self.port_grid)
+        else:
+            self.port_grid = None
+            ports_layout.addWidget(self.build_port_buttons(colors, columns))
         self.main_layout.addWidget(ports_group)
 
         # Sekcja metod
@@ -141,16 +168,33 @@ class ConfigPage(QtWidgets.QWidget):
         methods_layout.addWidget(self.method_combo)
         methods_layout.setAlignment(QtCore.Qt.AlignmentFlag.AlignTop)
 
+        # Formularze metod są budowane raz, przy pierwszym wyborze, i przełączane w stosie
         self.params_group = QtWidgets.QGroupBox("Parametry Metody")
-        self.params_layout = QtWidgets.QFormLayout()
-        self.params_group.setLayout(self.params_layout)
+        params_group_layout = QtWidgets.QVBoxLayout()
+        self.params_group.setLayout(params_group_layout)
+        self.params_stack = QtWidgets.QStackedWidget()
+        params_group_layout.addWidget(self.params_stack)
+        self.method_forms = {}
+        self.current_form = None
         methods_layout.addWidget(self.params_group)
         self.main_layout.addWidget(methods_group)
 
         # Przycisk Zastosuj Konfigurację
-        apply_button = QtWidgets.QPushButton("Zastosuj Konfigurację")
-        apply_button.clicked.connect(self.apply_configuration)
-        self.main_layout.addWidget(apply_button)
+        self.apply_button = QtWidgets.QPushButton("Zastosuj Konfigurację")
+        self.apply_button.clicked.connect(self.apply_configuration)
+        self.main_layout.addWidget(self.apply_button)
+
+        # Postęp generowania w tle - widoczny tylko w trakcie
+        progress_layout = QtWidgets.QHBoxLayout()
+        self.generation_progress = QtWidgets.QProgressBar()
+        self.generation_progress.setTextVisible(False)
+        self.generation_progress.hide()
+        progress_layout.addWidget(self.generation_progress)
+        self.cancel_button = QtWidgets.QPushButton("Anuluj")
+        self.cancel_button.clicked.connect(self.cancel_generation)
+        self.cancel_button.hide()
+        progress_layout.addWidget(self.cancel_button)
+        self.main_layout.addLayout(progress_layout)
 
         # Dolne przyciski
         bottom_layout = QtWidgets.QHBoxLayout()
@@ -167,6 +211,20 @@ class ConfigPage(QtWidgets.QWidget):
         save_button.clicked.connect(self.save_entire_config)
         bottom_layout.addWidget(save_button)
 
+        running_button = QtWidgets.QPushButton("Wczytaj running-config")
+        running_button.setToolTip("Wczytaj show running-config / show vlan brief, aby zacząć od stanu urządzenia")
+        running_button.clicked.connect(self.load_running_config)
+        bottom_layout.addWidget(running_button)
+
+        delta_button = QtWidgets.QPushButton("Różnica względem urządzenia")
+        delta_button.setToolTip("Wczytaj bieżącą konfigurację urządzenia i zapisz tylko brakujące polecenia")
+        delta_button.clicked.connect(self.save_config_delta)
+        bottom_layout.addWidget(delta_button)
+
+        self.compact_checkbox = QtWidgets.QCheckBox("Łącz porty w interface range")
+        self.compact_checkbox.setChecked(True)
+        bottom_layout.addWidget(self.compact_checkbox)
+
         self.main_layout.addLayout(bottom_layout)
 
         # Legenda VLAN
@@ -175,12 +233,47 @@ class ConfigPage(QtWidgets.QWidget):
 
         self.on_method_changed(self.method_combo.currentIndex())
 
+    def build_port_buttons(self, colors, columns):
+        """Fallback port grid with one PortButton per interface."""
+        ports_container = QtWidgets.QWidget()
+        grid_layout = QtWidgets.QGridLayout()
+        grid_layout.setSpacing(5)
+        row = 0
+        col = 0
+
+        for iface in self.labeled_interfaces:
+            port_label = iface['label']
+            btn = PortButton(port_label)
+            btn.setProperty("interface_name", iface['name'])
+            btn.set_color(colors['normal'])
+            self.port_buttons[port_label] = btn
+            self.interface_buttons[iface['name']] = btn
+
+            grid_layout.addWidget(btn, row, col)
+            col += 1
+            if col >= columns:
+                col = 0
+                row += 1
+
+        ports_container.setLayout(grid_layout)
+        return ports_container
+
     def go_back(self):
+        self.cancel_generation()
         self.stacked_widget.setCurrentIndex(0)
 
+    @property
+    def full_config(self):
+        """Whole session config as text, rendered from config_document."""
+        return self.config_document.render()
+
+    def export_config(self):
+        """Return the session config for copying, compacted unless disabled."""
+        return self.config_document.render(self.compact_checkbox.isChecked(), self.physical_interfaces)
+
     def copy_entire_config(self):
         cb = QtWidgets.QApplication.clipboard()
-        cb.setText(self.full_config, mode=QClipboard.Mode.Clipboard)
+        cb.setText(self.export_config(), mode=QClipboard.Mode.Clipboard)
         QtWidgets.QMessageBox.information(self, "Skopiowano", "Cała konfiguracja została skopiowana do schowka.")
 
     def save_entire_config(self):
@@ -188,15 +281,100 @@ class ConfigPage(QtWidgets.QWidget):
         if filename:
             try:
                 with open(filename, "w") as f:
-                    f.write(self.full_config)
+                    self.config_document.write_to(f, self.compact_checkbox.isChecked(), self.physical_interfaces)
                 QtWidgets.QMessageBox.information(self, "Zapisano", "Konfiguracja zapisana do pliku.")
             except Exception as e:
                 QtWidgets.QMessageBox.critical(self, "Błąd zapisu", f"Nie udało się zapisać pliku: {e}")
 
+    def load_running_config(self):
+        """Seed the VLAN registry and port colours from captured device output."""
+        filenames, _ = QtWidgets.QFileDialog.getOpenFileNames(
+            self, "Wczytaj show running-config / show vlan brief", "", "Text Files (*.txt *.log);;All Files (*)")
+        if not filenames:
+            return
+        try:
+            state = load_device_state(*filenames)
+        except (OSError, ValueError) as e:
+            QtWidgets.QMessageBox.critical(self, "Błąd odczytu", f"Nie udało się wczytać pliku: {e}")
+            return
+
+        seeded = self.seed_from_device_state(state)
+        QtWidgets.QMessageBox.information(self, "Wczytano",
+                                          f"Wczytano {len(state.vlans)} VLAN-ów, pokolorowano {seeded} portów.")
+
+    def seed_from_device_state(self, state):
+        """Merge a DeviceState into the session; VLANs and ports set in this session keep their values."""
+        self.used_vlans = self.used_vlans.union(state.vlans)
+        seeded = 0
+        for name, btn in self.interface_buttons.items():
+            if name in self.port_vlans:
+                continue
+            vlan_id = state.port_vlan(normalize_interface_name(name))
+            if vlan_id is None:
+                continue
+            vlan_info = self.used_vlans[vlan_id]
+            self.port_vlans[name] = vlan_id
+            btn.set_color(vlan_info.color)
+            self.vlan_legend.add_vlan(vlan_id, vlan_info.name, vlan_info.color)
+            seeded += 1
+        return seeded
+
+    def save_config_delta(self):
+        """Diff the session config against a device's current config and save the missing commands."""
+        current_file, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Wczytaj bieżącą konfigurację (show running-config)", "", "Text Files (*.txt);;All Files (*)")
+        if not current_file:
+            return
+        try:
+            with open(current_file, encoding="utf-8", errors="replace") as f:
+                current = f.read()
+        except OSError as e:
+            QtWidgets.QMessageBox.critical(self, "Błąd odczytu", f"Nie udało się wczytać pliku: {e}")
+            return
+
+        delta = config_delta(current, self.full_config, self.physical_interfaces,
+                             compact=self.compact_checkbox.isChecked(), overlay=True)
+        if not delta:
+            QtWidgets.QMessageBox.information(self, "Brak zmian", "Urządzenie ma już całą konfigurację z tej sesji.")
+            return
+
+        filename, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Zapisz różnicę konfiguracji", "", "Text Files (*.txt);;All Files (*)")
+        if filename:
+            try:
+                with open(filename, "w") as f:
+                    f.write(delta)
+                QtWidgets.QMessageBox.information(self, "Zapisano", "Różnica konfiguracji zapisana do pliku.")
+            except Exception as e:
+                QtWidgets.QMessageBox.critical(self, "Błąd zapisu", f"Nie udało się zapisać pliku: {e}")
+
     def on_method_changed(self, index):
-        self.clear_layout(self.params_layout)
-        self.param_widgets = {}
         method_name = self.method_combo.currentText()
+        form = self.method_forms.get(method_name)
+        if form is None:
+            form = self.build_method_form(method_name)
+            self.method_forms[method_name] = form
+            self.params_stack.addWidget(form)
+
+        # Ukryte formularze nie wpływają na wysokość stosu
+        if self.current_form is not None:
+            self.current_form.setSizePolicy(QtWidgets.QSizePolicy.Policy.Ignored,
+                                            QtWidgets.QSizePolicy.Policy.Ignored)
+        form.setSizePolicy(QtWidgets.QSizePolicy.Policy.Preferred, QtWidgets.QSizePolicy.Policy.Preferred)
+        self.params_stack.setCurrentWidget(form)
+        self.current_form = form
+
+        self.params_layout = form.layout()
+        self.param_widgets = form.param_widgets
+        self.update_dynamic_fields()
+
+    def build_method_form(self, method_name):
+        """Build the parameter form page for a method."""
+        form = QtWidgets.QWidget()
+        self.params_layout = QtWidgets.QFormLayout(form)
+        self.param_widgets = {}
+        form.param_widgets = self.param_widgets
+        self.add_method_description(method_name)
+
         input_params = methods_inputs.get(method_name, [])
         opt = optional_params.get(method_name, [])
 
@@ -224,24 +402,6 @@ class ConfigPage(QtWidgets.QWidget):
 
             # Add the "Add Network" button
             add_network_btn = QtWidgets.QPushButton("+ Dodaj sieć")
-            add_network_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #3D3D3D;
-                    border: 2px solid #3D3D3D;
-                    border-radius: 4px;
-                    color: #FFFFFF;
-                    font-size: 14px;
-                    padding: 8px 16px;
-                    min-height: 20px;
-                }
-                QPushButton:hover {
-                    background-color: #4D4D4D;
-                    border: 2px solid #4CAF50;
-                }
-                QPushButton:pressed {
-                    background-color: #4CAF50;
-                }
-            """)
             add_network_btn.clicked.connect(self.add_network_field)
             self.params_layout.addRow("", add_network_btn)
 
@@ -255,12 +415,18 @@ class ConfigPage(QtWidgets.QWidget):
                 self.params_layout.addRow(label_text + ":", widget)
                 self.param_widgets[p] = widget
 
-        self.update_dynamic_fields()
+        if method_name == 'apply_nat' and 'Interface Role' in self.param_widgets:
+            # For NAT, we need at least one inside and one outside interface
+            self.param_widgets['Interface Role'].currentTextChanged.connect(
+                lambda: self.update_nat_interface_requirements()
+            )
+
+        return form
 
     def add_network_field(self):
         """Add a new network input field."""
         current_count = len([w for w in self.param_widgets.keys() if w.startswith("Network")])
-        if current_count < 4:  # Limit to 4 networks
+        if current_count < MAX_DYNAMIC_NETWORKS:
             new_network_num = current_count + 1
             widget = self.create_input_widget(f"Network {new_network_num}", self.method_combo.currentText())
             self.param_widgets[f"Network {new_network_num}"] = widget
@@ -278,48 +444,27 @@ class ConfigPage(QtWidgets.QWidget):
             QtWidgets.QMessageBox.information(self, "Limit osiągnięty", "Osiągnięto maksymalną ilość sieci")
 
     def create_input_widget(self, param_name, method_name):
-        lower = param_name.lower()
-
-        # Walidatory
-        ip_regex = QRegularExpression("^(25[0-5]|2[0-4]\\d|[01]?\\d?\\d)(\\.(25[0-5]|2[0-4]\\d|[01]?\\d?\\d)){3}$")
-        ip_validator = QRegularExpressionValidator(ip_regex)
-
-        # Special handling for Network fields in dynamic routing
-        if param_name.startswith("Network"):
-            ip_line = QtWidgets.QLineEdit()
-            ip_line.setValidator(ip_validator)
-            ip_line.setPlaceholderText("np. 192.168.1.0")
-            return ip_line
-
-        # Dla IP (Default Router, Pool Start/End IP, DNS Server)
-        if ("ip" in lower or "router" in lower or "dns" in lower or "network" in lower):
-            ip_line = QtWidgets.QLineEdit()
-            ip_line.setValidator(ip_validator)
-            ip_line.setPlaceholderText("np. 192.168.1.1")
-            return ip_line
-
-        # Dla protokołów routingu
-        if "routing protocol" in lower:
-            combo = QtWidgets.QComboBox()
-            combo.addItems(["OSPF", "EIGRP"])
-            return combo
+        spec = field_spec(param_name)
 
-        # Dla booleanów
-        if "dhcp server" in lower or "vlan routing" in lower:
-            chk = QtWidgets.QCheckBox()
-            return chk
+        if spec.kind == 'ip':
+            line = QtWidgets.QLineEdit()
+            line.setValidator(ip_validator())
+            line.setPlaceholderText(spec.placeholder)
+            return line
 
-        if param_name == "Interface Role":
+        if spec.kind == 'combo':
             combo = QtWidgets.QComboBox()
-            combo.addItems(["Inside", "Outside"])  # Dodajemy dostępne opcje
+            combo.addItems(spec.options)
             return combo
 
-        # Dla VLAN Mode
-        if param_name == "VLAN Mode":
+        if spec.kind == 'checkbox':
+            return QtWidgets.QCheckBox()
+
+        if spec.kind == 'vlan_mode':
             mode_group = QtWidgets.QGroupBox()
             mode_layout = QtWidgets.QHBoxLayout()
-            static_rb = QtWidgets.QRadioButton("Static")
-            dynamic_rb = QtWidgets.QRadioButton("Dynamic")
+            static_rb = QtWidgets.QRadioButton(spec.options[0])
+            dynamic_rb = QtWidgets.QRadioButton(spec.options[1])
             static_rb.setChecked(True)
             mode_layout.addWidget(static_rb)
             mode_layout.addWidget(dynamic_rb)
@@ -328,123 +473,33 @@ class ConfigPage(QtWidgets.QWidget):
             mode_group.setProperty("dynamic_rb", dynamic_rb)
             return mode_group
 
-        # Enhanced numerical inputs
-        if ("vlan id" in lower or "process id" in lower or "area id" in lower or
-            "voice vlan id" in lower or "native vlan id" in lower or "lease time" in lower):
+        if spec.kind == 'spin':
+            # Wygląd pól liczbowych pochodzi z SPINBOX_STYLE ustawionego raz dla całej strony
             spin = QtWidgets.QSpinBox()
-            
-            # Set range and prefix based on parameter type
-            if "vlan" in lower:
-                spin.setRange(1, 4094)
-                spin.setPrefix("VLAN ")
-            elif "process id" in lower:
-                spin.setRange(1, 65535)
-                spin.setPrefix("PID ")
-            elif "area id" in lower:
-                spin.setRange(0, 65535)
-                spin.setPrefix("Area ")
-            elif "lease time" in lower:
-                spin.setRange(1, 365)
-                spin.setSuffix(" days")
-            else:
-                spin.setRange(0, 65535)
-
-            # Common styling for all numerical inputs
-            spin.setStyleSheet("""
-                QSpinBox {
-                    background-color: #3D3D3D;
-                    border: 2px solid #3D3D3D;
-                    border-radius: 4px;
-                    color: #FFFFFF;
-                    padding: 5px;
-                    min-width: 100px;
-                    min-height: 30px;
-                    height: 30px;
-                }
-                QSpinBox:hover {
-                    border: 2px solid #4CAF50;
-                }
-                QSpinBox:focus {
-                    border: 2px solid #4CAF50;
-                    background-color: #454545;
-                }
-                QSpinBox::up-button, QSpinBox::down-button {
-                    background-color: #4D4D4D;
-                    border: none;
-                    border-radius: 2px;
-                    margin: 1px;
-                    width: 20px;
-                    height: 15px;
-                }
-                QSpinBox::up-button:hover, QSpinBox::down-button:hover {
-                    background-color: #5D5D5D;
-                }
-                QSpinBox::up-button:pressed, QSpinBox::down-button:pressed {
-                    background-color: #4CAF50;
-                }
-                QSpinBox::up-arrow {
-                    width: 7px;
-                    height: 7px;
-                    border-left: 2px solid white;
-                    border-top: 2px solid white;
-                    transform: rotate(45deg);
-                }
-                QSpinBox::down-arrow {
-                    width: 7px;
-                    height: 7px;
-                    border-left: 2px solid white;
-                    border-bottom: 2px solid white;
-                    transform: rotate(-45deg);
-                }
-            """)
-            
+            spin.setRange(spec.minimum, spec.maximum)
+            spin.setPrefix(spec.prefix)
+            spin.setSuffix(spec.suffix)
             spin.setButtonSymbols(QtWidgets.QAbstractSpinBox.ButtonSymbols.UpDownArrows)
             spin.setAccelerated(True)
             spin.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
             spin.setFixedHeight(30)  # Set fixed height to match other elements
             spin.setMinimumWidth(150)  # Ensure minimum width
-            
             return spin
 
-        # Dla maski podsieci
-        if "subnet mask" in lower or "netmask" in lower:
-            mask_line = QtWidgets.QLineEdit()
-            mask_line.setValidator(ip_validator)
-            mask_line.setPlaceholderText("np. 255.255.255.0")
-            if "netmask" in lower:  # Explicit handling for netmask field
-                mask_line.setPlaceholderText("np. 255.255.255.0 (netmask)")
-            return mask_line
-
-        # Dla nazw (Pool Name, Profile Name, Domain Name)
-        if "name" in lower:
-            line = QtWidgets.QLineEdit()
-            line.setPlaceholderText("Wprowadź nazwę")
-            return line
+        if spec.kind == 'multiline':
+            text = QtWidgets.QPlainTextEdit()
+            text.setPlaceholderText(spec.placeholder)
+            text.setLineWrapMode(QtWidgets.QPlainTextEdit.LineWrapMode.NoWrap)
+            text.setMinimumHeight(120)
+            return text
 
-        # Dla opisów
-        if "description" in lower:
-            line = QtWidgets.QLineEdit()
-            line.setPlaceholderText("Opis (opcjonalnie)")
-            return line
-
-        # Dla koloru
-        if "color" in lower:
+        if spec.kind == 'color':
             btn = QtWidgets.QPushButton("Wybierz Kolor")
             btn.clicked.connect(lambda _, b=btn: self.select_color(b))
             return btn
 
-        # Dla Allowed VLANs lub Access List
-        if "allowed vlans" in lower or "access list" in lower:
-            line = QtWidgets.QLineEdit()
-            if "allowed vlans" in lower:
-                line.setPlaceholderText("np. 10,20,30")
-            else:
-                line.setPlaceholderText("Wpisz ACL (np. 100)")
-            return line
-
-        # Domyślnie QLineEdit
         line = QtWidgets.QLineEdit()
-        line.setPlaceholderText("Wprowadź wartość")
+        line.setPlaceholderText(spec.placeholder)
         return line
 
     def select_color(self, button):
@@ -471,13 +526,6 @@ class ConfigPage(QtWidgets.QWidget):
                     if isinstance(widget, QtWidgets.QLineEdit):
                         widget.setPlaceholderText("Enter VLAN ID (1-4094)")
 
-        elif method_name == 'apply_nat':
-            # For NAT, we need at least one inside and one outside interface
-            if 'Interface Role' in self.param_widgets:
-                self.param_widgets['Interface Role'].currentTextChanged.connect(
-                    lambda: self.update_nat_interface_requirements()
-                )
-
         elif method_name == 'apply_dhcp_server':
             # Show DNS and lease time fields only when DHCP is enabled
             if 'DNS Server' in self.param_widgets:
@@ -491,12 +539,11 @@ class ConfigPage(QtWidgets.QWidget):
                 btn.setEnabled(False)
                 btn.setChecked(False)
 
-        self.update_method_description(method_name)
-
-    def update_method_description(self, method_name):
-        """Updates the description label for the selected method."""
+    def add_method_description(self, method_name):
+        """Adds the description label at the top of the method's form."""
         descriptions = {
             'apply_dynamic_routing': "Routing dynamiczny dla wybranego intrefejsu",
+            'apply_bulk_static_routing': "Import tras statycznych z CSV z łączeniem prefiksów",
             'set_access_vlan': "Konfiguracja portów w trybie dostępowym VLAN",
             'apply_nat': "Konfiguracja NAT z interfejsami wewnętrznymi/zewnętrznymi",
             'apply_dhcp_server': "Konfiguracja serwera DHCP na wybranych interfejsach",
@@ -504,14 +551,10 @@ class ConfigPage(QtWidgets.QWidget):
             'default_interface': "Resetowanie wybranych interfejsów do konfiguracji domyślnej"
         }
 
-        if hasattr(self, 'method_description_label'):
-            self.method_description_label.deleteLater()
-
         description = descriptions.get(method_name, "Konfiguracja wybranych interfejsów")
-        self.method_description_label = QtWidgets.QLabel(description)
-        self.method_description_label.setProperty("heading", "true")
-        self.method_description_label.setStyleSheet(BASE_STYLE)
-        self.params_layout.insertRow(0, self.method_description_label)
+        description_label = QtWidgets.QLabel(description)
+        description_label.setProperty("heading", "true")
+        self.params_layout.insertRow(0, description_label)
 
     def update_nat_interface_requirements(self):
         """Updates interface requirements for NAT configuration."""
@@ -520,46 +563,105 @@ class ConfigPage(QtWidgets.QWidget):
             btn.setEnabled(True)
 
     def apply_configuration(self):
+        if self.generation_worker is not None:
+            return
         selected_method = self.method_combo.currentText()
         selected_ports = [btn.property("interface_name") for btn in self.port_buttons.values() if btn.isChecked()]
 
         try:
             params_values = self.collect_param_values(selected_method)
-
-            func = TEMPLATE_FUNCTIONS.get(selected_method, None)
-            if not func:
-                QtWidgets.QMessageBox.warning(self, "Błąd", f"Brak logiki dla metody: {selected_method}")
-                return
-            if selected_method == "default_interface":
-                # Resetowanie kolorów w GUI
-                for port in selected_ports:
-                    for btn in self.port_buttons.values():
-                        if btn.property("interface_name") == port:
-                            btn.set_color('#5F5F5F')  # Resetuj kolor
-            if selected_method == "restart_device":
-                for btn in self.port_buttons.values():
-                    btn.set_color('#5F5F5F')
-                self.vlan_legend.clear_legends()
-
-            if selected_method in ["apply_data_template", "set_access_vlan", "set_trunk_vlan", "set_native_vlan"]:
-                config_text = func(params_values, selected_ports, self.used_vlans)
-            else:
-                config_text = func(params_values, selected_ports)
-
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Błąd", f"Nieoczekiwany błąd: {e}")
+            return
+
+        func = TEMPLATE_FUNCTIONS.get(selected_method, None)
+        if not func:
+            QtWidgets.QMessageBox.warning(self, "Błąd", f"Brak logiki dla metody: {selected_method}")
+            return
+
+        # Walidacja i generowanie idą w tle, na kopii rejestru VLAN
+        self.start_generation([GenerationTask(selected_method, params_values, selected_ports)])
+
+    def start_generation(self, tasks):
+        """Run template calls on the thread pool; the result is committed in on_generation_finished."""
+        worker = GenerationWorker(tasks, self.used_vlans)
+        worker.connect(self.on_generation_progress, self.on_generation_finished,
+                       self.on_generation_failed, self.on_generation_cancelled)
+        self.generation_worker = worker
+        self.set_generation_running(True, len(tasks))
+        QtCore.QThreadPool.globalInstance().start(worker)
+
+    def cancel_generation(self):
+        if self.generation_worker is not None:
+            self.generation_worker.cancel()
+            self.generation_worker = None
+            self.set_generation_running(False)
+
+    def set_generation_running(self, running, total=0):
+        self.apply_button.setEnabled(not running)
+        self.cancel_button.setVisible(running)
+        self.generation_progress.setVisible(running)
+        # Pojedyncze wywołanie nie ma etapów - pasek pokazuje tylko, że praca trwa
+        self.generation_progress.setRange(0, total if total > 1 else 0)
+        self.generation_progress.setValue(0)
+
+    def sender_worker(self):
+        """The running worker if it sent the current signal, else None (a cancelled or stale job)."""
+        signals = self.sender()
+        worker = self.generation_worker
+        return worker if worker is not None and signals is worker.signals else None
+
+    def on_generation_progress(self, done, total):
+        if self.sender_worker() is not None and total > 1:
+            self.generation_progress.setValue(done)
+
+    def on_generation_failed(self, message, validation):
+        if self.sender_worker() is None:
+            return
+        self.generation_worker = None
+        self.set_generation_running(False)
+        if validation:
+            QtWidgets.QMessageBox.warning(self, "Błąd Walidacji", message)
+        else:
+            QtWidgets.QMessageBox.critical(self, "Błąd", message)
+
+    def on_generation_cancelled(self):
+        if self.sender_worker() is not None:
+            self.generation_worker = None
+            self.set_generation_running(False)
+
+    def on_generation_finished(self, result):
+        """Commit a worker's result to the session; runs on the main thread."""
+        if self.sender_worker() is None:
+            return  # anulowane albo zastąpione nowszym zadaniem
+        self.generation_worker = None
+        self.set_generation_running(False)
+        if not result.is_current(self.used_vlans):
+            QtWidgets.QMessageBox.warning(self, "Błąd", "Stan VLAN-ów zmienił się w trakcie generowania. Zastosuj konfigurację ponownie.")
+            return
+        if not self.register_result_prefixes(result):
+            return
+
+        self.used_vlans = result.registry
+        for task, config_text in zip(result.tasks, result.texts):
             if config_text.strip():
-                if self.full_config.strip():
-                    self.full_config += "\n! --- Kolejna konfiguracja ---\n"
-                self.full_config += config_text + "\n"
-
-            QtWidgets.QMessageBox.information(self, "Wygenerowana Konfiguracja", config_text)
-
-            # Aktualizacja kolorów portów i legendy VLAN
-            self.update_vlan_visuals(selected_method)  # Wywołanie aktualizacji wizualnej
-
+                block = self.config_document.append(task.method, task.params, task.ports, config_text)
+                # Podgląd dopisuje tylko nowy blok i przewija do niego
+                self.config_preview.append_block(block)
+            # Aktualizacja kolorów portów i legendy VLAN (tylko zmienione porty)
+            self.update_vlan_visuals(task.method, task.ports, task.params)
+
+    def register_result_prefixes(self, result):
+        """Add the result's addresses to the session prefix index, all or nothing; False (and a warning) on a conflict."""
+        mark = self.prefix_index.mark()
+        try:
+            for task in result.tasks:
+                register_prefixes(self.prefix_index, self.device_name, task.method, task.params, task.ports)
         except TemplateError as e:
+            self.prefix_index.rollback(mark)
             QtWidgets.QMessageBox.warning(self, "Błąd Walidacji", str(e))
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Błąd", f"Nieoczekiwany błąd: {e}")
+            return False
+        return True
 
     def collect_param_values(self, selected_method):
         input_params = methods_inputs.get(selected_method, [])
@@ -585,23 +687,35 @@ class ConfigPage(QtWidgets.QWidget):
 
         return params_values
 
-    def update_vlan_visuals(self, selected_method):
-        """Aktualizuje kolory przycisków portów oraz legendę VLAN."""
-        if selected_method in ["set_access_vlan", "apply_data_template", "set_trunk_vlan", "set_native_vlan"]:
-            # Store current button states and colors
-            button_states = {btn.property("interface_name"): (btn.isChecked(), btn.vlan_color)
-                           for btn in self.port_buttons.values()}
-
-            for vlan_id, vlan_info in self.used_vlans.items():
-                # Dodaj VLAN do legendy
-                self.vlan_legend.add_vlan(vlan_id, vlan_info['name'], vlan_info['color'])
-                # Aktualizuj kolor przypisanych portów
-                for port_name, btn in self.port_buttons.items():
-                    interface_name = btn.property("interface_name")
-                    if btn.isChecked() and interface_name in button_states:
-                        btn.set_color(vlan_info['color'])
-                    elif not btn.isChecked() and interface_name in button_states:
-                        # Restore previous color if unchecked
-                        prev_checked, prev_color = button_states[interface_name]
-                        if prev_color:
-                            btn.set_color(prev_color)
+    def update_vlan_visuals(self, selected_method, selected_ports, params_values):
+        """Aktualizuje kolory portów i legendę VLAN - tylko dla portów zmienionych przez tę operację."""
+        if selected_method == "restart_device":
+            for port in self.port_vlans:
+                self.interface_buttons[port].set_color(DEFAULT_PORT_COLOR)
+            self.port_vlans.clear()
+            self.used_vlans = VlanRegistry()
+            self.vlan_legend.clear_legends()
+            return
+
+        if selected_method == "default_interface":
+            for port in selected_ports:
+                if self.port_vlans.pop(port, None) is not None:
+                    self.interface_buttons[port].set_color(DEFAULT_PORT_COLOR)
+            return
+
+        if selected_method not in VLAN_TEMPLATE_FUNCTIONS:
+            return
+
+        vlan_id = params_values.get("VLAN ID") or params_values.get("Native VLAN ID")
+        if vlan_id not in self.used_vlans:
+            # Trunk nie tworzy VLAN-u - porty dostają kolor ostatnio utworzonego VLAN-u
+            vlan_id = next(reversed(self.used_vlans.records), None)
+        if vlan_id is None:
+            return
+
+        vlan_info = self.used_vlans[vlan_id]
+        self.vlan_legend.add_vlan(vlan_id, vlan_info.name, vlan_info.color)
+        for port in selected_ports:
+            if self.port_vlans.get(port) != vlan_id:
+                self.port_vlans[port] = vlan_id
+                self.interface_buttons[port].set_color(vlan_info.color)
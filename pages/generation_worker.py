@@ -0,0 +1,98 @@
+# pages/generation_worker.py
+"""
+Template generation off the Qt main thread.
+
+GenerationWorker runs a list of template calls on a QThreadPool thread
+against a copy of the VLAN registry, so nothing the UI owns is touched
+while it runs. Progress, the result and errors come back through signals
+connected with Qt.QueuedConnection; ConfigPage commits the result to its
+document and registry on the main thread. A cancelled worker stops before
+its next template call and its result is dropped.
+"""
+import threading
+
+from PyQt6 import QtCore
+
+from autoswitch.template_logic import TemplateError, render_template
+
+
+class GenerationTask:
+    """One template call: method, its parameters and the selected ports."""
+    __slots__ = ('method', 'params', 'ports')
+
+    def __init__(self, method, params, ports):
+        self.method = method
+        self.params = params
+        self.ports = list(ports)
+
+
+class GenerationResult:
+    """Rendered blocks and the registry they were generated against."""
+    __slots__ = ('tasks', 'texts', 'registry', 'base_registry', 'base_bits')
+
+    def __init__(self, tasks, registry, base_registry):
+        self.tasks = tasks
+        self.texts = []
+        self.registry = registry
+        self.base_registry = base_registry
+        self.base_bits = base_registry.bits
+
+    def is_current(self, used_vlans):
+        """True when the UI registry has not changed since the worker started."""
+        return used_vlans is self.base_registry and used_vlans.bits == self.base_bits
+
+
+class GenerationSignals(QtCore.QObject):
+    progress = QtCore.pyqtSignal(int, int)   # wykonane, wszystkie
+    finished = QtCore.pyqtSignal(object)     # GenerationResult
+    failed = QtCore.pyqtSignal(str, bool)    # komunikat, czy to błąd walidacji
+    cancelled = QtCore.pyqtSignal()
+
+
+class GenerationWorker(QtCore.QRunnable):
+    """Renders GenerationTasks on a pool thread."""
+
+    def __init__(self, tasks, used_vlans):
+        super().__init__()
+        self.tasks = list(tasks)
+        self.result = GenerationResult(self.tasks, used_vlans.copy(), used_vlans)
+        self.signals = GenerationSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def connect(self, receiver_progress, receiver_finished, receiver_failed, receiver_cancelled=None):
+        """Connect the signals with queued connections, so slots always run on the receiver's thread."""
+        queued = QtCore.Qt.ConnectionType.QueuedConnection
+        self.signals.progress.connect(receiver_progress, queued)
+        self.signals.finished.connect(receiver_finished, queued)
+        self.signals.failed.connect(receiver_failed, queued)
+        if receiver_cancelled is not None:
+            self.signals.cancelled.connect(receiver_cancelled, queued)
+
+    def run(self):
+        result = self.result
+        total = len(self.tasks)
+        try:
+            for done, task in enumerate(self.tasks):
+                if self.is_cancelled:
+                    self.signals.cancelled.emit()
+                    return
+                result.texts.append(render_template(task.method, task.params, task.ports, result.registry))
+                self.signals.progress.emit(done + 1, total)
+        except TemplateError as e:
+            self.signals.failed.emit(str(e), True)
+            return
+        except Exception as e:
+            self.signals.failed.emit(f"Nieoczekiwany błąd: {e}", False)
+            return
+
+        if self.is_cancelled:
+            self.signals.cancelled.emit()
+        else:
+            self.signals.finished.emit(result)
@@ -145,6 +145,54 @@ QPlainTextEdit {
 
 LABEL_STYLE = "QLabel { font-size: 16px; color: #FFFFFF; }"
 
+SPINBOX_STYLE = """
+QSpinBox {
+    background-color: #3D3D3D;
+    border: 2px solid #3D3D3D;
+    border-radius: 4px;
+    color: #FFFFFF;
+    padding: 5px;
+    min-width: 100px;
+    min-height: 30px;
+    height: 30px;
+}
+QSpinBox:hover {
+    border: 2px solid #4CAF50;
+}
+QSpinBox:focus {
+    border: 2px solid #4CAF50;
+    background-color: #454545;
+}
+QSpinBox::up-button, QSpinBox::down-button {
+    background-color: #4D4D4D;
+    border: none;
+    border-radius: 2px;
+    margin: 1px;
+    width: 20px;
+    height: 15px;
+}
+QSpinBox::up-button:hover, QSpinBox::down-button:hover {
+    background-color: #5D5D5D;
+}
+QSpinBox::up-button:pressed, QSpinBox::down-button:pressed {
+    background-color: #4CAF50;
+}
+QSpinBox::up-arrow {
+    width: 7px;
+    height: 7px;
+    border-left: 2px solid white;
+    border-top: 2px solid white;
+    transform: rotate(45deg);
+}
+QSpinBox::down-arrow {
+    width: 7px;
+    height: 7px;
+    border-left: 2px solid white;
+    border-bottom: 2px solid white;
+    transform: rotate(-45deg);
+}
+"""
+
 BASE_STYLE += """
 QScrollBar:vertical {
     border: none;
@@ -0,0 +1,262 @@
+# widgets/config_preview.py
+"""
+Read-only preview of the session configuration.
+
+ConfigPreview shows a ConfigDocument in a QPlainTextEdit without line
+wrapping, so only the visible blocks are laid out. The text is fed in
+chunks of CHUNK_LINES from a timer, which keeps a 100k-line document from
+freezing the window while it loads; new apply blocks are appended to the
+end instead of re-rendering the document. ConfigHighlighter is a
+QSyntaxHighlighter, so Qt re-highlights only the blocks that changed.
+Search uses a token index built while the lines are loaded.
+"""
+import re
+from collections import defaultdict
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+from autoswitch.document import SEPARATOR
+
+# Tyle linii dokładamy do podglądu w jednym kroku pętli zdarzeń
+CHUNK_LINES = 1000
+
+SECTION_KEYWORDS = ("interface ", "vlan ", "router ", "ip dhcp pool ", "line ")
+MODE_KEYWORDS = ("exit", "end", "enable", "configure terminal")
+
+_IPV4 = re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}\b")
+
+
+def _text_format(color, bold=False, italic=False):
+    fmt = QtGui.QTextCharFormat()
+    fmt.setForeground(QtGui.QColor(color))
+    if bold:
+        fmt.setFontWeight(QtGui.QFont.Weight.Bold)
+    fmt.setFontItalic(italic)
+    return fmt
+
+
+class ConfigHighlighter(QtGui.QSyntaxHighlighter):
+    """IOS CLI highlighting: comments, section headers, negations, mode changes and IPv4 addresses."""
+
+    def __init__(self, document):
+        super().__init__(document)
+        self.comment_format = _text_format('#8A8A8A', italic=True)
+        self.section_format = _text_format('#4CAF50', bold=True)
+        self.negation_format = _text_format('#E57373')
+        self.mode_format = _text_format('#9E9E9E')
+        self.address_format = _text_format('#64B5F6')
+
+    def highlightBlock(self, text):
+        stripped = text.lstrip()
+        if not stripped:
+            return
+        if stripped[0] == "!":
+            self.setFormat(0, len(text), self.comment_format)
+            return
+        if stripped.startswith(SECTION_KEYWORDS):
+            self.setFormat(0, len(text), self.section_format)
+        elif stripped in MODE_KEYWORDS:
+            self.setFormat(0, len(text), self.mode_format)
+        elif stripped.startswith("no "):
+            self.setFormat(0, len(text), self.negation_format)
+        if "." in stripped:
+            for match in _IPV4.finditer(text):
+                self.setFormat(match.start(), match.end() - match.start(), self.address_format)
+
+
+class LineIndex:
+    """
+    Token -> line numbers index of the loaded text.
+
+    Every token is also filed under its three-character substrings, so the tokens containing
+    a word are the intersection of its trigrams' token sets, not a scan of the whole vocabulary.
+    """
+
+    def __init__(self):
+        self.tokens = defaultdict(list)
+        self.trigrams = defaultdict(set)
+        self.short_tokens = set()  # tokeny krótsze niż trzy znaki
+
+    def clear(self):
+        self.tokens.clear()
+        self.trigrams.clear()
+        self.short_tokens.clear()
+
+    def add(self, line_number, line):
+        tokens = self.tokens
+        for token in set(line.lower().split()):
+            numbers = tokens[token]
+            if not numbers:
+                self._add_token(token)
+            numbers.append(line_number)
+
+    def _add_token(self, token):
+        if len(token) < 3:
+            self.short_tokens.add(token)
+            return
+        trigrams = self.trigrams
+        for i in range(len(token) - 2):
+            trigrams[token[i:i + 3]].add(token)
+
+    def matching_tokens(self, word):
+        """Indexed tokens containing word (already lowercased)."""
+        if len(word) < 3:
+            # Krótkie słowo: przeglądamy trygramy, których jest znacznie mniej niż tokenów
+            found = {token for token in self.short_tokens if word in token}
+            for trigram, tokens in self.trigrams.items():
+                if word in trigram:
+                    found.update(tokens)
+            return found
+        trigrams = self.trigrams
+        sets = sorted((trigrams.get(word[i:i + 3], set()) for i in range(len(word) - 2)), key=len)
+        return {token for token in sets[0].intersection(*sets[1:]) if word in token}
+
+    def candidates(self, word):
+        """Line numbers with a token containing word (case-insensitive)."""
+        tokens = self.tokens
+        lines = set()
+        for token in self.matching_tokens(word.lower()):
+            lines.update(tokens[token])
+        return lines
+
+
+class ConfigPreview(QtWidgets.QWidget):
+    """Lazily loaded, highlighted and searchable view of a ConfigDocument."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        search_layout = QtWidgets.QHBoxLayout()
+        self.search_edit = QtWidgets.QLineEdit()
+        self.search_edit.setPlaceholderText("Szukaj w konfiguracji...")
+        self.search_edit.returnPressed.connect(self.find_next)
+        self.search_edit.textChanged.connect(self.reset_search)
+        search_layout.addWidget(self.search_edit)
+        self.match_label = QtWidgets.QLabel("")
+        search_layout.addWidget(self.match_label)
+        next_button = QtWidgets.QPushButton("Dalej")
+        next_button.clicked.connect(self.find_next)
+        search_layout.addWidget(next_button)
+        layout.addLayout(search_layout)
+
+        self.text_edit = QtWidgets.QPlainTextEdit()
+        self.text_edit.setReadOnly(True)
+        self.text_edit.setUndoRedoEnabled(False)
+        self.text_edit.setLineWrapMode(QtWidgets.QPlainTextEdit.LineWrapMode.NoWrap)
+        self.text_edit.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.SystemFont.FixedFont))
+        layout.addWidget(self.text_edit)
+        self.highlighter = ConfigHighlighter(self.text_edit.document())
+
+        self.index = LineIndex()
+        self.line_count = 0
+        self.pending = []  # linie czekające na załadowanie
+        self.pending_position = 0
+        self.matches = None
+        self.match_position = -1
+        self.reveal_line = None
+        self.load_timer = QtCore.QTimer(self)
+        self.load_timer.setInterval(0)
+        self.load_timer.timeout.connect(self.load_chunk)
+
+    @property
+    def is_loading(self):
+        return self.pending_position < len(self.pending)
+
+    def clear(self):
+        self.load_timer.stop()
+        self.pending = []
+        self.pending_position = 0
+        self.text_edit.clear()
+        self.index.clear()
+        self.line_count = 0
+        self.reveal_line = None
+        self.reset_search()
+
+    def set_document(self, document):
+        """Show the whole document; the lines are loaded in chunks."""
+        self.clear()
+        self.enqueue(document.iter_lines())
+
+    def append_block(self, block, reveal=True):
+        """Append one ConfigBlock the way ConfigDocument renders it and optionally scroll to it."""
+        if reveal:
+            # Pierwsza linia bloku to separator za pustą linią
+            self.reveal_line = self.line_count + len(self.pending) - self.pending_position + 1
+        self.enqueue(["", SEPARATOR, *block.lines])
+
+    def enqueue(self, lines):
+        self.pending.extend(lines)
+        if not self.load_timer.isActive():
+            self.load_chunk()
+            if self.is_loading:
+                self.load_timer.start()
+
+    def load_chunk(self):
+        """Append up to CHUNK_LINES pending lines to the view and the search index."""
+        start = self.pending_position
+        lines = self.pending[start:start + CHUNK_LINES]
+        self.pending_position = start + len(lines)
+        if not self.is_loading:
+            self.load_timer.stop()
+            self.pending = []
+            self.pending_position = 0
+        if not lines:
+            return
+
+        for offset, line in enumerate(lines):
+            self.index.add(self.line_count + offset, line)
+        cursor = QtGui.QTextCursor(self.text_edit.document())
+        cursor.movePosition(QtGui.QTextCursor.MoveOperation.End)
+        cursor.insertText(("\n" if self.line_count else "") + "\n".join(lines))
+        self.line_count += len(lines)
+        self.matches = None
+
+        if self.reveal_line is not None and self.reveal_line < self.line_count:
+            self.go_to_line(self.reveal_line)
+            self.reveal_line = None
+
+    def go_to_line(self, line_number, column=0, length=0):
+        """Scroll to a line and select length characters from column."""
+        block = self.text_edit.document().findBlockByNumber(line_number)
+        cursor = QtGui.QTextCursor(block)
+        cursor.setPosition(block.position() + column)
+        if length:
+            cursor.setPosition(block.position() + column + length, QtGui.QTextCursor.MoveMode.KeepAnchor)
+        self.text_edit.setTextCursor(cursor)
+        self.text_edit.centerCursor()
+
+    def reset_search(self):
+        self.matches = None
+        self.match_position = -1
+        self.match_label.setText("")
+
+    def find_matches(self, query):
+        """Line numbers containing query; candidates come from the token index."""
+        words = query.lower().split()
+        if not words:
+            return []
+        # Zaczynamy od najrzadszego słowa; tekst linii sprawdzamy tylko dla części wspólnej
+        candidates = sorted((self.index.candidates(word) for word in set(words)), key=len)
+        lines = sorted(candidates[0].intersection(*candidates[1:]))
+        if len(words) == 1:
+            return lines
+        document = self.text_edit.document()
+        query = query.strip().lower()
+        return [n for n in lines if query in document.findBlockByNumber(n).text().lower()]
+
+    def find_next(self):
+        query = self.search_edit.text()
+        if self.matches is None:
+            self.matches = self.find_matches(query)
+            self.match_position = -1
+        if not self.matches:
+            self.match_label.setText("0/0" if query.strip() else "")
+            return
+        self.match_position = (self.match_position + 1) % len(self.matches)
+        line_number = self.matches[self.match_position]
+        self.match_label.setText(f"{self.match_position + 1}/{len(self.matches)}")
+        query = query.strip().lower()
+        column = self.text_edit.document().findBlockByNumber(line_number).text().lower().find(query)
+        self.go_to_line(line_number, max(column, 0), len(query) if column >= 0 else 0)
@@ -4,6 +4,8 @@ from PyQt6 import QtWidgets
 from PyQt6 import QtGui
 from PyQt6.QtGui import QColor
 
+from autoswitch.validation import validate_color
+
 def adjust_color(hex_color, factor=0.1):
     """Adjust the brightness of a hex color."""
     hex_color = hex_color.lstrip('#')
@@ -21,16 +23,6 @@ def adjust_color(hex_color, factor=0.1):
         b = min(int(b + (255 - b) * factor), 255)
     return f"#{r:02X}{g:02X}{b:02X}"
 
-def validate_color(c):
-    """Validate if the color string is in #RRGGBB format."""
-    if isinstance(c, str) and c.startswith('#') and len(c) == 7:
-        try:
-            int(c[1:], 16)
-            return True
-        except ValueError:
-            return False
-    return False
-
 class PortButton(QtWidgets.QPushButton):
     def __init__(self, label=''):
         super().__init__(label)
@@ -67,6 +59,8 @@ class PortButton(QtWidgets.QPushButton):
 
     def set_color(self, color):
         """Set the button color."""
+        if color == self.vlan_color:
+            return  # Nothing changed, skip the stylesheet rebuild
         if validate_color(color):  # Check if the color is valid
             self.vlan_color = color  # Store the VLAN color
             self.background_color = color
@@ -0,0 +1,91 @@
+# widgets/param_fields.py
+"""
+Declarative description of the method parameter fields.
+
+FIELD_TYPES maps every parameter name from methods_inputs to a FieldSpec
+(widget kind, placeholder, range...). ConfigPage builds its widgets from
+these specs, and the validators are compiled once per process and shared
+by every field instead of being rebuilt on each method switch.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+from PyQt6.QtCore import QRegularExpression
+from PyQt6.QtGui import QRegularExpressionValidator
+
+from methods_data import methods_inputs, optional_params
+
+FieldSpec = namedtuple('FieldSpec', 'kind placeholder options minimum maximum prefix suffix',
+                       defaults=("", (), 0, 0, "", ""))
+
+IP_PATTERN = "^(25[0-5]|2[0-4]\\d|[01]?\\d?\\d)(\\.(25[0-5]|2[0-4]\\d|[01]?\\d?\\d)){3}$"
+
+# Maksymalna liczba sieci w formularzu routingu dynamicznego
+MAX_DYNAMIC_NETWORKS = 4
+
+
+def classify_param(param_name):
+    """Return the FieldSpec for a parameter name."""
+    lower = param_name.lower()
+
+    if "csv" in lower:
+        return FieldSpec('multiline', "sieć,maska,next hop lub sieć/długość,next hop - jedna trasa w linii")
+    if param_name.startswith("Network"):
+        return FieldSpec('ip', "np. 192.168.1.0")
+    if "description" in lower:
+        return FieldSpec('text', "Opis (opcjonalnie)")
+    if "ip" in lower or "router" in lower or "dns" in lower or "network" in lower:
+        return FieldSpec('ip', "np. 192.168.1.1")
+    if "routing protocol" in lower:
+        return FieldSpec('combo', options=("OSPF", "EIGRP"))
+    if "dhcp server" in lower or "vlan routing" in lower:
+        return FieldSpec('checkbox')
+    if param_name == "Interface Role":
+        return FieldSpec('combo', options=("Inside", "Outside"))
+    if param_name == "VLAN Mode":
+        return FieldSpec('vlan_mode', options=("Static", "Dynamic"))
+    if "vlan id" in lower:
+        return FieldSpec('spin', minimum=1, maximum=4094, prefix="VLAN ")
+    if "process id" in lower:
+        return FieldSpec('spin', minimum=1, maximum=65535, prefix="PID ")
+    if "area id" in lower:
+        return FieldSpec('spin', minimum=0, maximum=65535, prefix="Area ")
+    if "lease time" in lower:
+        return FieldSpec('spin', minimum=1, maximum=365, suffix=" days")
+    if "netmask" in lower:
+        return FieldSpec('ip', "np. 255.255.255.0 (netmask)")
+    if "subnet mask" in lower:
+        return FieldSpec('ip', "np. 255.255.255.0")
+    if "name" in lower:
+        return FieldSpec('text', "Wprowadź nazwę")
+    if "color" in lower:
+        return FieldSpec('color')
+    if "allowed vlans" in lower:
+        return FieldSpec('text', "np. 10,20,30-40")
+    if "access list" in lower:
+        return FieldSpec('text', "Wpisz ACL (np. 100)")
+    return FieldSpec('text', "Wprowadź wartość")
+
+
+def _all_param_names():
+    names = {p for params in methods_inputs.values() for p in params}
+    names.update(p for params in optional_params.values() for p in params)
+    for i in range(1, MAX_DYNAMIC_NETWORKS + 1):
+        names.update((f"Network {i}", f"Netmask {i}"))
+    return names
+
+
+FIELD_TYPES = {name: classify_param(name) for name in _all_param_names()}
+
+
+def field_spec(param_name):
+    spec = FIELD_TYPES.get(param_name)
+    if spec is None:
+        spec = FIELD_TYPES[param_name] = classify_param(param_name)
+    return spec
+
+
+@lru_cache(maxsize=None)
+def ip_validator():
+    """Shared validator for dotted-quad fields, compiled once per process."""
+    return QRegularExpressionValidator(QRegularExpression(IP_PATTERN))
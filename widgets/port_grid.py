@@ -0,0 +1,228 @@
+# widgets/port_grid.py
+"""
+Port grid painted by a single widget.
+
+PortGridView keeps the state of all ports in compact arrays (colour index,
+checked, enabled), paints every port itself and hit-tests mouse clicks, so a
+stacked chassis with hundreds of ports costs one widget instead of one
+QPushButton with its own stylesheet per port. PortGridItem gives each port
+the small PortButton-like API that ConfigPage uses.
+"""
+from array import array
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+from autoswitch.validation import validate_color
+from widgets.custom_widgets import adjust_color
+
+CELL_WIDTH = 100
+CELL_HEIGHT = 40
+SPACING = 5
+BORDER_COLOR = '#3D3D3D'
+ACCENT_COLOR = '#4CAF50'
+DEFAULT_COLOR = '#5F5F5F'
+
+
+class PortGridItem:
+    """Handle to one port of a PortGridView, mirroring the PortButton methods used by ConfigPage."""
+    __slots__ = ('view', 'index', 'interface_name')
+
+    def __init__(self, view, index, interface_name):
+        self.view = view
+        self.index = index
+        self.interface_name = interface_name
+
+    @property
+    def vlan_color(self):
+        return self.view.color_of(self.index)
+
+    def property(self, name):
+        return self.interface_name if name == "interface_name" else None
+
+    def isChecked(self):
+        return self.view.checked[self.index] == 1
+
+    def setChecked(self, checked):
+        self.view.set_checked(self.index, checked)
+
+    def isEnabled(self):
+        return self.view.enabled[self.index] == 1
+
+    def setEnabled(self, enabled):
+        self.view.set_enabled(self.index, enabled)
+
+    def set_color(self, color):
+        self.view.set_color(self.index, color)
+
+
+class PortGridView(QtWidgets.QWidget):
+    """Grid of checkable ports drawn in one paintEvent."""
+    portToggled = QtCore.pyqtSignal(int, bool)
+
+    def __init__(self, labels, interface_names=None, columns=14, parent=None):
+        super().__init__(parent)
+        self.labels = list(labels)
+        self.columns = max(1, columns)
+        count = len(self.labels)
+
+        # Stan portów: indeks koloru w palecie, zaznaczenie, aktywność
+        self.color_index = array('H', bytes(2 * count))
+        self.checked = bytearray(count)
+        self.enabled = bytearray(b'\x01' * count)
+
+        self.palette_colors = []
+        self._palette_slots = {}
+        self._brushes = []
+        self.color_slot(DEFAULT_COLOR)
+
+        self.hover_index = -1
+        names = interface_names if interface_names is not None else self.labels
+        self.items = [PortGridItem(self, i, name) for i, name in enumerate(names)]
+        self._static_labels = [QtGui.QStaticText(label) for label in self.labels]
+
+        font = QtGui.QFont('Segoe UI', 10)
+        font.setBold(True)
+        self.setFont(font)
+        self._normal_pen = QtGui.QPen(QtGui.QColor(BORDER_COLOR), 2)
+        self._accent_pen = QtGui.QPen(QtGui.QColor(ACCENT_COLOR), 2)
+        self._checked_pen = QtGui.QPen(QtGui.QColor(ACCENT_COLOR), 3)
+        self._text_pen = QtGui.QPen(QtGui.QColor('#FFFFFF'))
+        self._disabled_text_pen = QtGui.QPen(QtGui.QColor('#9A9A9A'))
+
+        self.setMouseTracking(True)
+        self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Fixed, QtWidgets.QSizePolicy.Policy.Fixed)
+
+    # --- stan ---------------------------------------------------------------
+
+    def color_slot(self, color):
+        """Return the palette index of color, adding it (with hover/checked shades) if new."""
+        slot = self._palette_slots.get(color)
+        if slot is None:
+            slot = len(self.palette_colors)
+            self.palette_colors.append(color)
+            self._palette_slots[color] = slot
+            self._brushes.append((QtGui.QBrush(QtGui.QColor(color)),
+                                  QtGui.QBrush(QtGui.QColor(adjust_color(color, factor=0.1))),
+                                  QtGui.QBrush(QtGui.QColor(adjust_color(color, factor=0.2)))))
+        return slot
+
+    def color_of(self, index):
+        return self.palette_colors[self.color_index[index]]
+
+    def set_color(self, index, color):
+        if not validate_color(color):
+            return
+        slot = self.color_slot(color)
+        if self.color_index[index] != slot:
+            self.color_index[index] = slot
+            self.update(self.cell_rect(index))
+
+    def set_checked(self, index, checked):
+        value = 1 if checked else 0
+        if self.checked[index] != value:
+            self.checked[index] = value
+            self.update(self.cell_rect(index))
+
+    def set_enabled(self, index, enabled):
+        value = 1 if enabled else 0
+        if self.enabled[index] != value:
+            self.enabled[index] = value
+            self.update(self.cell_rect(index))
+
+    def port(self, index):
+        return self.items[index]
+
+    def checked_indices(self):
+        return [i for i, value in enumerate(self.checked) if value]
+
+    # --- geometria ----------------------------------------------------------
+
+    def rows(self):
+        return (len(self.labels) + self.columns - 1) // self.columns
+
+    def sizeHint(self):
+        columns = min(self.columns, len(self.labels)) or 1
+        return QtCore.QSize(columns * (CELL_WIDTH + SPACING) - SPACING,
+                            max(1, self.rows()) * (CELL_HEIGHT + SPACING) - SPACING)
+
+    def minimumSizeHint(self):
+        return self.sizeHint()
+
+    def cell_rect(self, index):
+        row, col = divmod(index, self.columns)
+        return QtCore.QRect(col * (CELL_WIDTH + SPACING), row * (CELL_HEIGHT + SPACING), CELL_WIDTH, CELL_HEIGHT)
+
+    def index_at(self, pos):
+        """Hit-test a widget position; returns the port index or -1."""
+        col, x_offset = divmod(int(pos.x()), CELL_WIDTH + SPACING)
+        row, y_offset = divmod(int(pos.y()), CELL_HEIGHT + SPACING)
+        if x_offset >= CELL_WIDTH or y_offset >= CELL_HEIGHT or col >= self.columns or pos.x() < 0 or pos.y() < 0:
+            return -1
+        index = row * self.columns + col
+        return index if index < len(self.labels) else -1
+
+    # --- rysowanie i zdarzenia ----------------------------------------------
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        painter.setFont(self.font())
+        metrics = painter.fontMetrics()
+        text_height = metrics.height()
+
+        # Rysujemy tylko wiersze, które przecinają obszar do odświeżenia
+        area = event.rect()
+        first_row = max(0, area.top() // (CELL_HEIGHT + SPACING))
+        last_row = min(self.rows() - 1, area.bottom() // (CELL_HEIGHT + SPACING))
+        count = len(self.labels)
+
+        for row in range(first_row, last_row + 1):
+            for index in range(row * self.columns, min(count, (row + 1) * self.columns)):
+                rect = self.cell_rect(index)
+                normal, hover, checked = self._brushes[self.color_index[index]]
+                is_checked = self.checked[index]
+                is_enabled = self.enabled[index]
+                if is_checked:
+                    painter.setBrush(checked)
+                    painter.setPen(self._checked_pen)
+                elif index == self.hover_index and is_enabled:
+                    painter.setBrush(hover)
+                    painter.setPen(self._accent_pen)
+                else:
+                    painter.setBrush(normal)
+                    painter.setPen(self._normal_pen)
+                painter.drawRoundedRect(QtCore.QRectF(rect).adjusted(1, 1, -1, -1), 4, 4)
+
+                label = self._static_labels[index]
+                painter.setPen(self._text_pen if is_enabled else self._disabled_text_pen)
+                size = label.size()
+                painter.drawStaticText(QtCore.QPointF(rect.x() + (CELL_WIDTH - size.width()) / 2,
+                                                      rect.y() + (CELL_HEIGHT - text_height) / 2), label)
+        painter.end()
+
+    def mousePressEvent(self, event):
+        if event.button() != QtCore.Qt.MouseButton.LeftButton:
+            return super().mousePressEvent(event)
+        index = self.index_at(event.position())
+        if index >= 0 and self.enabled[index]:
+            checked = not self.checked[index]
+            self.set_checked(index, checked)
+            self.portToggled.emit(index, checked)
+
+    def mouseMoveEvent(self, event):
+        index = self.index_at(event.position())
+        if index != self.hover_index:
+            previous = self.hover_index
+            self.hover_index = index
+            if previous >= 0:
+                self.update(self.cell_rect(previous))
+            if index >= 0:
+                self.update(self.cell_rect(index))
+                self.setToolTip(self.items[index].interface_name)
+
+    def leaveEvent(self, event):
+        if self.hover_index >= 0:
+            previous = self.hover_index
+            self.hover_index = -1
+            self.update(self.cell_rect(previous))
+        super().leaveEvent(event)